@@ -0,0 +1,221 @@
+##############################################################################
+## BenchmarkHarness.py
+##############################################################################
+## Description:
+## * Times each stage of a run (configuration load, curve parsing, forward rate
+## calculation, rendering/export, PDF assembly and log writing) against curves
+## from CurveGenerator at several plot counts, and writes results as JSON.
+
+from __future__ import division
+from Benchmarks.CurveGenerator import CurveGenerator
+from ConfigurationTypes.PlottingConfigFile import PlottingConfigFile
+from DirectoryTypes.DirectoryIndex import DirectoryIndex
+from Exceptions.LogFile import LogFile
+import Exceptions.NonFatal as NonFatals
+from Misc.StageTimer import StageTimer
+from PlottingTypes.CurveStore import CurveStore
+from io import BytesIO
+import datetime
+import json
+import os
+import platform
+from sortedcontainers import SortedList
+import sys
+import time
+
+__all__ = ['BenchmarkHarness']
+
+class BenchmarkHarness(object):
+    " Object runs every benchmark stage for each plot count and collects StageTimer reports. "
+    ##########################################################
+    ## Static Variables:
+    ##########################################################
+    DefaultSizes = [10, 100, 1000]
+    LogFileStage = 'Log File'
+    # Packages only used to render plots and output the PDF. Stages are skipped if these are not installed:
+    OptionalPackages = ['PyQt4', 'PyQt5', 'pyqtgraph', 'reportlab']
+    # Same page layout as MerlinPlotter.GeneratePDF() (A4 landscape, 4 plots per page):
+    __pageSize = (841.89, 595.28)
+    __plotSize = (340, 255)
+    __border = (50, 30)
+    ##########################################################
+    ## Constructors:
+    ##########################################################
+    def __init__(self, generator, sizes = DefaultSizes):
+        """
+        * Overloaded constructor.
+        Inputs:
+        * generator: CurveGenerator object used to write curves and configuration files.
+        Optional Inputs:
+        * sizes: List of plot counts to benchmark.
+        """
+        if not isinstance(generator, CurveGenerator):
+            raise ValueError('generator must be a CurveGenerator object.')
+        if not sizes or len([size for size in sizes if not isinstance(size, int) or size < 1]) > 0:
+            raise ValueError('sizes must be a list of positive integers.')
+        self.Generator = generator
+        self.Sizes = sorted(sizes)
+        self.__Results = {}
+
+    ##########################################################
+    ## Public Methods:
+    ##########################################################
+    def Run(self):
+        """
+        * Run benchmarks for every plot count.
+        Outputs:
+        * results: Dictionary containing environment, parameters and { Plot Count -> StageTimer report } (see Results).
+        """
+        for size in self.Sizes:
+            print('Benchmarking %d plots...' % size)
+            self.__Results[str(size)] = self.RunSize(size)
+        return self.Results
+
+    def RunSize(self, plotCount):
+        """
+        * Generate inputs for plotCount plots, time every stage and return StageTimer report with skipped stages and total wall time.
+        """
+        paths = self.Generator.Generate(plotCount)
+        # Curves were rewritten, so folders must be listed again:
+        DirectoryIndex.Invalidate()
+        StageTimer.Reset()
+        skipped = {}
+        start = time.time()
+
+        with StageTimer.Time(StageTimer.ConfigLoad):
+            configFile = PlottingConfigFile(False)
+            configFile.Path = paths['PlotConfig']
+            configFile.GetContents()
+        plotConfigs = configFile.ConfiguredPlots
+
+        ##############
+        # Parse each discount factor file once, then calculate forward rates for each curve on each plot (timed within CurveStore):
+        ##############
+        store = CurveStore()
+        for plotTitle in configFile.PlotsInOrder:
+            for curve in plotConfigs[plotTitle].keys():
+                store.RegisterTenors(curve, [plotConfigs[plotTitle][curve].FwdRateConv])
+        for curveName in self.Generator.CurveNames():
+            for date in (self.Generator.ValueDate, self.Generator.TMinusOne):
+                store.Get(curveName, date, self.Generator.CurvePath(curveName, date))
+        for plotTitle in configFile.PlotsInOrder:
+            for curve in plotConfigs[plotTitle].keys():
+                store.GetForwardRates(curve, self.Generator.ValueDate, self.Generator.CurvePath(curve, self.Generator.ValueDate), plotConfigs[plotTitle][curve].FwdRateConv)
+
+        plots = self.__RenderPlots(plotConfigs, configFile.PlotsInOrder, paths, store, skipped)
+        self.__AssemblePDF(plots, paths, skipped)
+        self.__WriteLogFile(configFile.PlotsInOrder, paths)
+
+        report = StageTimer.Report()
+        report['skipped'] = skipped
+        report['total'] = round(time.time() - start, 4)
+        return report
+
+    def WriteResults(self, path):
+        """
+        * Output results of the last Run() as JSON.
+        """
+        with open(path, 'w') as f:
+            json.dump(self.Results, f, indent = 2, sort_keys = True)
+
+    @classmethod
+    def Compare(self, baseline, current):
+        """
+        * Return table comparing wall time of each stage between two results dictionaries (or JSON file paths).
+        Ratio below 1 indicates current run is faster.
+        """
+        if isinstance(baseline, str):
+            with open(baseline, 'r') as f:
+                baseline = json.load(f)
+        if isinstance(current, str):
+            with open(current, 'r') as f:
+                current = json.load(f)
+        lines = ['%8s %-16s %12s %12s %8s' % ('Plots', 'Stage', 'Baseline (s)', 'Current (s)', 'Ratio')]
+        for size in sorted(set(baseline['results'].keys()) & set(current['results'].keys()), key = int):
+            before = dict((row['stage'], row['wall']) for row in baseline['results'][size]['stages'])
+            after = dict((row['stage'], row['wall']) for row in current['results'][size]['stages'])
+            before['Total'] = baseline['results'][size]['total']
+            after['Total'] = current['results'][size]['total']
+            for stage in [stage for stage in StageTimer.Stages + [BenchmarkHarness.LogFileStage, 'Total'] if stage in before and stage in after]:
+                ratio = (after[stage] / before[stage] if before[stage] > 0 else float('nan'))
+                lines.append('%8s %-16s %12.3f %12.3f %8.2f' % (size, stage, before[stage], after[stage], ratio))
+        return '\n'.join(lines)
+
+    ##########################################################
+    ## Properties:
+    ##########################################################
+    @property
+    def Results(self):
+        " Return results of benchmark runs, with environment and generator parameters so that runs can be compared. "
+        return {
+            'environment' : {'python' : sys.version.split()[0], 'platform' : platform.platform(), 'timestamp' : datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')},
+            'parameters' : {'curveCount' : self.Generator.CurveCount, 'length' : self.Generator.Length, 'brlShare' : self.Generator.BRLShare, 'curvesPerPlot' : self.Generator.CurvesPerPlot, 'seed' : self.Generator.Seed},
+            'results' : self.__Results }
+
+    ##########################################################
+    ## Private Helpers:
+    ##########################################################
+    def __RenderPlots(self, plotConfigs, plotsInOrder, paths, store, skipped):
+        """
+        * Render and export each plot (timed within ForwardRatePlot). Skipped if pyqtgraph is not available.
+        """
+        try:
+            from PlottingTypes.ForwardRatePlot import ForwardRatePlot
+        except ImportError as err:
+            # Only skip if an optional package is missing, so that issues within the application are still raised:
+            if str(err).split(' ')[-1].split('.')[0] not in BenchmarkHarness.OptionalPackages:
+                raise
+            skipped[StageTimer.Render] = str(err)
+            return []
+        plots = []
+        outputSignature = paths['OutputFolder'] + '{YYYY}{MM}{DD}/{YYYY}-{MM}-{DD} MerlinCurveGraph-{PlotName}-{RunTime}.png'
+        for plotTitle in plotsInOrder:
+            plot = ForwardRatePlot(plotConfigs[plotTitle], paths['CurvesSignature'], outputSignature, plotTitle, self.Generator.ValueDate, self.Generator.TMinusOne, CurveStore = store)
+            try:
+                plot.GenerateImage()
+            except NonFatals.NonFatal as err:
+                skipped.setdefault(StageTimer.Render, err.Message(True))
+                continue
+            plots.append(plot)
+        return plots
+
+    def __AssemblePDF(self, plots, paths, skipped):
+        """
+        * Draw all rendered images into a single PDF. Skipped if reportlab is not available or no plots were rendered.
+        """
+        try:
+            from reportlab.lib.utils import ImageReader
+            from reportlab.pdfgen import canvas
+        except ImportError as err:
+            skipped[StageTimer.PDF] = str(err)
+            return
+        if len(plots) == 0:
+            skipped[StageTimer.PDF] = 'No plots were rendered.'
+            return
+        xMax, yMax = BenchmarkHarness.__pageSize
+        plotWidth, plotHeight = BenchmarkHarness.__plotSize
+        xBorder, yBorder = BenchmarkHarness.__border
+        with StageTimer.Time(StageTimer.PDF):
+            pdf = canvas.Canvas(paths['OutputFolder'] + 'Benchmark Merlin Graphs.pdf', BenchmarkHarness.__pageSize)
+            for index in range(0, len(plots)):
+                position = index % 4
+                x = xBorder + (position % 2) * (plotWidth + xBorder)
+                y = yMax - (plotHeight + yBorder) - (position // 2) * (plotHeight + yBorder)
+                pdf.drawImage(ImageReader(BytesIO(plots[index].ImageBytes)), x, y, plotWidth, plotHeight)
+                if position == 3:
+                    pdf.showPage()
+            pdf.save()
+
+    def __WriteLogFile(self, plotTitles, paths):
+        """
+        * Write log file containing one issue per plot.
+        """
+        # Start from empty log file, so that results do not depend on previous runs:
+        logPath = paths['OutputFolder'] + 'LogFile/Benchmark LogFile %d.txt' % len(plotTitles)
+        if os.path.exists(logPath):
+            os.remove(logPath)
+        with StageTimer.Time(BenchmarkHarness.LogFileStage):
+            logFile = LogFile(self.Generator.ValueDate, CurveGenerator.RunTime, logPath)
+            for plotTitle in plotTitles:
+                logFile.Append(NonFatals.FailedToGeneratePNGS(callingFunc = 'BenchmarkHarness::WriteLogFile()', plotTitle = plotTitle, targetList = SortedList()))
+            logFile.Print()
@@ -0,0 +1,175 @@
+##############################################################################
+## CurveGenerator.py
+##############################################################################
+## Description:
+## * Writes synthetic Merlin discount factor files (tab separated
+## <Excel Serial Date>\t<Discount Factor> rows) and matching configuration
+## files, so that performance can be measured without production curves.
+
+from __future__ import division
+import datetime
+from Misc.ExcelDates import ExcelDates
+import numpy as np
+import os
+
+__all__ = ['CurveGenerator']
+
+class CurveGenerator(object):
+    " Object generates realistic discount factor curves for T and T-1, with a plotting configuration that references them. "
+    ##########################################################
+    ## Static Variables:
+    ##########################################################
+    # Default # of days in each curve (30 years of daily discount factors):
+    DefaultLength = 30 * 365
+    # Default # of distinct curves shared by all plots:
+    DefaultCurveCount = 20
+    # Default share of curves that are BRL curves (compounded, business day accrual):
+    DefaultBRLShare = 0.2
+    DefaultCurvesPerPlot = 2
+    # Forward rate periods (days) assigned to plots in rotation:
+    FwdRateConvs = [1, 30, 90, 180]
+    # Fixed dates so that generated files are identical between runs (T is a Friday):
+    DefaultValueDate = datetime.date(2018, 6, 15)
+    DefaultTMinusOne = datetime.date(2018, 6, 14)
+    RunTime = 'AM'
+    ##########################################################
+    ## Constructors:
+    ##########################################################
+    def __init__(self, folder, curveCount = DefaultCurveCount, length = DefaultLength, brlShare = DefaultBRLShare, curvesPerPlot = DefaultCurvesPerPlot, seed = 0):
+        """
+        * Overloaded constructor.
+        Inputs:
+        * folder: Folder that will contain generated curves and configuration files.
+        Optional Inputs:
+        * curveCount: # of distinct curves. Plots reference curves in rotation, as production plots share curves.
+        * length: # of daily discount factors in each curve.
+        * brlShare: Share of curves in [0, 1] that are BRL curves.
+        * curvesPerPlot: # of curves on each plot.
+        * seed: Random seed, so that generated curves are reproducible.
+        """
+        if not isinstance(curveCount, int) or curveCount < 1:
+            raise ValueError('curveCount must be a positive integer.')
+        if not isinstance(length, int) or length < 2:
+            raise ValueError('length must be an integer of at least 2.')
+        if not 0 <= brlShare <= 1:
+            raise ValueError('brlShare must be in [0, 1].')
+        if not isinstance(curvesPerPlot, int) or curvesPerPlot < 1:
+            raise ValueError('curvesPerPlot must be a positive integer.')
+        self.Folder = os.path.abspath(folder).replace('\\', '/') + '/'
+        self.CurveCount = curveCount
+        self.Length = length
+        self.BRLShare = brlShare
+        self.CurvesPerPlot = curvesPerPlot
+        self.Seed = seed
+        self.ValueDate = CurveGenerator.DefaultValueDate
+        self.TMinusOne = CurveGenerator.DefaultTMinusOne
+
+    ##########################################################
+    ## Public Methods:
+    ##########################################################
+    def Generate(self, plotCount):
+        """
+        * Write all curves for T and T-1, and configuration files containing plotCount plots.
+        Inputs:
+        * plotCount: # of plots in the plotting configuration.
+        Outputs:
+        * paths: Dictionary containing { 'PlotConfig', 'Filepaths', 'CurvesSignature', 'OutputFolder' } paths.
+        """
+        random = np.random.RandomState(self.Seed)
+        for curveName in self.CurveNames():
+            baseRate = random.uniform(0.005, 0.06)
+            for date, shift in ((self.ValueDate, 0), (self.TMinusOne, random.normal(0, 0.0003))):
+                serials, factors = self.DiscountFactors(date, self.Length, baseRate + shift, 'BRL' in curveName, random)
+                self.WriteCurve(self.CurvePath(curveName, date), serials, factors)
+
+        configFolder = self.Folder + 'Configs/'
+        if not os.path.exists(configFolder):
+            os.makedirs(configFolder)
+        paths = {'PlotConfig' : configFolder + 'Curve Plotting Configuration.csv', 'Filepaths' : configFolder + 'Filepaths.csv',
+                 'CurvesSignature' : self.Folder + 'Curves/{MM}{DD}{YY}/{CurveName}.txt', 'OutputFolder' : self.Folder + 'Output/'}
+        if not os.path.exists(paths['OutputFolder']):
+            os.makedirs(paths['OutputFolder'])
+        ##############
+        # Plotting configuration (same columns as production file):
+        ##############
+        curveNames = self.CurveNames()
+        lines = ['Plot Title,Curve Name,Plot T-1,Batch Time,Fwd Rate Numerator']
+        for plot in range(0, plotCount):
+            for index in range(0, self.CurvesPerPlot):
+                curveName = curveNames[(plot * self.CurvesPerPlot + index) % len(curveNames)]
+                fwdRateConv = CurveGenerator.FwdRateConvs[plot % len(CurveGenerator.FwdRateConvs)]
+                lines.append('Benchmark Plot %04d,%s,%s,%s,%d' % (plot + 1, curveName, ('TRUE' if index == 0 else 'FALSE'), CurveGenerator.RunTime, fwdRateConv))
+        self.__WriteLines(paths['PlotConfig'], lines)
+        ##############
+        # Filepaths (same rows as production file):
+        ##############
+        lines = ['FincadCurvesLocationSignature,%s' % paths['CurvesSignature'],
+                 'PDFOutputFileSignature,%s{YYYY}{MM}{DD}/{MM}{DD}{YY} {RunTime} Merlin Graphs.pdf' % paths['OutputFolder'],
+                 'PNGOutputLocationSignature,%s{YYYY}{MM}{DD}/{YYYY}-{MM}-{DD} MerlinCurveGraph-{PlotName}-{RunTime}.png' % paths['OutputFolder']]
+        self.__WriteLines(paths['Filepaths'], lines)
+
+        return paths
+
+    def CurveNames(self):
+        """
+        * Return names of all generated curves. BRL curves contain 'BRL' so they use compounded forward rates.
+        """
+        brlCount = int(round(self.CurveCount * self.BRLShare))
+        return ['BENCHBRL-%03d' % index if index < brlCount else 'BENCHUSD-%03d' % index for index in range(0, self.CurveCount)]
+
+    def CurvePath(self, curveName, date):
+        """
+        * Return path to generated discount factor file for curve on date.
+        """
+        return self.Folder + 'Curves/%s/%s.txt' % (date.strftime('%m%d%y'), curveName)
+
+    @classmethod
+    def DiscountFactors(self, date, length, baseRate, isBRL, random):
+        """
+        * Return (serials, discountFactors) for daily curve starting at date. Short rates follow an upward sloping term structure
+        with small daily noise and occasional policy steps. BRL curves only accrue on week days, so discount factors are flat over weekends.
+        Inputs:
+        * date: First date of curve.
+        * length: # of daily discount factors.
+        * baseRate: Overnight rate at start of curve.
+        * isBRL: Set to True to generate BRL curve.
+        * random: np.random.RandomState used to generate noise.
+        """
+        firstSerial = (date - ExcelDates.Epoch.date()).days
+        serials = np.arange(firstSerial, firstSerial + length, dtype = np.int64)
+        years = np.arange(0, length) / 365
+        shortRates = baseRate + 0.015 * (1 - np.exp(-years / 5)) + np.cumsum(random.normal(0, 0.00002, length))
+        steps = random.rand(length) < (8 / 365)
+        shortRates += np.cumsum(np.where(steps, random.choice([-0.0025, 0.0025], length), 0)) * np.exp(-years / 10)
+        accrual = np.full(length, 1 / 365)
+        if isBRL:
+            weekdays = (np.arange(0, length) + date.weekday()) % 7
+            accrual = np.where(weekdays < 5, 1 / 252, 0)
+        # First discount factor is 1 on the curve date:
+        accrual[0] = 0
+        factors = np.exp(-np.cumsum(np.maximum(shortRates, -0.005) * accrual))
+
+        return (serials, factors)
+
+    @classmethod
+    def WriteCurve(self, path, serials, factors):
+        """
+        * Write discount factor file in Merlin layout.
+        """
+        folder = os.path.dirname(path)
+        if not os.path.exists(folder):
+            os.makedirs(folder)
+        with open(path, 'wb') as f:
+            f.write('\n'.join(['%d\t%.12f' % (serial, factor) for serial, factor in zip(serials.tolist(), factors.tolist())]))
+            f.write('\n')
+
+    ##########################################################
+    ## Private Helpers:
+    ##########################################################
+    @classmethod
+    def __WriteLines(self, path, lines):
+        """
+        * Write lines to text file.
+        """
+        with open(path, 'w') as f:
+            f.write('\n'.join(lines) + '\n')
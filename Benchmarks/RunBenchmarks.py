@@ -0,0 +1,51 @@
+##############################################################################
+## RunBenchmarks.py
+##############################################################################
+## Description:
+## * Generate synthetic Merlin curves, time every stage at 10, 100 and 1000 plots
+## (by default) and output results as JSON. Pass --compare <JSON> to compare
+## results with a previous run.
+## Usage (from application folder): python -m Benchmarks.RunBenchmarks [options]
+
+import argparse
+from Benchmarks.BenchmarkHarness import BenchmarkHarness
+from Benchmarks.CurveGenerator import CurveGenerator
+import os
+import tempfile
+
+#############################################
+# main():
+# * Main method for benchmarks.
+#############################################
+def main():
+    parser = argparse.ArgumentParser(description = 'Benchmark the Merlin Plotting Tool using synthetic curves.')
+    parser.add_argument('--folder', type = str, dest = 'Folder', help = 'Folder for generated curves and output. Uses temporary folder by default.', default = None)
+    parser.add_argument('--output', type = str, dest = 'Output', help = 'Path to output JSON results.', default = 'Benchmark Results.json')
+    parser.add_argument('--compare', type = str, dest = 'Compare', help = 'Path to JSON results of a previous run to compare against.', default = None)
+    parser.add_argument('--sizes', type = int, dest = 'Sizes', help = 'Plot counts to benchmark.', nargs = '+', default = BenchmarkHarness.DefaultSizes)
+    parser.add_argument('--curves', type = int, dest = 'Curves', help = 'Number of distinct curves.', default = CurveGenerator.DefaultCurveCount)
+    parser.add_argument('--length', type = int, dest = 'Length', help = 'Number of daily discount factors in each curve.', default = CurveGenerator.DefaultLength)
+    parser.add_argument('--brlshare', type = float, dest = 'BRLShare', help = 'Share of curves that are BRL curves.', default = CurveGenerator.DefaultBRLShare)
+    args = parser.parse_args()
+
+    folder = (args.Folder if args.Folder else tempfile.mkdtemp(prefix = 'MerlinBenchmark'))
+    generator = CurveGenerator(folder, curveCount = args.Curves, length = args.Length, brlShare = args.BRLShare)
+    harness = BenchmarkHarness(generator, args.Sizes)
+    results = harness.Run()
+    harness.WriteResults(args.Output)
+
+    for size in sorted(results['results'].keys(), key = int):
+        print('\n%s plots (%.2f seconds):' % (size, results['results'][size]['total']))
+        for row in results['results'][size]['stages']:
+            print('%-16s %8d %10.3f' % (row['stage'], row['count'], row['wall']))
+        for stage, reason in sorted(results['results'][size]['skipped'].items()):
+            print('%-16s skipped (%s)' % (stage, reason))
+    print('\nResults written to %s.' % os.path.abspath(args.Output))
+    if args.Compare:
+        print(BenchmarkHarness.Compare(args.Compare, results))
+
+###########################
+# Statement used to execute the main method if this file is directly executed by python interpreter.
+###########################
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,11 @@
+##############################################################################
+## Benchmarks\__init__.py
+##############################################################################
+## Description:
+## * Synthetic curve generator and benchmark harness used to measure performance
+## without production curves (run RunBenchmarks.py).
+
+__all__ = [ 'BenchmarkHarness', 'CurveGenerator' ]
+
+import Benchmarks.BenchmarkHarness
+import Benchmarks.CurveGenerator
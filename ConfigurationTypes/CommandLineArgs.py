@@ -34,8 +34,25 @@ class CommandLineArgs(FileType):
         * T1Override: Passing '--t1 <Date>' will change the default T-1 date to provided one.
         * UATMode: Passing '--uat' will display application mode as UAT, and will by default use UAT paths listed in the Filepaths.csv file, otherwise use
         the passed paths.
+        * NoCache: Passing '--nocache' will bypass the local caches of parsed Merlin Curves and rendered plot images.
+        * ClearCache: Passing '--clearcache' will delete all locally cached Merlin Curves and rendered plot images before running.
+        * Screen: Passing '--screen' will screen all curves for anomalies and output a ranked report instead of rendering plots.
+        * ScreenRender: Passing '--screenrender' will screen all curves and only render plots containing flagged curves.
+        * MaxShift: Passing '--maxshift <bps>' will override the maximum day-over-day forward rate shift used when screening.
+        * MaxJump: Passing '--maxjump <bps>' will override the maximum change between adjacent forward rates used when screening.
+        * MinRate: Passing '--minrate <bps>' will override the minimum forward rate used when screening.
+        * Workers: Passing '--workers <N>' will render plots in N worker processes.
+        * PrefetchDepth: Passing '--prefetch <N>' will set how many plots have their curves read ahead of rendering (0 to disable).
+        * Timings: Passing '--timings <PATH>' will output a JSON report of time spent in each stage and plot.
+        * Profile: Passing '--profile' will run each stage under cProfile and output .pstats files and allocation snapshots next to the log file.
+        * VectorPDF: Passing '--vectorpdf' will draw plots into the PDF as vector graphics, skipping PNG rendering if no email is generated.
     """
     ##########################################################
+    ## Static Variables:
+    ##########################################################
+    # Default # of plots whose curves are read ahead of rendering (see CurvePrefetcher):
+    DefaultPrefetchDepth = 4
+    ##########################################################
     ## Constructors:
     ##########################################################
     def __init__(self):
@@ -68,6 +85,18 @@ class CommandLineArgs(FileType):
         parser.add_argument('--t1', type = self.__StrToDate, dest = 'TMinusOne', help ="T-1 date override. By default is first previous business day from ValueDate.", nargs=1) 
         parser.add_argument('--tpath', type=str, dest='TPath', help="Override path to T Merlin discount factor curves. Path must exist.", nargs=1)
         parser.add_argument('--t1path', type=str, dest = 'TMinusOnePath', help ="Overwrite path to T-1 Merlin discount factor curves. Path must exist.", nargs=1) 
+        parser.add_argument('--nocache', dest = 'NoCache', help = 'Bypass the local caches of parsed Merlin discount factor curves and rendered plot images.', action = 'store_true')
+        parser.add_argument('--clearcache', dest = 'ClearCache', help = 'Delete all locally cached Merlin discount factor curves and rendered plot images before running.', action = 'store_true')
+        parser.add_argument('--screen', dest = 'Screen', help = 'Screen all curves for anomalies and output ranked report without rendering plots.', action = 'store_true')
+        parser.add_argument('--screenrender', dest = 'ScreenRender', help = 'Screen all curves and only render plots containing curves that failed screening.', action = 'store_true')
+        parser.add_argument('--maxshift', type = float, dest = 'MaxShift', help = 'Maximum day-over-day forward rate shift (bps) allowed when screening.', nargs=1)
+        parser.add_argument('--maxjump', type = float, dest = 'MaxJump', help = 'Maximum change between adjacent forward rates (bps) allowed when screening.', nargs=1)
+        parser.add_argument('--minrate', type = float, dest = 'MinRate', help = 'Minimum forward rate (bps) allowed when screening.', nargs=1)
+        parser.add_argument('--prefetch', type = int, dest = 'Prefetch', help = 'Number of plots whose curves are read in background ahead of rendering (default 4, 0 to disable).', nargs=1)
+        parser.add_argument('--workers', type = int, dest = 'Workers', help = 'Number of worker processes used to render plots. Plots are rendered in this process by default.', nargs=1)
+        parser.add_argument('--timings', type = str, dest = 'TimingsPath', help = 'Output JSON report of time spent in each stage and plot to provided path.', nargs=1)
+        parser.add_argument('--profile', dest = 'Profile', help = 'Profile each stage, writing .pstats files and allocation snapshots to LogFile/Profiles/.', action = 'store_true')
+        parser.add_argument('--vectorpdf', dest = 'VectorPDF', help = 'Draw plots into the PDF as vector graphics. PNGs are only rendered if the email is generated.', action = 'store_true')
         
         error = Fatals.CommandLineErrors("CommandLineArgs()")
         # Pull in all command line arguments and input into the CommandLineArgs class:
@@ -94,22 +123,46 @@ class CommandLineArgs(FileType):
         argDict['TMinusOnePath'] = ((args[0].TMinusOnePath[0] if args[0].TMinusOnePath else None), '--t1path')
         argDict['TPath'] = ((args[0].TPath[0] if args[0].TPath else None), '--tpath')
         argDict['TestImagePath'] = ((args[0].TestImagePath[0] if args[0].TestImagePath else None), '--testpath')
+        argDict['NoCacheMode'] = (args[0].NoCache, '--nocache')
+        argDict['ClearCacheMode'] = (args[0].ClearCache, '--clearcache')
+        argDict['ScreenMode'] = (args[0].Screen, '--screen')
+        argDict['ScreenRenderMode'] = (args[0].ScreenRender, '--screenrender')
+        argDict['MaxShift'] = ((args[0].MaxShift[0] if args[0].MaxShift else None), '--maxshift')
+        argDict['MaxJump'] = ((args[0].MaxJump[0] if args[0].MaxJump else None), '--maxjump')
+        argDict['MinRate'] = ((args[0].MinRate[0] if args[0].MinRate else None), '--minrate')
+        argDict['PrefetchDepth'] = ((args[0].Prefetch[0] if args[0].Prefetch is not None else None), '--prefetch')
+        argDict['Workers'] = ((args[0].Workers[0] if args[0].Workers else None), '--workers')
+        argDict['VectorPDFMode'] = (args[0].VectorPDF, '--vectorpdf')
+        argDict['TimingsPath'] = ((args[0].TimingsPath[0] if args[0].TimingsPath else None), '--timings')
+        argDict['ProfileMode'] = (args[0].Profile, '--profile')
 
         # Instantiate all of this object's properties to defaults:
+        self.__ClearCacheMode = None
         self.__ConfigFilePath = None
+        self.__MaxJump = None
+        self.__MaxShift = None
+        self.__MinRate = None
         self.__NoPDFMode = None
         self.__NoEmailMode = None
+        self.__NoCacheMode = None
         self.__NoLogFileMode = None
         self.__PNGInputPath = None
         self.__PNGOutputPath = None
         self.__PDFPath = None
+        self.__PrefetchDepth = None
+        self.__ProfileMode = None
         self.__RunTime = None
+        self.__ScreenMode = None
+        self.__ScreenRenderMode = None
         self.__UATMode = None
         self.__TMinusOne = None
         self.__TMinusOnePath = None
         self.__TestImagePath = None
+        self.__TimingsPath = None
         self.__TPath = None
         self.__ValueDate = None
+        self.__VectorPDFMode = None
+        self.__Workers = None
         
         ################################
         # Set all of this object's properties, collect incorrectly passed parameters:
@@ -152,6 +205,17 @@ class CommandLineArgs(FileType):
         messageString += ('\nUsing T-1 Merlin Curves located in \n%s.' % self.TMinusOnePath if self.TMinusOnePath else '')
         messageString += ('\nUsing PNGS to generate PDF or email, located in \n%s.' % self.PNGInputPath if self.PNGInputPath else '')
         messageString += ('\nPDF will be output to\n%s.' % self.PDFPath if self.PDFPath else '')
+        messageString += ('\nLocal Merlin Curve and plot image caches will be bypassed.' if self.NoCacheMode else '')
+        messageString += ('\nLocal Merlin Curve and plot image caches will be cleared.' if self.ClearCacheMode else '')
+        messageString += ('\nScreening all curves, only rendering plots that fail screening.' if self.ScreenRenderMode else ('\nScreening all curves without rendering plots.' if self.ScreenMode else ''))
+        messageString += ('\nScreening with maximum shift of %s bps.' % self.MaxShift if self.MaxShift is not None else '')
+        messageString += ('\nScreening with maximum jump of %s bps.' % self.MaxJump if self.MaxJump is not None else '')
+        messageString += ('\nScreening with minimum rate of %s bps.' % self.MinRate if self.MinRate is not None else '')
+        messageString += ('\nRendering plots using %d worker processes.' % self.Workers if self.Workers > 1 else '')
+        messageString += ('\nCurves will not be read ahead of rendering.' if self.PrefetchDepth == 0 else '')
+        messageString += ('\nPlots will be drawn into PDF as vector graphics.' if self.VectorPDFMode else '')
+        messageString += ('\nTimings report will be output to\n%s.' % self.TimingsPath if self.TimingsPath else '')
+        messageString += ('\nEach stage will be profiled.' if self.ProfileMode else '')
 
         return messageString
             
@@ -159,14 +223,34 @@ class CommandLineArgs(FileType):
     ## Class Properties:
     ##########################################################
     @property
+    def ClearCacheMode(self):
+        " Indicate whether locally cached Merlin Curves will be deleted before running. "
+        return self.__ClearCacheMode
+    @property
     def ConfigFilePath(self):
         " Return overwrite path to configuration file. "
         return self.__ConfigFilePath
     @property
+    def MaxJump(self):
+        " Return maximum change between adjacent forward rates (bps) used when screening, or None if not overridden. "
+        return self.__MaxJump
+    @property
+    def MaxShift(self):
+        " Return maximum day-over-day forward rate shift (bps) used when screening, or None if not overridden. "
+        return self.__MaxShift
+    @property
+    def MinRate(self):
+        " Return minimum forward rate (bps) used when screening, or None if not overridden. "
+        return self.__MinRate
+    @property
     def NoEmailMode(self):
         " Indicate whether application will generate the final PNG email. "
         return self.__NoEmailMode
     @property
+    def NoCacheMode(self):
+        " Indicate whether application will bypass the local Merlin Curve cache. "
+        return self.__NoCacheMode
+    @property
     def NoPDFMode(self):
         " Return whether application will generate PDF. "
         return self.__NoPDFMode
@@ -187,14 +271,34 @@ class CommandLineArgs(FileType):
         " Return the overridden PDF path."
         return self.__PDFPath
     @property
+    def PrefetchDepth(self):
+        " Return # of plots whose curves are read in background ahead of rendering. "
+        return self.__PrefetchDepth
+    @property
+    def ProfileMode(self):
+        " Indicate whether each stage will be profiled. "
+        return self.__ProfileMode
+    @property
     def RunTime(self):
         " Indicate application run time. "
         return self.__RunTime
     @property
+    def ScreenMode(self):
+        " Indicate whether curves will be screened for anomalies before rendering. "
+        return self.__ScreenMode
+    @property
+    def ScreenRenderMode(self):
+        " Indicate whether only plots containing curves that failed screening will be rendered. "
+        return self.__ScreenRenderMode
+    @property
     def TestImagePath(self):
         " Return path to generated test image."
         return self.__TestImagePath
     @property
+    def TimingsPath(self):
+        " Return path to output JSON timings report."
+        return self.__TimingsPath
+    @property
     def TMinusOne(self):
         " Return the T-1 date. "
         return self.__TMinusOne
@@ -218,10 +322,35 @@ class CommandLineArgs(FileType):
     def ValueDate(self):
         " Return application's value date. "
         return self.__ValueDate
+    @property
+    def VectorPDFMode(self):
+        " Indicate whether plots will be drawn into the PDF as vector graphics. "
+        return self.__VectorPDFMode
+    @property
+    def Workers(self):
+        " Return # of worker processes used to render plots. "
+        return self.__Workers
 
     ##########################################################
     ## Mutators:
     ##########################################################
+    @ClearCacheMode.setter
+    def ClearCacheMode(self, clearCache):
+        """
+        * Validate and set ClearCacheMode.
+        Inputs:
+        * clearCache: Expecting a boolean, None or string that can be converted to boolean.
+        """
+        if clearCache is None:
+            # Set to default:
+            self.__ClearCacheMode = False
+        elif isinstance(clearCache, bool):
+            self.__ClearCacheMode = clearCache
+        elif isinstance(clearCache, str):
+            self.__ClearCacheMode = StrToBool(clearCache)
+        else:
+            raise ValueError('Must be a string or boolean.')
+
     @ConfigFilePath.setter
     def ConfigFilePath(self, configFilePath):
         """
@@ -240,6 +369,33 @@ class CommandLineArgs(FileType):
         else:
             raise ValueError('Must be a string csv file path or None.')
     
+    @MaxJump.setter
+    def MaxJump(self, maxJump):
+        """
+        * Validate and set the maximum adjacent forward rate change used when screening.
+        Inputs:
+        * maxJump: Expecting None, a positive number or string convertible to positive number (basis points).
+        """
+        self.__MaxJump = self.__StrToThreshold(maxJump, True)
+
+    @MaxShift.setter
+    def MaxShift(self, maxShift):
+        """
+        * Validate and set the maximum day-over-day forward rate shift used when screening.
+        Inputs:
+        * maxShift: Expecting None, a positive number or string convertible to positive number (basis points).
+        """
+        self.__MaxShift = self.__StrToThreshold(maxShift, True)
+
+    @MinRate.setter
+    def MinRate(self, minRate):
+        """
+        * Validate and set the minimum forward rate used when screening.
+        Inputs:
+        * minRate: Expecting None, a number or string convertible to number (basis points).
+        """
+        self.__MinRate = self.__StrToThreshold(minRate, False)
+
     @NoEmailMode.setter
     def NoEmailMode(self, noEmailMode):
         """
@@ -274,6 +430,23 @@ class CommandLineArgs(FileType):
         else:
             raise ValueError('Must be string or boolean.')
 
+    @NoCacheMode.setter
+    def NoCacheMode(self, noCache):
+        """
+        * Validate and set NoCacheMode.
+        Inputs:
+        * noCache: Expecting a boolean, None or string that can be converted to boolean.
+        """
+        if noCache is None:
+            # Set to default:
+            self.__NoCacheMode = False
+        elif isinstance(noCache, bool):
+            self.__NoCacheMode = noCache
+        elif isinstance(noCache, str):
+            self.__NoCacheMode = StrToBool(noCache)
+        else:
+            raise ValueError('Must be a string or boolean.')
+
     @NoPDFMode.setter
     def NoPDFMode(self, nopdf):
         """
@@ -318,6 +491,25 @@ class CommandLineArgs(FileType):
         if self.PDFPath:
             self.NoPDFMode = False
 
+    @PrefetchDepth.setter
+    def PrefetchDepth(self, depth):
+        """
+        * Validate and set the # of plots whose curves are read ahead of rendering.
+        Inputs:
+        * depth: Expecting None, a non-negative integer or string convertible to non-negative integer. If None then will use default depth.
+        """
+        if depth is None:
+            # Set to default:
+            self.__PrefetchDepth = CommandLineArgs.DefaultPrefetchDepth
+            return
+        try:
+            depth = int(depth)
+        except (TypeError, ValueError):
+            raise ValueError('Must be a non-negative integer.')
+        if depth < 0:
+            raise ValueError('Must be a non-negative integer.')
+        self.__PrefetchDepth = depth
+
     @PNGInputPath.setter
     def PNGInputPath(self, path):
         """
@@ -360,6 +552,23 @@ class CommandLineArgs(FileType):
         else:
             raise ValueError('Must be a string or None.')
 
+    @ProfileMode.setter
+    def ProfileMode(self, profile):
+        """
+        * Validate and set ProfileMode.
+        Inputs:
+        * profile: Expecting a boolean, None or string that can be converted to boolean.
+        """
+        if profile is None:
+            # Set to default:
+            self.__ProfileMode = False
+        elif isinstance(profile, bool):
+            self.__ProfileMode = profile
+        elif isinstance(profile, str):
+            self.__ProfileMode = StrToBool(profile)
+        else:
+            raise ValueError('Must be a string or boolean.')
+
     @RunTime.setter
     def RunTime(self, runTime):
         """
@@ -374,6 +583,43 @@ class CommandLineArgs(FileType):
             raise ValueError('Must be one of {AM/PM/CAPULA}.')
         self.__RunTime = runTime
 
+    @ScreenMode.setter
+    def ScreenMode(self, screen):
+        """
+        * Validate and set ScreenMode.
+        Inputs:
+        * screen: Expecting a boolean, None or string that can be converted to boolean.
+        """
+        if screen is None:
+            # Set to default:
+            self.__ScreenMode = False
+        elif isinstance(screen, bool):
+            self.__ScreenMode = screen
+        elif isinstance(screen, str):
+            self.__ScreenMode = StrToBool(screen)
+        else:
+            raise ValueError('Must be a string or boolean.')
+
+    @ScreenRenderMode.setter
+    def ScreenRenderMode(self, screenRender):
+        """
+        * Validate and set ScreenRenderMode. Screening will be enabled if set.
+        Inputs:
+        * screenRender: Expecting a boolean, None or string that can be converted to boolean.
+        """
+        if screenRender is None:
+            # Set to default:
+            self.__ScreenRenderMode = False
+        elif isinstance(screenRender, bool):
+            self.__ScreenRenderMode = screenRender
+        elif isinstance(screenRender, str):
+            self.__ScreenRenderMode = StrToBool(screenRender)
+        else:
+            raise ValueError('Must be a string or boolean.')
+        # Rendering flagged plots requires screening:
+        if self.__ScreenRenderMode:
+            self.ScreenMode = True
+
     @TMinusOne.setter
     def TMinusOne(self, t1Override):
         """
@@ -503,6 +749,23 @@ class CommandLineArgs(FileType):
             self.PNGOutputPath = None
         """
 
+    @TimingsPath.setter
+    def TimingsPath(self, timingsPath):
+        """
+        * Validate and set the path to output the JSON timings report.
+        Inputs:
+        * timingsPath: Expecting None or a string path to a .json file. If None then property will be set to a blank string.
+        """
+        if timingsPath is None:
+            # Set to default:
+            self.__TimingsPath = ''
+        elif isinstance(timingsPath, str):
+            if not timingsPath.lower().endswith('.json'):
+                raise ValueError('Must use .json extension.')
+            self.__TimingsPath = self.FixPath(timingsPath)
+        else:
+            raise ValueError('Must be a string or None.')
+
     @ValueDate.setter
     def ValueDate(self, valueDate):
         """
@@ -528,6 +791,42 @@ class CommandLineArgs(FileType):
         elif self.__ValueDate and self.__TMinusOne > self.__ValueDate:
             raise ValueError('T-1 must be before ValueDate.')
 
+    @VectorPDFMode.setter
+    def VectorPDFMode(self, vectorPDF):
+        """
+        * Validate and set VectorPDFMode.
+        Inputs:
+        * vectorPDF: Expecting a boolean, None or string that can be converted to boolean.
+        """
+        if vectorPDF is None:
+            # Set to default:
+            self.__VectorPDFMode = False
+        elif isinstance(vectorPDF, bool):
+            self.__VectorPDFMode = vectorPDF
+        elif isinstance(vectorPDF, str):
+            self.__VectorPDFMode = StrToBool(vectorPDF)
+        else:
+            raise ValueError('Must be a string or boolean.')
+
+    @Workers.setter
+    def Workers(self, workers):
+        """
+        * Validate and set the # of worker processes used to render plots.
+        Inputs:
+        * workers: Expecting None, a positive integer or string convertible to positive integer. If None then plots will be rendered in this process.
+        """
+        if workers is None:
+            # Set to default:
+            self.__Workers = 1
+            return
+        try:
+            workers = int(workers)
+        except (TypeError, ValueError):
+            raise ValueError('Must be a positive integer.')
+        if workers < 1:
+            raise ValueError('Must be a positive integer.')
+        self.__Workers = workers
+
     ##########################################################
     ## Private Helpers:
     ##########################################################
@@ -545,6 +844,23 @@ class CommandLineArgs(FileType):
         except:
             return False
 
+    def __StrToThreshold(self, threshold, positive):
+        """
+        * Return threshold converted to float, or None if not provided.
+        Input:
+        * threshold: None, number or string convertible to number.
+        * positive: Set to True to require threshold to be greater than 0.
+        """
+        if threshold is None:
+            return None
+        try:
+            threshold = float(threshold)
+        except (TypeError, ValueError):
+            raise ValueError('Must be a number.')
+        if positive and threshold <= 0:
+            raise ValueError('Must be a positive number.')
+        return threshold
+
     def __StrToDate(self, dateString):
         """
         * Return string converted to date object if passed string is a date.
@@ -0,0 +1,130 @@
+##############################################################################
+## ConfigSnapshot.py
+##############################################################################
+## Description:
+## * Compiled snapshot of the validated contents of all configuration files,
+## stored as a single pickle next to the .csv files. The snapshot is keyed by
+## each source file's path, size, modification time and hash, and is only
+## used if no source file has changed since it was written.
+
+from DirectoryTypes.FileType import FileType
+import hashlib
+import os
+import sys
+if sys.version_info[0] > 2:
+    import pickle
+else:
+    import cPickle as pickle
+
+__all__ = ['ConfigSnapshot']
+
+class ConfigSnapshot(FileType):
+    " Object restores configuration files from a snapshot of their parsed contents, rather than parsing and validating each .csv file. "
+    ##########################################################
+    ## Static Variables:
+    ##########################################################
+    # Set to False to always parse configuration files:
+    Enabled = True
+    # Increment when layout of snapshot or of any configuration file object changes, so that older snapshots are ignored:
+    Version = 1
+    ##########################################################
+    ## Constructors:
+    ##########################################################
+    def __init__(self, UATMode):
+        """
+        * Overloaded constructor.
+        Inputs:
+        * UATMode: Expecting a boolean value. The file will use production paths if is not a boolean or is True.
+        """
+        # This file lives alongside the configuration files in the "...\MerlinPlotting\Configs\{UAT/Prod}\" folder:
+        UATMode = (False if not isinstance(UATMode, bool) else UATMode)
+        path = FileType.ConvertSignature('{LocalPath}\\Configs\\{UAT/Prod}\\Configuration Snapshot.pickle', UAT = UATMode)
+        name = FileType.ExtractFileName(path)
+        if sys.version_info[0] > 2:
+            super().__init__(path, name)
+        else:
+            super(ConfigSnapshot, self).__init__(path, name)
+        # List of (class name, path, size, modification time) for each source file, taken before files were parsed:
+        self.__Sources = None
+
+    ##########################################################
+    ## Public Methods:
+    ##########################################################
+    def Load(self, files):
+        """
+        * Restore contents of all files from snapshot if snapshot exists and no source file has changed.
+        Inputs:
+        * files: List of configuration file objects (ex: FilepathsFile).
+        Outputs:
+        * Returns True if all files were restored. Files must be parsed (then Save() called) otherwise.
+        """
+        self.__Sources = self.__Stat(files)
+        if not ConfigSnapshot.Enabled or self.__Sources is None:
+            return False
+        try:
+            with open(self.Path, 'rb') as f:
+                snapshot = pickle.load(f)
+            if snapshot['Version'] != ConfigSnapshot.Version or len(snapshot['Sources']) != len(self.__Sources):
+                return False
+            refresh = False
+            for (className, path, size, modified), (storedClassName, storedPath, storedSize, storedModified, storedHash) in zip(self.__Sources, snapshot['Sources']):
+                if (className, path, size) != (storedClassName, storedPath, storedSize):
+                    return False
+                # Files whose modification time changed (ex: saved or copied without edits) are unchanged if contents hash to the same value:
+                if modified != storedModified:
+                    if self.__Hash(path) != storedHash:
+                        return False
+                    refresh = True
+            for file, contents in zip(files, snapshot['Contents']):
+                file.__dict__.update(contents)
+        except Exception:
+            # Unreadable or outdated snapshots are rebuilt by caller:
+            return False
+        if refresh:
+            self.Save(files)
+        return True
+
+    def Save(self, files):
+        """
+        * Write parsed contents of all files to snapshot. Call after all files were parsed without errors.
+        Snapshot is not written if any source file changed while being parsed, or if snapshot could not be written.
+        Inputs:
+        * files: List of configuration file objects (ex: FilepathsFile), in the same order passed to Load().
+        """
+        if not ConfigSnapshot.Enabled or self.__Sources is None or self.__Stat(files) != self.__Sources:
+            return
+        try:
+            snapshot = { 'Version' : ConfigSnapshot.Version,
+                        'Sources' : [(className, path, size, modified, self.__Hash(path)) for className, path, size, modified in self.__Sources],
+                        'Contents' : [dict(file.__dict__) for file in files] }
+            # Write through temporary file so that partially written snapshots are never read (temporary file is removed on failure):
+            self.WriteAtomically(self.Path, lambda f: pickle.dump(snapshot, f, pickle.HIGHEST_PROTOCOL))
+        except Exception:
+            # Snapshot is optional (ex: file could not be written, or contents could not be pickled), so configuration files will be parsed on next run:
+            return
+
+    ##########################################################
+    ## Private Helpers:
+    ##########################################################
+    @classmethod
+    def __Stat(self, files):
+        """
+        * Return list of (class name, normalized path, size, modification time) for each file, or None if any file could not be found.
+        """
+        sources = []
+        for file in files:
+            path = os.path.normcase(os.path.abspath(file.Path))
+            try:
+                stats = os.stat(path)
+            except OSError:
+                return None
+            sources.append((type(file).__name__, path, stats.st_size, stats.st_mtime))
+        return sources
+
+    @classmethod
+    def __Hash(self, path):
+        """
+        * Return sha1 hash of file's contents.
+        """
+        with open(path, 'rb') as f:
+            return hashlib.sha1(f.read()).hexdigest()
@@ -7,6 +7,7 @@
 from datetime import datetime
 from DirectoryTypes.FileType import FileType
 import ConfigurationTypes.CommandLineArgs as CmdArgs
+from ConfigurationTypes.ConfigSnapshot import ConfigSnapshot
 from ConfigurationTypes.EmailConfigurationFile import EmailConfigurationFile
 from ConfigurationTypes.MerlinGUIWorkbook import MerlinGUIWorkbook
 from ConfigurationTypes.PlottingConfigFile import PlottingConfigFile
@@ -36,6 +37,8 @@ class ConfigurationContainer(FileType):
         self.PlotConfigs = PlottingConfigFile(self.UATMode)
         # Filepaths.csv stores all file and folder signatures for input and output. Use overwrite path if provided on command line:
         self.Filepaths = FilepathsFile(self.UATMode)
+        # Snapshot of validated contents of all configuration files, used if no file has changed since last run:
+        self.Snapshot = ConfigSnapshot(self.UATMode)
         
     ##########################################################
     ## Public Methods:
@@ -58,17 +61,20 @@ class ConfigurationContainer(FileType):
             raise error
 
         ####################
-        # Pull in all files, store files that could not be pulled:
+        # Restore all files from snapshot if none have changed, otherwise pull in all files and store files that could not be pulled:
         ####################
-        for file in files:
-            try:
-                file.GetContents()
-            except Fatals.ConfigFilesMissing as err:
-                error.Merge(err)
+        if not self.Snapshot.Load(files):
+            for file in files:
+                try:
+                    file.GetContents()
+                except Fatals.ConfigFilesMissing as err:
+                    error.Merge(err)
     
-        # Raise exception if failed to get any files:
-        if error.HasErrors:
-            raise error
+            # Raise exception if failed to get any files:
+            if error.HasErrors:
+                raise error
+
+            self.Snapshot.Save(files)
 
         # Overwrite using command line arguments if necessary:
         self.__CmdArgsOverwrite()
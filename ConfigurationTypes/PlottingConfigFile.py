@@ -32,6 +32,10 @@ class PlottingConfigFile(FileType):
         name = FileType.ExtractFileName(path)
         self.__Plots = None
         self.__InsertionTracker = None
+        # Secondary indexes built by GetContents(): { Curve Name -> [Plot Titles] }, { Run Time -> [Plot Titles] } and { Plot Title -> Position }:
+        self.__CurvePlots = None
+        self.__RunTimePlots = None
+        self.__PlotPositions = None
         if sys.version_info[0] > 2:
             super().__init__(path, name)
         else:
@@ -60,11 +64,36 @@ class PlottingConfigFile(FileType):
         Inputs:
         * curveName: Name of curve desired.
         """
-        for rowGroup in self.__Plots.items():
-            if curveName in rowGroup:
-                return rowGroup[curveName]
+        plotTitles = self.__CurvePlots.get(curveName, None)
         # Return null object if could not find:
-        return None
+        if not plotTitles:
+            return None
+        return self.__Plots[plotTitles[0]][curveName]
+
+    def GetPlotsWithCurve(self, curveName):
+        """
+        * Return list of titles of plots containing curve, in the order they appear in the configuration file.
+        Inputs:
+        * curveName: Name of curve desired.
+        """
+        return list(self.__CurvePlots.get(curveName, []))
+
+    def GetPlotsForRunTime(self, runTime):
+        """
+        * Return list of titles of plots generated at run time, in the order they appear in the configuration file.
+        A plot's run time is the run time of its first curve in the file.
+        Inputs:
+        * runTime: Batch time, one of {AM, PM, CAPULA}.
+        """
+        return list(self.__RunTimePlots.get(runTime, []))
+
+    def GetPlotPosition(self, plotTitle):
+        """
+        * Return position of plot in the configuration file (starting at 0), or None if plot is not configured.
+        Inputs:
+        * plotTitle: Title of plot.
+        """
+        return self.__PlotPositions.get(plotTitle, None)
 
     ##########################################################
     ## Mutators:
@@ -76,9 +105,12 @@ class PlottingConfigFile(FileType):
         # Attempt to open csv at stored path:
         if not FileType.CheckPath(self.Path):
             raise Fatals.ConfigFilesMissing(callingFunc = 'PlottingConfigFile::GetContents()', fileName = self.Name, filePath = self.Path)
-        # Reset the plot container and insertion order tracker:
+        # Reset the plot container, insertion order tracker and indexes:
         self.__Plots = {}
         self.__InsertionTracker = []
+        self.__CurvePlots = {}
+        self.__RunTimePlots = {}
+        self.__PlotPositions = {}
         ##############################
         # Pull contents from file:
         ##############################
@@ -90,12 +122,17 @@ class PlottingConfigFile(FileType):
                     if not atHeader:
                         # Add new entry for plot if not already in stored map:
                         plotTitle = row[0].strip()
-                        if plotTitle not in self.__Plots.keys():
-                            self.__Plots[plotTitle] = {}
-                            self.__InsertionTracker.append(plotTitle)
                         # Create new row for mapper:
                         newRow = CurveConfig([col.strip() for col in row])
+                        if plotTitle not in self.__Plots:
+                            self.__Plots[plotTitle] = {}
+                            self.__PlotPositions[plotTitle] = len(self.__InsertionTracker)
+                            self.__InsertionTracker.append(plotTitle)
+                            # Plot is generated at run time of its first curve:
+                            self.__RunTimePlots.setdefault(newRow.RunTime, []).append(plotTitle)
                         # Append new row to mapper:
+                        if newRow.Curve not in self.__Plots[plotTitle]:
+                            self.__CurvePlots.setdefault(newRow.Curve, []).append(plotTitle)
                         self.__Plots[plotTitle][newRow.Curve] = newRow
                     atHeader = False
         except Exception as err:
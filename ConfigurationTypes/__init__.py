@@ -5,9 +5,12 @@
 ## * Import all Configuration type objects that determine functionality of
 ## this application.
 
-__all__ = [ 'ConfigurationContainer', 'EmailConfigurationFile', 'PlottingConfigFile' ]
+__all__ = [ 'ConfigSnapshot', 'ConfigurationContainer', 'EmailConfigurationFile', 'PlottingConfigFile' ]
 
-import ConfigurationTypes.ConfigurationContainer
+import ConfigurationTypes.ConfigSnapshot
 import ConfigurationTypes.EmailConfigurationFile
 import ConfigurationTypes.PlottingConfigFile
 
+# Note: ConfigurationContainer requires openpyxl (MerlinGUIWorkbook), so is imported where used rather than here. Configuration files
+# can then be parsed individually without it (ex: Benchmarks\RunBenchmarks.py).
+
@@ -0,0 +1,219 @@
+##############################################################################
+## CurveCache.py
+##############################################################################
+## Description:
+## * Local on-disk cache of parsed Merlin discount factor curves, stored as .npz
+## files keyed by the source file's resolved path, size and modification time.
+
+from DirectoryTypes.DirectoryIndex import DirectoryIndex
+from DirectoryTypes.DirectoryType import DirectoryType
+import hashlib
+import numpy as np
+import os
+import threading
+
+__all__ = ['CurveCache']
+
+class CurveCache(DirectoryType):
+    " Object stores parsed date and discount factor arrays locally so unchanged curves are not re-read from the network share. "
+    ##########################################################
+    ## Static Variables:
+    ##########################################################
+    # Default cache location and maximum size (in megabytes):
+    DefaultFolder = '{LocalPath}/Cache/Curves/'
+    DefaultMaxSize = 500
+    __Extension = '.npz'
+    ##########################################################
+    ## Constructors:
+    ##########################################################
+    def __init__(self, folder = DefaultFolder, maxSize = DefaultMaxSize, enabled = True):
+        """
+        * Overloaded constructor.
+        Optional Inputs:
+        * folder: Folder path to store cached curves. Supports signatures in ConvertSignature().
+        * maxSize: Maximum size of cache in megabytes. Least recently used curves will be evicted once exceeded.
+        * enabled: Set to False to bypass the cache entirely.
+        """
+        self.Folder = folder
+        self.MaxSize = maxSize
+        self.Enabled = enabled
+        # Total size of cache folder in bytes, calculated on first write:
+        self.__CurrentSize = None
+        # Guards size accounting and eviction when curves are cached from multiple threads:
+        self.__Lock = threading.Lock()
+
+    ##########################################################
+    ## Public Methods:
+    ##########################################################
+    def Get(self, path):
+        """
+        * Return cached (dates, discountFactors) arrays for source file, or None if not cached.
+        Inputs:
+        * path: Path to Merlin discount factor file.
+        """
+        if not self.Enabled:
+            return None
+        cachePath = self.__CachePath(path)
+        if cachePath is None or not os.path.exists(cachePath):
+            return None
+        try:
+            with open(cachePath, 'rb') as f:
+                contents = np.load(f)
+                dates, discountFactors = (contents['dates'], contents['discountFactors'])
+            # Mark curve as most recently used:
+            os.utime(cachePath, None)
+            return (dates, discountFactors)
+        except Exception:
+            # Remove unreadable cache entries so they will be rebuilt:
+            self.__Remove(cachePath)
+            return None
+
+    def Put(self, path, dates, discountFactors):
+        """
+        * Store parsed arrays for the source file and evict least recently used curves if cache is full.
+        Inputs:
+        * path: Path to Merlin discount factor file.
+        * dates: Array of Excel serial dates.
+        * discountFactors: Array of discount factors.
+        """
+        if not self.Enabled:
+            return
+        cachePath = self.__CachePath(path)
+        if cachePath is None:
+            return
+        try:
+            self.CreateFolderIfDoesNotExist(self.Folder)
+            # Write through temporary file so that partially written entries are never read (cache is shared by threads and worker processes):
+            self.WriteAtomically(cachePath, lambda f: np.savez(f, dates = dates, discountFactors = discountFactors))
+            size = os.path.getsize(cachePath)
+        except (IOError, OSError):
+            # Caching is optional, so skip if the cache folder cannot be written to:
+            return
+        with self.__Lock:
+            if self.__CurrentSize is not None:
+                self.__CurrentSize += size
+            self.__Evict()
+
+    def Clear(self):
+        """
+        * Remove all cached curves.
+        """
+        with self.__Lock:
+            for name, cachePath, size, modified in self.__Entries():
+                self.__Remove(cachePath)
+            self.__CurrentSize = 0
+
+    def Evict(self):
+        """
+        * Remove least recently used curves until the cache fits within MaxSize.
+        """
+        with self.__Lock:
+            self.__Evict()
+
+    ##########################################################
+    ## Properties:
+    ##########################################################
+    @property
+    def Enabled(self):
+        " Indicate if cache will be used. "
+        return self.__Enabled
+    @property
+    def Folder(self):
+        " Return folder containing cached curves. "
+        return self.__Folder
+    @property
+    def MaxSize(self):
+        " Return maximum cache size in megabytes. "
+        return self.__MaxSize
+
+    @Enabled.setter
+    def Enabled(self, enabled):
+        """
+        * Set whether cache will be used.
+        Inputs:
+        * enabled: Expecting a boolean.
+        """
+        if not isinstance(enabled, bool):
+            raise ValueError('Enabled must be a boolean.')
+        self.__Enabled = enabled
+    @Folder.setter
+    def Folder(self, folder):
+        """
+        * Set the cache folder.
+        Inputs:
+        * folder: Expecting a string folder path. Supports signatures in ConvertSignature().
+        """
+        if not isinstance(folder, str):
+            raise ValueError('Folder must be a string.')
+        folder = self.FixPath(self.ConvertSignature(folder))
+        self.__Folder = self.AppendHyphenIfNecessary(folder)
+    @MaxSize.setter
+    def MaxSize(self, maxSize):
+        """
+        * Set the maximum cache size.
+        Inputs:
+        * maxSize: Expecting a positive number of megabytes.
+        """
+        if type(maxSize) not in [int, float] or maxSize <= 0:
+            raise ValueError('MaxSize must be a positive number.')
+        self.__MaxSize = maxSize
+
+    ##########################################################
+    ## Private Helpers:
+    ##########################################################
+    def __CachePath(self, path):
+        """
+        * Return path to cache entry for source file, keyed by resolved path, size and modification time.
+        Returns None if the source file could not be found.
+        """
+        resolved = os.path.normcase(os.path.realpath(path))
+        stats = DirectoryIndex.Stat(resolved)
+        if stats is None:
+            return None
+        key = hashlib.sha1('%s|%d|%r' % (resolved, stats[0], stats[1])).hexdigest()
+        return self.Folder + key + CurveCache.__Extension
+
+    def __Entries(self):
+        """
+        * Return list of (name, path, size, last used) tuples for each cached curve.
+        """
+        entries = []
+        if not os.path.exists(self.Folder):
+            return entries
+        for name in os.listdir(self.Folder):
+            if not name.endswith(CurveCache.__Extension):
+                continue
+            cachePath = self.Folder + name
+            try:
+                stats = os.stat(cachePath)
+            except OSError:
+                continue
+            entries.append((name, cachePath, stats.st_size, stats.st_mtime))
+        return entries
+
+    def __Evict(self):
+        """
+        * Remove least recently used curves until the cache fits within MaxSize. Lock must be held by caller.
+        """
+        maxBytes = self.MaxSize * 1000000
+        if self.__CurrentSize is not None and self.__CurrentSize <= maxBytes:
+            return
+        # Temporary files abandoned by interrupted writes are not counted as entries, so remove them while scanning the cache:
+        self.RemoveStaleTempFiles(self.Folder)
+        entries = self.__Entries()
+        self.__CurrentSize = sum([size for name, cachePath, size, modified in entries])
+        # Remove oldest entries first:
+        for name, cachePath, size, modified in sorted(entries, key = lambda entry: entry[3]):
+            if self.__CurrentSize <= maxBytes:
+                break
+            self.__Remove(cachePath)
+            self.__CurrentSize -= size
+
+    def __Remove(self, cachePath):
+        """
+        * Delete cache entry, ignoring entries that were already removed.
+        """
+        try:
+            os.remove(cachePath)
+        except OSError:
+            pass
@@ -0,0 +1,169 @@
+##############################################################################
+## DirectoryIndex.py
+##############################################################################
+## Description:
+## * Run scoped index of folder listings. Each distinct folder is listed once
+## (with os.scandir where available) and existence, size and modification time
+## queries for files in that folder are answered from memory, rather than with
+## a network round trip per file. Folders that are written to during the run
+## must be invalidated (see Invalidate()).
+
+from DirectoryTypes.DirectoryType import DirectoryType
+import errno
+import os
+import threading
+try:
+    from os import scandir as _scandir
+except ImportError:
+    try:
+        from scandir import scandir as _scandir
+    except ImportError:
+        _scandir = None
+
+__all__ = ['DirectoryIndex']
+
+class DirectoryIndex(DirectoryType):
+    " Object lists each queried folder once per process and answers file queries from the stored listing. "
+    ##########################################################
+    ## Static Variables:
+    ##########################################################
+    # Set to False to query the file system directly for every path:
+    Enabled = True
+    # Map { Normalized Folder -> { Normalized Name -> (Name, DirEntry or None if listed without scandir) } }, or None if folder could not be listed:
+    __Listings = {}
+    # Map { Normalized Path -> (size, modification time) } for files that have been stat'd:
+    __Stats = {}
+    __Listed = 0
+    __Hits = 0
+    __Lock = threading.Lock()
+    ##########################################################
+    ## Class Methods:
+    ##########################################################
+    @classmethod
+    def Exists(self, path):
+        """
+        * Indicate if file or folder exists, listing its enclosing folder if not already listed.
+        Inputs:
+        * path: File or folder path.
+        """
+        folder, name = self.__Split(path)
+        listing = (self.__Listing(folder) if name else None)
+        if listing is None:
+            return os.path.exists(path)
+        return os.path.normcase(name) in listing
+
+    @classmethod
+    def Stat(self, path):
+        """
+        * Return (size in bytes, modification time) of file, or None if file does not exist.
+        Inputs:
+        * path: File path.
+        """
+        folder, name = self.__Split(path)
+        listing = (self.__Listing(folder) if name else None)
+        if listing is not None and os.path.normcase(name) not in listing:
+            return None
+        key = os.path.normcase(os.path.abspath(path))
+        stats = DirectoryIndex.__Stats.get(key, None)
+        if stats is not None:
+            return stats
+        try:
+            entry = (listing[os.path.normcase(name)][1] if listing is not None else None)
+            # Stats are returned by the listing on Windows, so only stat files directly if listed without scandir or on other platforms:
+            result = (entry.stat() if entry is not None else os.stat(path))
+        except OSError:
+            return None
+        stats = (result.st_size, result.st_mtime)
+        if listing is not None:
+            DirectoryIndex.__Stats[key] = stats
+        return stats
+
+    @classmethod
+    def Names(self, folder):
+        """
+        * Return list of names of all files and folders in folder, as os.listdir() would.
+        Inputs:
+        * folder: Folder path.
+        """
+        folder = self.FixPath(folder)
+        listing = self.__Listing(folder if folder.endswith('/') else folder + '/')
+        if listing is None:
+            return os.listdir(folder)
+        return sorted([name for name, entry in listing.values()])
+
+    @classmethod
+    def Invalidate(self, path = None):
+        """
+        * Remove stored listing so that folder is listed again on next query. Call after writing to a folder.
+        Optional Inputs:
+        * path: Folder path, or path to file within folder. All listings are removed if not provided.
+        """
+        with DirectoryIndex.__Lock:
+            if path is None:
+                DirectoryIndex.__Listings = {}
+                DirectoryIndex.__Stats = {}
+                return
+            path = self.FixPath(path)
+            folder = (path if path.endswith('/') else self.__Split(path)[0])
+            key = self.__FolderKey(folder)
+            DirectoryIndex.__Listings.pop(key, None)
+            for statsKey in [statsKey for statsKey in DirectoryIndex.__Stats.keys() if os.path.dirname(statsKey) == key]:
+                del DirectoryIndex.__Stats[statsKey]
+
+    ##########################################################
+    ## Accessors:
+    ##########################################################
+    @classmethod
+    def Hits(self):
+        " Return # of queries answered from a stored listing. "
+        return DirectoryIndex.__Hits
+    @classmethod
+    def Listed(self):
+        " Return # of folder listings performed. "
+        return DirectoryIndex.__Listed
+
+    ##########################################################
+    ## Private Helpers:
+    ##########################################################
+    @classmethod
+    def __Split(self, path):
+        """
+        * Return (enclosing folder, name) for path. Name is blank if path has no enclosing folder.
+        """
+        path = self.FixPath(path).rstrip('/')
+        if '/' not in path:
+            return ('', '')
+        return (path[0:path.rfind('/') + 1], path[path.rfind('/') + 1:])
+
+    @classmethod
+    def __FolderKey(self, folder):
+        """
+        * Return normalized folder path used to store listings.
+        """
+        return os.path.normcase(os.path.abspath(folder))
+
+    @classmethod
+    def __Listing(self, folder):
+        """
+        * Return { Normalized Name -> (Name, DirEntry or None) } for folder, listing folder on first request.
+        Returns None if the index is disabled or folder could not be listed.
+        """
+        if not DirectoryIndex.Enabled or not folder:
+            return None
+        key = self.__FolderKey(folder)
+        listing = DirectoryIndex.__Listings.get(key, False)
+        if listing is not False:
+            DirectoryIndex.__Hits += 1
+            return listing
+        try:
+            if _scandir is not None:
+                listing = dict((os.path.normcase(entry.name), (entry.name, entry)) for entry in _scandir(folder))
+            else:
+                listing = dict((os.path.normcase(name), (name, None)) for name in os.listdir(folder))
+        except OSError as err:
+            # Missing folders contain no files, other folders are queried directly:
+            listing = ({} if err.errno == errno.ENOENT else None)
+        with DirectoryIndex.__Lock:
+            DirectoryIndex.__Listed += 1
+            DirectoryIndex.__Listings[key] = listing
+        return listing
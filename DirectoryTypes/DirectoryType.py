@@ -6,11 +6,14 @@
 
 from abc import ABCMeta, abstractmethod
 from datetime import date, datetime
+from DirectoryTypes.PathTemplate import PathTemplate
 import os
 import re
 import Misc.Utilities as util
 import shutil
 import sys
+import tempfile
+import time
 
 __all__ = [ 'DirectoryType' ]
 
@@ -20,6 +23,9 @@ class DirectoryType(object):
     folderPattern = '[A-Z]:\/[0-9a-zA-Z_\/\s]*'
     # Make this class abstract:
     __metaclass__ = ABCMeta
+    # Suffix of temporary files written by WriteAtomically(), and age (in seconds) after which RemoveStaleTempFiles() treats them as abandoned:
+    TempSuffix = '.tmp'
+    StaleTempAge = 3600
     ##########################################################
     ## Public Methods:
     ##########################################################
@@ -40,55 +46,8 @@ class DirectoryType(object):
         Output:
         * path: Updated path with signature tokens filled.
         """
-        # Convert variadic arguments to useable form, and handle unsuitable types being passed:
-
-        ValueDate = kwargs.get('ValueDate', None)
-        if isinstance(ValueDate, str) and util.StringIsDate(ValueDate):
-            ValueDate = datetime.strptime(ValueDate, '%m/%d/%Y')
-        elif not isinstance(ValueDate, datetime) and not isinstance(ValueDate, date):
-            ValueDate = None
-        
-        RunTime = kwargs.get('RunTime', None)
-        RunTime = ('' if not isinstance(RunTime, str) else RunTime)
-        CurveName = kwargs.get('CurveName', None)
-        CurveName = ('' if not isinstance(CurveName, str) else CurveName)
-        PlotName = kwargs.get('PlotName', None)
-        PlotName = ('' if not isinstance(PlotName, str) else PlotName)
-        Color = kwargs.get('Color', None)
-        Color = ('' if not isinstance(Color , str) else Color)
-        UAT = kwargs.get('UAT', None)
-        UAT = (None if not isinstance(UAT, bool) else UAT)
-        ForOutput = kwargs.get('ForOutput', False)
-
-        if ValueDate:
-            if '{MM}' in path:
-                path = path.replace('{MM}', ('0' if ValueDate.month < 10 else '') + str(ValueDate.month))
-            if '{DD}' in path:
-                path = path.replace('{DD}', ('0' if ValueDate.day < 10 else '') + str(ValueDate.day))
-            if '{YY}' in path:
-                path = path.replace('{YY}', str(ValueDate.year % 100))
-            if '{YYYY}' in path:
-                path = path.replace('{YYYY}', str(ValueDate.year))
-        if RunTime and '{RunTime}' in path:
-            path = path.replace('{RunTime}', RunTime)
-        if CurveName and '{CurveName}' in path:
-            path = path.replace('{CurveName}', CurveName)
-        if PlotName and '{PlotName}' in path:
-            path = path.replace('{PlotName}', PlotName)
-        if Color and '{Color}' in path:
-            path = path.replace('{Color}', Color)
-        if '{LocalPath}' in path:
-            path = path.replace('{LocalPath}', os.path.abspath(os.path.dirname(sys.argv[0])))
-        if not (UAT is None) and '{UAT/Prod}' in path:
-            path = path.replace('{UAT/Prod}', ('UAT' if UAT else 'Production')) 
-
-        # Clean the output path of illegal characters if using to write to file system:
-        if ForOutput:
-            illegalChars = ['<','>','|','{','}','?','*']
-            for char in illegalChars:
-                path = path.replace(char, '')
-        
-        return path
+        # Signatures are tokenized once and repeated conversions are served from the template's cache:
+        return PathTemplate.Compile(path).Render(**kwargs)
 
     @classmethod
     def ConvertPathToISIS(self, path):
@@ -286,3 +245,53 @@ class DirectoryType(object):
         else:
             return path
         return True
+
+    @classmethod
+    def RemoveStaleTempFiles(self, folder, age = None):
+        """
+        * Remove temporary files left in folder by interrupted WriteAtomically() calls. Recent temporary files are kept, since they may still be written to.
+        Inputs:
+        * folder: Folder path.
+        Optional Inputs:
+        * age: Minimum age of removed files in seconds. Uses DirectoryType.StaleTempAge by default.
+        """
+        cutoff = time.time() - (DirectoryType.StaleTempAge if age is None else age)
+        folder = self.AppendHyphenIfNecessary(self.FixPath(folder))
+        try:
+            names = os.listdir(folder)
+        except OSError:
+            return
+        for name in names:
+            if not name.endswith(DirectoryType.TempSuffix):
+                continue
+            try:
+                if os.path.getmtime(folder + name) < cutoff:
+                    os.remove(folder + name)
+            except OSError:
+                # File was renamed or removed by another writer:
+                continue
+
+    @classmethod
+    def WriteAtomically(self, path, write):
+        """
+        * Write file through a uniquely named temporary file in the same folder, then rename it to path, so that partially written files are never read.
+        The temporary file is removed and the error raised if writing or renaming fails (ex: another process replaced path at the same time).
+        Inputs:
+        * path: Path to output file. Enclosing folder must exist.
+        * write: Function that writes contents to passed binary file object.
+        """
+        handle, tempPath = tempfile.mkstemp(suffix = DirectoryType.TempSuffix, dir = (os.path.dirname(path) or '.'))
+        renamed = False
+        try:
+            with os.fdopen(handle, 'wb') as f:
+                write(f)
+            if os.path.exists(path):
+                os.remove(path)
+            os.rename(tempPath, path)
+            renamed = True
+        finally:
+            if not renamed:
+                try:
+                    os.remove(tempPath)
+                except OSError:
+                    pass
@@ -0,0 +1,138 @@
+##############################################################################
+## DuplicateResolver.py
+##############################################################################
+## Description:
+## * Picks '_#' duplicate file names (ex: 'Graph.png', 'Graph_2.png', ...)
+## from a single listing of the enclosing folder, rather than testing each
+## candidate on the file system. Names handed out are reserved for the rest
+## of the run, so concurrent callers never pick the same name.
+
+from DirectoryTypes.DirectoryIndex import DirectoryIndex
+import os
+import re
+import threading
+
+__all__ = ['DuplicateResolver']
+
+class DuplicateResolver(object):
+    " Object resolves duplicate file names using folder listings and a process wide reservation table. "
+    ##########################################################
+    ## Static Variables:
+    ##########################################################
+    # Duplicate suffix appended to file name before the extension:
+    __SuffixPattern = re.compile('^(.*)_([0-9]+)$')
+    # Map { Normalized Folder -> Set of normalized file names handed out during this run }:
+    __Reserved = {}
+    __Lock = threading.Lock()
+    ##########################################################
+    ## Class Methods:
+    ##########################################################
+    @classmethod
+    def Resolve(self, path):
+        """
+        * Return path if no file exists with its name, otherwise path with the lowest free '_#' (# >= 2) appended before the extension.
+        A '_#' suffix already on path is removed first. The returned name is reserved, so it will not be returned again during this run.
+        Inputs:
+        * path: File path. Expecting string containing an extension.
+        """
+        folder, stem, extension = self.__Split(path)
+        with DuplicateResolver.__Lock:
+            reserved = DuplicateResolver.__Reserved.setdefault(self.__FolderKey(folder), set())
+            taken = self.__Names(folder) | reserved
+            name = stem + extension
+            if os.path.normcase(name) in taken:
+                name = '%s_%d%s' % (stem, self.__FirstFreeSuffix(self.__Suffixes(taken, stem, extension)), extension)
+            reserved.add(os.path.normcase(name))
+        return folder + name
+
+    @classmethod
+    def Final(self, path):
+        """
+        * Return last existing file in the chain path, path_2, path_3, ..., or path if it does not exist.
+        Inputs:
+        * path: File path. Expecting string containing an extension.
+        """
+        folder, stem, extension = self.__Split(path)
+        names = self.__Names(folder)
+        if os.path.normcase(stem + extension) not in names:
+            return path
+        final = self.__FirstFreeSuffix(self.__Suffixes(names, stem, extension)) - 1
+        return folder + (stem + extension if final < 2 else '%s_%d%s' % (stem, final, extension))
+
+    @classmethod
+    def Release(self, path = None):
+        """
+        * Remove reservation so that name can be resolved again.
+        Optional Inputs:
+        * path: Reserved file path. All reservations are removed if not provided.
+        """
+        with DuplicateResolver.__Lock:
+            if path is None:
+                DuplicateResolver.__Reserved = {}
+                return
+            folder = path.replace('\\', '/')
+            name = folder[folder.rfind('/') + 1:]
+            DuplicateResolver.__Reserved.get(self.__FolderKey(folder[0:folder.rfind('/') + 1]), set()).discard(os.path.normcase(name))
+
+    ##########################################################
+    ## Private Helpers:
+    ##########################################################
+    @classmethod
+    def __Split(self, path):
+        """
+        * Return (folder, stem, extension) for file path, with any '_#' duplicate suffix removed from stem.
+        """
+        path = path.replace('\\', '/')
+        folder = path[0:path.rfind('/') + 1]
+        name = path[path.rfind('/') + 1:]
+        stem, extension = ((name[0:name.rfind('.')], name[name.rfind('.'):]) if '.' in name else (name, ''))
+        match = DuplicateResolver.__SuffixPattern.match(stem)
+        if match:
+            stem = match.group(1)
+        return (folder, stem, extension)
+
+    @classmethod
+    def __FolderKey(self, folder):
+        """
+        * Return normalized folder path used to store reservations.
+        """
+        return os.path.normcase(os.path.abspath(folder or '.'))
+
+    @classmethod
+    def __Names(self, folder):
+        """
+        * Return set of normalized names in folder, listing folder once per run (see DirectoryIndex).
+        """
+        try:
+            return set([os.path.normcase(name) for name in DirectoryIndex.Names(folder or '.')])
+        except OSError:
+            return set()
+
+    @classmethod
+    def __Suffixes(self, names, stem, extension):
+        """
+        * Return sorted list of distinct duplicate numbers (>= 2) used by names for stem and extension.
+        """
+        pattern = re.compile('^%s_([0-9]+)%s$' % (re.escape(os.path.normcase(stem)), re.escape(os.path.normcase(extension))))
+        suffixes = set()
+        for name in names:
+            match = pattern.match(name)
+            if match and int(match.group(1)) >= 2:
+                suffixes.add(int(match.group(1)))
+        return sorted(suffixes)
+
+    @classmethod
+    def __FirstFreeSuffix(self, suffixes):
+        """
+        * Return lowest duplicate number (>= 2) not in sorted list of distinct duplicate numbers, using binary search.
+        suffixes[i] == i + 2 holds exactly for the run of consecutive numbers starting at 2.
+        """
+        low = 0
+        high = len(suffixes)
+        while low < high:
+            middle = (low + high) // 2
+            if suffixes[middle] == middle + 2:
+                low = middle + 1
+            else:
+                high = middle
+        return low + 2
@@ -6,6 +6,7 @@
 
 from abc import ABCMeta, abstractmethod
 import DirectoryType
+from DirectoryTypes.DuplicateResolver import DuplicateResolver
 import PathType
 import os
 
@@ -31,7 +32,7 @@ class FileType(DirectoryType.DirectoryType):
     def HandleDuplicates(self, path):
         """
         * Return a filepath with '_#' appended after filename and before extension
-        to handle duplicate files.
+        to handle duplicate files. Returned path is reserved for the rest of the run (see DuplicateResolver).
         Inputs:
         * path: Expecting a string corresponding to file. Will return object if not satisfied.
         """
@@ -40,15 +41,8 @@ class FileType(DirectoryType.DirectoryType):
             return path
         elif '.' not in path:
             return path
-        # Remove previous duplicate underscores from search path if necessary:
-        newPath = path[0 : path.rfind(('_' if '_' in path else '.'))] + self.ExtractExtension(path)
-        duplicateCounter = 2
-        while os.path.exists(newPath):
-            # Append _# to end of file name before extension to handle duplicates:
-            newPath = path[0:path.rfind('.')] + '_' + str(duplicateCounter) + path[path.rfind('.'):len(path)]
-            duplicateCounter += 1
-
-        return newPath 
+        # Remove previous duplicate suffix, and pick first free '_#' from a single listing of the folder:
+        return DuplicateResolver.Resolve(path)
 
     @classmethod
     def GetFinalDuplicateFile(self, path):
@@ -63,16 +57,7 @@ class FileType(DirectoryType.DirectoryType):
         if not(isinstance(path, str) and path.rfind('.') != -1):
             return path
 
-        duplicateCounter = 2
-        currPath = path
-        nextPath = path[0:path.rfind('.')] + '_' + str(duplicateCounter) + path[path.rfind('.'):len(path)]
-        while self.CheckPath(currPath) and self.CheckPath(nextPath):
-            # Continue to append until no additional duplicates exists:
-            currPath = path[0:path.rfind('.')] + '_' + str(duplicateCounter) + path[path.rfind('.'):len(path)] 
-            newPath = path[0:path.rfind('.')] + '_' + str(duplicateCounter + 1) + path[path.rfind('.'):len(path)]
-            duplicateCounter += 1
-
-        return currPath
+        return DuplicateResolver.Final(path)
 
     @classmethod
     def HandleLargeFiles(self, path, size = 10):
@@ -89,7 +74,7 @@ class FileType(DirectoryType.DirectoryType):
 
         outputPath = self.GetFinalDuplicateFile(path)
         # Output to new file if size is greater than 10 MB:
-        if self.CheckPath(outputPath) and os.path.getsize(self.GetFinalDuplicateFile(outputPath)) / 1000000 > size:
+        if self.CheckPath(outputPath) and os.path.getsize(outputPath) / 1000000 > size:
             outputPath = self.HandleDuplicates(outputPath)
 
         return outputPath
@@ -0,0 +1,176 @@
+##############################################################################
+## PathTemplate.py
+##############################################################################
+## Description:
+## * Compiled form of a path signature (ex: '{MM}{DD}{YY}/{CurveName}.txt'),
+## tokenized once into literal and placeholder segments, with a cache of
+## rendered paths. Used by DirectoryType.ConvertSignature().
+
+from datetime import date, datetime
+import Misc.Utilities as util
+import os
+import re
+import sys
+import threading
+
+__all__ = ['PathTemplate']
+
+class PathTemplate(object):
+    " Object renders a path signature through a precomputed list of segments, producing the same output as DirectoryType.ConvertSignature(). "
+    ##########################################################
+    ## Static Variables:
+    ##########################################################
+    # All supported placeholders, in the order they were historically substituted:
+    Placeholders = ['{MM}', '{DD}', '{YY}', '{YYYY}', '{RunTime}', '{CurveName}', '{PlotName}', '{Color}', '{LocalPath}', '{UAT/Prod}']
+    # Characters removed from rendered paths that will be written to the file system:
+    IllegalChars = ['<','>','|','{','}','?','*']
+    # Keyword argument of ConvertSignature() that provides each placeholder's value:
+    ArgumentNames = { '{MM}' : 'ValueDate', '{DD}' : 'ValueDate', '{YY}' : 'ValueDate', '{YYYY}' : 'ValueDate', '{RunTime}' : 'RunTime', '{CurveName}' : 'CurveName', 
+                     '{PlotName}' : 'PlotName', '{Color}' : 'Color', '{UAT/Prod}' : 'UAT' }
+    # Maximum # of compiled templates, and of rendered paths cached by each template (caches are emptied once exceeded):
+    MaxTemplates = 256
+    MaxCachedPaths = 4096
+    __PlaceholderPattern = re.compile('|'.join([re.escape(placeholder) for placeholder in Placeholders]))
+    # Map { Signature -> PathTemplate }:
+    __Templates = {}
+    __Lock = threading.Lock()
+    ##########################################################
+    ## Constructors:
+    ##########################################################
+    def __init__(self, signature):
+        """
+        * Overloaded constructor. Tokenize signature into segments.
+        Inputs:
+        * signature: Path containing placeholders listed in PathTemplate.Placeholders.
+        """
+        if not isinstance(signature, str):
+            raise ValueError('signature must be a string.')
+        self.__Signature = signature
+        # List of (isPlaceholder, text) tuples:
+        self.__Segments = []
+        position = 0
+        for match in PathTemplate.__PlaceholderPattern.finditer(signature):
+            if match.start() > position:
+                self.__Segments.append((False, signature[position:match.start()]))
+            self.__Segments.append((True, match.group(0)))
+            position = match.end()
+        if position < len(signature):
+            self.__Segments.append((False, signature[position:]))
+        found = set([text for isPlaceholder, text in self.__Segments if isPlaceholder])
+        self.__Used = [placeholder for placeholder in PathTemplate.Placeholders if placeholder in found]
+        # Keyword arguments that affect the rendered path, in order used to build cache keys:
+        self.__KeyNames = sorted(set([PathTemplate.ArgumentNames[placeholder] for placeholder in self.__Used if placeholder in PathTemplate.ArgumentNames]))
+        # Map { (ForOutput, (Argument type, Argument value)...) -> Rendered path }:
+        self.__Rendered = {}
+
+    ##########################################################
+    ## Class Methods:
+    ##########################################################
+    @classmethod
+    def Compile(self, signature):
+        """
+        * Return compiled template for signature, reusing previously compiled templates.
+        Inputs:
+        * signature: Path containing placeholders listed in PathTemplate.Placeholders.
+        """
+        template = PathTemplate.__Templates.get(signature, None)
+        if template is not None:
+            return template
+        with PathTemplate.__Lock:
+            template = PathTemplate.__Templates.get(signature, None)
+            if template is None:
+                template = PathTemplate(signature)
+                if len(PathTemplate.__Templates) >= PathTemplate.MaxTemplates:
+                    PathTemplate.__Templates.clear()
+                PathTemplate.__Templates[signature] = template
+        return template
+
+    ##########################################################
+    ## Public Methods:
+    ##########################################################
+    def Render(self, **kwargs):
+        """
+        * Return signature with placeholders replaced by relevant values. Placeholders whose value was not provided are left in place.
+        Note: {LocalPath} is resolved when a path is first rendered.
+        Optional Inputs:
+        * See DirectoryType.ConvertSignature().
+        """
+        forOutput = bool(kwargs.get('ForOutput', False))
+        try:
+            # Types are part of the key, since equal values of different types may render differently (ex: UAT = True vs UAT = 1, which is ignored):
+            key = (forOutput,) + tuple([(type(value), value) for value in [kwargs.get(name, None) for name in self.__KeyNames]])
+            path = self.__Rendered.get(key, None)
+        except TypeError:
+            # Unhashable arguments are rendered without caching:
+            key = path = None
+        if path is not None:
+            return path
+        values = self.__Values(kwargs, self.__Used)
+        # ConvertSignature() historically replaced placeholders one after another, so placeholders inside substituted values were also replaced.
+        # Values containing placeholders are rare, so reproduce that behavior by sequential replacement (without caching):
+        if len([placeholder for placeholder in self.__Used if values[placeholder] is not None and '{' in values[placeholder]]) > 0:
+            values = self.__Values(kwargs, PathTemplate.Placeholders)
+            path = self.__Signature
+            for placeholder in PathTemplate.Placeholders:
+                if values[placeholder] is not None and placeholder in path:
+                    path = path.replace(placeholder, values[placeholder])
+            return self.__Clean(path, forOutput)
+        path = ''.join([(values[text] if values[text] is not None else text) if isPlaceholder else text for isPlaceholder, text in self.__Segments])
+        path = self.__Clean(path, forOutput)
+        if key is not None:
+            if len(self.__Rendered) >= PathTemplate.MaxCachedPaths:
+                self.__Rendered.clear()
+            self.__Rendered[key] = path
+        return path
+
+    ##########################################################
+    ## Properties:
+    ##########################################################
+    @property
+    def Signature(self):
+        " Return the uncompiled signature. "
+        return self.__Signature
+    @property
+    def UsedPlaceholders(self):
+        " Return placeholders that appear in signature. "
+        return list(self.__Used)
+
+    ##########################################################
+    ## Private Helpers:
+    ##########################################################
+    @classmethod
+    def __Values(self, kwargs, placeholders):
+        """
+        * Return { Placeholder -> Value } for each placeholder, with None for placeholders that will not be replaced.
+        """
+        values = dict((placeholder, None) for placeholder in PathTemplate.Placeholders)
+        ValueDate = kwargs.get('ValueDate', None)
+        if isinstance(ValueDate, str) and util.StringIsDate(ValueDate):
+            ValueDate = datetime.strptime(ValueDate, '%m/%d/%Y')
+        elif not isinstance(ValueDate, datetime) and not isinstance(ValueDate, date):
+            ValueDate = None
+        if ValueDate:
+            values['{MM}'] = ('0' if ValueDate.month < 10 else '') + str(ValueDate.month)
+            values['{DD}'] = ('0' if ValueDate.day < 10 else '') + str(ValueDate.day)
+            values['{YY}'] = str(ValueDate.year % 100)
+            values['{YYYY}'] = str(ValueDate.year)
+        for placeholder, name in (('{RunTime}', 'RunTime'), ('{CurveName}', 'CurveName'), ('{PlotName}', 'PlotName'), ('{Color}', 'Color')):
+            value = kwargs.get(name, None)
+            if isinstance(value, str) and value:
+                values[placeholder] = value
+        if '{LocalPath}' in placeholders:
+            values['{LocalPath}'] = os.path.abspath(os.path.dirname(sys.argv[0]))
+        UAT = kwargs.get('UAT', None)
+        if isinstance(UAT, bool):
+            values['{UAT/Prod}'] = ('UAT' if UAT else 'Production')
+        return values
+
+    @classmethod
+    def __Clean(self, path, forOutput):
+        """
+        * Remove illegal characters from path if it will be written to the file system.
+        """
+        if forOutput:
+            for char in PathTemplate.IllegalChars:
+                path = path.replace(char, '')
+        return path
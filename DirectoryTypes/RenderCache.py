@@ -0,0 +1,205 @@
+##############################################################################
+## RenderCache.py
+##############################################################################
+## Description:
+## * Local on-disk cache of rendered plot PNGs, keyed by a hash of every input
+## that affects the image (see ForwardRatePlot.RenderKey()).
+
+from DirectoryTypes.DirectoryType import DirectoryType
+import os
+import threading
+
+__all__ = ['RenderCache']
+
+class RenderCache(DirectoryType):
+    " Object stores rendered PNG images locally so that plots whose inputs have not changed are not rendered again. "
+    ##########################################################
+    ## Static Variables:
+    ##########################################################
+    # Default cache location and maximum size (in megabytes):
+    DefaultFolder = '{LocalPath}/Cache/Renders/'
+    DefaultMaxSize = 200
+    __Extension = '.png'
+    ##########################################################
+    ## Constructors:
+    ##########################################################
+    def __init__(self, folder = DefaultFolder, maxSize = DefaultMaxSize, enabled = True):
+        """
+        * Overloaded constructor.
+        Optional Inputs:
+        * folder: Folder path to store rendered images. Supports signatures in ConvertSignature().
+        * maxSize: Maximum size of cache in megabytes. Least recently used images will be evicted once exceeded.
+        * enabled: Set to False to bypass the cache entirely.
+        """
+        self.Folder = folder
+        self.MaxSize = maxSize
+        self.Enabled = enabled
+        # Total size of cache folder in bytes, calculated on first write:
+        self.__CurrentSize = None
+        # Guards size accounting and eviction:
+        self.__Lock = threading.Lock()
+        self.__Hits = 0
+        self.__Misses = 0
+
+    ##########################################################
+    ## Public Methods:
+    ##########################################################
+    def Get(self, key):
+        """
+        * Return cached PNG bytes for render key, or None if not cached.
+        Inputs:
+        * key: Hex digest identifying all inputs to the rendered image.
+        """
+        if not self.Enabled or not key:
+            return None
+        cachePath = self.__CachePath(key)
+        try:
+            with open(cachePath, 'rb') as f:
+                data = f.read()
+            # Mark image as most recently used:
+            os.utime(cachePath, None)
+        except (IOError, OSError):
+            self.__Misses += 1
+            return None
+        self.__Hits += 1
+        return data
+
+    def Put(self, key, data):
+        """
+        * Store rendered PNG bytes under render key and evict least recently used images if cache is full.
+        Inputs:
+        * key: Hex digest identifying all inputs to the rendered image.
+        * data: Encoded PNG image.
+        """
+        if not self.Enabled or not key:
+            return
+        cachePath = self.__CachePath(key)
+        try:
+            self.CreateFolderIfDoesNotExist(self.Folder)
+            # Write through temporary file so that partially written entries are never read:
+            self.WriteAtomically(cachePath, lambda f: f.write(data))
+        except (IOError, OSError):
+            # Caching is optional, so skip if the cache folder cannot be written to:
+            return
+        with self.__Lock:
+            if self.__CurrentSize is not None:
+                self.__CurrentSize += len(data)
+            self.__Evict()
+
+    def Clear(self):
+        """
+        * Remove all cached images.
+        """
+        with self.__Lock:
+            for cachePath, size, modified in self.__Entries():
+                self.__Remove(cachePath)
+            self.__CurrentSize = 0
+
+    ##########################################################
+    ## Properties:
+    ##########################################################
+    @property
+    def Enabled(self):
+        " Indicate if cache will be used. "
+        return self.__Enabled
+    @property
+    def Folder(self):
+        " Return folder containing cached images. "
+        return self.__Folder
+    @property
+    def Hits(self):
+        " Return # of renders served from cache. "
+        return self.__Hits
+    @property
+    def MaxSize(self):
+        " Return maximum cache size in megabytes. "
+        return self.__MaxSize
+    @property
+    def Misses(self):
+        " Return # of lookups that were not in cache. "
+        return self.__Misses
+
+    @Enabled.setter
+    def Enabled(self, enabled):
+        """
+        * Set whether cache will be used.
+        Inputs:
+        * enabled: Expecting a boolean.
+        """
+        if not isinstance(enabled, bool):
+            raise ValueError('Enabled must be a boolean.')
+        self.__Enabled = enabled
+    @Folder.setter
+    def Folder(self, folder):
+        """
+        * Set the cache folder.
+        Inputs:
+        * folder: Expecting a string folder path. Supports signatures in ConvertSignature().
+        """
+        if not isinstance(folder, str):
+            raise ValueError('Folder must be a string.')
+        folder = self.FixPath(self.ConvertSignature(folder))
+        self.__Folder = self.AppendHyphenIfNecessary(folder)
+    @MaxSize.setter
+    def MaxSize(self, maxSize):
+        """
+        * Set the maximum cache size.
+        Inputs:
+        * maxSize: Expecting a positive number of megabytes.
+        """
+        if type(maxSize) not in [int, float] or maxSize <= 0:
+            raise ValueError('MaxSize must be a positive number.')
+        self.__MaxSize = maxSize
+
+    ##########################################################
+    ## Private Helpers:
+    ##########################################################
+    def __CachePath(self, key):
+        """
+        * Return path to cache entry for render key.
+        """
+        return self.Folder + key + RenderCache.__Extension
+
+    def __Entries(self):
+        """
+        * Return list of (path, size, last used) tuples for each cached image.
+        """
+        entries = []
+        if not os.path.exists(self.Folder):
+            return entries
+        for name in os.listdir(self.Folder):
+            if not name.endswith(RenderCache.__Extension):
+                continue
+            try:
+                stats = os.stat(self.Folder + name)
+            except OSError:
+                continue
+            entries.append((self.Folder + name, stats.st_size, stats.st_mtime))
+        return entries
+
+    def __Evict(self):
+        """
+        * Remove least recently used images until the cache fits within MaxSize. Lock must be held by caller.
+        """
+        maxBytes = self.MaxSize * 1000000
+        if self.__CurrentSize is not None and self.__CurrentSize <= maxBytes:
+            return
+        # Temporary files abandoned by interrupted writes are not counted as entries, so remove them while scanning the cache:
+        self.RemoveStaleTempFiles(self.Folder)
+        entries = self.__Entries()
+        self.__CurrentSize = sum([size for cachePath, size, modified in entries])
+        # Remove oldest entries first:
+        for cachePath, size, modified in sorted(entries, key = lambda entry: entry[2]):
+            if self.__CurrentSize <= maxBytes:
+                break
+            self.__Remove(cachePath)
+            self.__CurrentSize -= size
+
+    def __Remove(self, cachePath):
+        """
+        * Delete cache entry, ignoring entries that were already removed.
+        """
+        try:
+            os.remove(cachePath)
+        except OSError:
+            pass
@@ -4,10 +4,13 @@
 ## Description:
 ## * Import all Directory related objects.
 
-__all__ = ['DirectoryContainerBase', 'DirectoryType', 'FileContainer', 'FileRow', 'FilesAndFoldersContainer', 'FileType', 'FolderContainer', 'Grid', 'Observer', 'PathSubscriber', 'PathType']
+__all__ = ['CurveCache', 'DirectoryContainerBase', 'DirectoryIndex', 'DirectoryType', 'DuplicateResolver', 'FileContainer', 'FileRow', 'FilesAndFoldersContainer', 'FileType', 'FolderContainer', 'Grid', 'Observer', 'PathSubscriber', 'PathTemplate', 'PathType', 'RenderCache']
 
+import DirectoryTypes.CurveCache
 import DirectoryTypes.DirectoryContainerBase
+import DirectoryTypes.DirectoryIndex
 import DirectoryTypes.DirectoryType
+import DirectoryTypes.DuplicateResolver
 import DirectoryTypes.FileContainer
 import DirectoryTypes.FileRow
 import DirectoryTypes.FilesAndFoldersContainer
@@ -16,4 +19,6 @@ import DirectoryTypes.FolderContainer
 import DirectoryTypes.Grid
 import DirectoryTypes.Observer
 import DirectoryTypes.PathSubscriber
+import DirectoryTypes.PathTemplate
 import DirectoryTypes.PathType
+import DirectoryTypes.RenderCache
@@ -78,12 +78,8 @@ class ExceptionAggregator(NonFatals.NonFatal):
         # Merge contents:
         ############################
         for exceptionType in exceptionAgg.Contents.keys():
-            if ExceptionAggregator.IsContainerType(exceptionType):
-                # Add the ContainerType exception:
-                self.Add(exceptionAgg.Contents[exceptionType])
-            else:
-                # Replace or set non-container types:
-                self.Add(item)
+            # ContainerType exceptions will be merged, non-container types will be replaced or set:
+            self.Add(exceptionAgg.Contents[exceptionType])
         
     ##########################################################
     ## Class Methods:
@@ -186,9 +182,7 @@ class ExceptionAggregator(NonFatals.NonFatal):
         """
         if container is None:
             return
-        elif isinstance(container, ExceptionAggregator):            
-            container = container.Contents
-        else:
+        elif not isinstance(container, ExceptionAggregator):
             raise ValueError("Contents must be an ExceptionAggregator object.")
         # Reset the container and merge all contents:
         self.__ExceptDict = {}
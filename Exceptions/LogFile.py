@@ -8,6 +8,7 @@
 ## in this current module.
 
 from sortedcontainers import SortedList
+from DirectoryTypes.DirectoryIndex import DirectoryIndex
 from DirectoryTypes.FileType import FileType
 import Exceptions.Fatal as Fatals
 import Exceptions.NonFatal as NonFatals
@@ -116,6 +117,8 @@ class LogFile(FileType):
                 # Need to append newline to each line before printing:
                 allLines = [line + '\n' for line in allLines]
                 file.writelines(allLines)
+            # Folder contents have changed:
+            DirectoryIndex.Invalidate(self.Path)
 
         except Exception as err:
             # Raise non fatal exception if occurred:
@@ -11,6 +11,10 @@ from abc import ABCMeta, abstractmethod
 from datetime import datetime
 import sys
 from Misc.Utilities import StringIsDate
+if sys.version_info[0] > 2:
+    import copyreg as copy_reg
+else:
+    import copy_reg
 
 __all__ = ['MerlinPlottingExcept']
 
@@ -31,6 +35,13 @@ class MerlinPlottingExcept(BaseException):
         self.CallingFunction = callingFunc
         self.SpecificMessage = specific
         self.TimeStamp = timestamp
+
+    def __reduce__(self):
+        """
+        * Allow exception to be pickled (ex: when returned from worker processes). Exception is rebuilt 
+        from its attributes, since constructor arguments differ between derived classes.
+        """
+        return (copy_reg.__newobj__, (type(self),), self.__dict__)
     
     ##########################################################
     ## Class Methods:
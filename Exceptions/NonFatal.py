@@ -16,7 +16,7 @@ import sys
 from sortedcontainers import SortedList
 from Misc.Utilities import StringIsDate
 
-__all__ = [ 'FailedToGeneratePNGS', 'FailedToGeneratePDF', 'FailedToOutputPNGS', 'MerlinCurvesMissing', 'NoPlotsLoaded', 'OutlookFailed', 'NonFatal' ]
+__all__ = [ 'CurvesFailedScreening', 'FailedToGeneratePNGS', 'FailedToGeneratePDF', 'FailedToGenerateReport', 'FailedToOutputPNGS', 'MerlinCurvesMalformed', 'MerlinCurvesMissing', 'NoPlotsLoaded', 'OutlookFailed', 'NonFatal' ]
 
 ########################################################################################################
 # Base Classes:
@@ -36,6 +36,51 @@ class NonFatal(base.MerlinPlottingExcept):
 ########################################################################################################
 # Derived Classes:
 ########################################################################################################
+class CurvesFailedScreening(Container.ExceptionContainerType, NonFatal):
+    " Exception contains list of Merlin Curves that broke screening thresholds. "
+    __Concise = '%d Merlin Curves failed screening. '
+    __Granular = 'The following Merlin Curves failed screening: { %s }'
+    ##########################################################
+    ## Constructors:
+    ##########################################################  
+    def __init__(self, callingFunc, flaggedCurve = '', specific = '', timestamp = datetime.now(), targetList = SortedList()):
+        if sys.version_info[0] > 2:
+            super().__init__(callingFunc, specific, timestamp, targetList)
+        else:
+            super(CurvesFailedScreening, self).__init__(callingFunc, specific, timestamp, targetList)
+        
+        self.Add(flaggedCurve)
+
+    ##########################################################
+    ## Class Methods:
+    ##########################################################    
+    def Message(self, granular = False):
+        """
+        * Return the granular or concise message.
+        """
+        if granular:
+            granular = CurvesFailedScreening.__Granular % (super() if sys.version_info[0] > 2 else super(CurvesFailedScreening, self)).Message()
+            # Point to the screening report if available:
+            if self.SpecificMessage:
+                granular += '\nreport: %s' % self.SpecificMessage
+            return granular
+        else:
+            return CurvesFailedScreening.__Concise % self.ErrorCount()
+
+    ##########################################################
+    ## Mutators:
+    ##########################################################    
+    def Merge(self, curvesFailedScreening):
+        """
+        * Merge the passed container/CurvesFailedScreening object.
+        Inputs:
+        * curvesFailedScreening: Expecting a CurvesFailedScreening exception object, list, SortedList or None.
+        """
+        # Below method will throw exception if type is incorrect:
+        self.TypesMatch(curvesFailedScreening, CurvesFailedScreening)
+        # Merge the passed container with base class container:
+        (super() if sys.version_info[0] > 2 else super(CurvesFailedScreening, self)).Merge(curvesFailedScreening)
+
 class FailedToGeneratePNGS(Container.ExceptionContainerType, NonFatal):
     " Exception thrown when particular PNG plot failed to be generated. "
     __Concise = 'Failed to generate %d PNGs.'
@@ -108,6 +153,40 @@ class FailedToGeneratePDF(NonFatal, PathType.PathType):
         else:
             return FailedToGeneratePDF.__Concise
 
+class FailedToGenerateReport(NonFatal, PathType.PathType):
+    " Exception thrown when a report (ex: screening report) fails to generate. "
+    __Concise = 'Failed to generate report.'
+    __Granular = 'Failed to generate report at path: \n{%s}'
+    ##########################################################
+    ## Constructors:
+    ##########################################################    
+    def __init__(self, reportPath, callingFunc, specific = '', timestamp = datetime.now()):
+        """
+        * Overloaded Constructor.
+        """        
+        if sys.version_info[0] > 2:
+            super().__init__(callingFunc, specific, timestamp)
+        else:
+            super(FailedToGenerateReport, self).__init__(callingFunc, specific, timestamp)
+
+        # Detail the report path that could not be output to within this exception:
+        self.Path = reportPath
+
+    ##########################################################
+    ## Class Methods:
+    ##########################################################    
+    def Message(self, granular = False):
+        """
+        * Return the granular or concise message.
+        """
+        if granular:
+            granular = FailedToGenerateReport.__Granular % self.Path
+            if self.SpecificMessage:
+                granular += '\nreason: %s' % self.SpecificMessage
+            return granular
+        else:
+            return FailedToGenerateReport.__Concise
+
 class MerlinCurvesMissing(Container.ExceptionContainerType, NonFatal):
     " Exception contains list of Merlin Curves that could not be found in production locations. "
     __Concise = '%d Merlin Curves could not be found in production locations. '
@@ -149,6 +228,51 @@ class MerlinCurvesMissing(Container.ExceptionContainerType, NonFatal):
         # Merge the passed container with base class container:
         (super() if sys.version_info[0] > 2 else super(MerlinCurvesMissing, self)).Merge(merlinCurvesMissing)
 
+class MerlinCurvesMalformed(Container.ExceptionContainerType, NonFatal):
+    " Exception contains list of Merlin Curves whose discount factor files could not be parsed. "
+    __Concise = '%d Merlin Curves had malformed discount factor files. '
+    __Granular = 'The following Merlin Curves could not be parsed: { %s }'
+    ##########################################################
+    ## Constructors:
+    ##########################################################  
+    def __init__(self, callingFunc, malformedCurve = '', specific = '', timestamp = datetime.now(), targetList = SortedList()):
+        if sys.version_info[0] > 2:
+            super().__init__(callingFunc, specific, timestamp, targetList)
+        else:
+            super(MerlinCurvesMalformed, self).__init__(callingFunc, specific, timestamp, targetList)
+        
+        self.Add(malformedCurve)
+
+    ##########################################################
+    ## Class Methods:
+    ##########################################################    
+    def Message(self, granular = False):
+        """
+        * Return the granular or concise message.
+        """
+        if granular:
+            granular = MerlinCurvesMalformed.__Granular % (super() if sys.version_info[0] > 2 else super(MerlinCurvesMalformed, self)).Message()
+            # Include the parsing error if available:
+            if self.SpecificMessage:
+                granular += '\nreason: %s' % self.SpecificMessage
+            return granular
+        else:
+            return MerlinCurvesMalformed.__Concise % self.ErrorCount()
+
+    ##########################################################
+    ## Mutators:
+    ##########################################################    
+    def Merge(self, merlinCurvesMalformed):
+        """
+        * Merge the passed container/MerlinCurvesMalformed object.
+        Inputs:
+        * merlinCurvesMalformed: Expecting a MerlinCurvesMalformed exception object, list, SortedList or None.
+        """
+        # Below method will throw exception if type is incorrect:
+        self.TypesMatch(merlinCurvesMalformed, MerlinCurvesMalformed)
+        # Merge the passed container with base class container:
+        (super() if sys.version_info[0] > 2 else super(MerlinCurvesMalformed, self)).Merge(merlinCurvesMalformed)
+
 class NoPlotsLoaded(Container.ExceptionContainerType, NonFatal):
     " Exception thrown when no Merlin Curves were loaded into a particular ForwardRatePlot object. "
     __Concise = '%d plots had no Merlin Curves added to configuration.'
@@ -8,12 +8,15 @@ from ConfigurationTypes.CommandLineArgs import CommandLineArgs
 from ConfigurationTypes.ConfigurationContainer import ConfigurationContainer
 from ConfigurationTypes.EmailConfigurationFile import EmailConfigurationFile
 from DirectoryTypes.FileContainer import FileContainer
+from DirectoryTypes.FileType import FileType
 from DirectoryTypes.FilesAndFoldersContainer import FilesAndFoldersContainer
 from DirectoryTypes.FolderContainer import FolderContainer 
 import Exceptions.Fatal as Fatals
 import Exceptions.NonFatal as NonFatals
 import Exceptions.ExceptionAggregator as Aggregate
 from PlottingTypes.MerlinPlotter import MerlinPlotter
+from Misc.StageProfiler import StageProfiler
+from Misc.StageTimer import StageTimer
 import Misc.Utilities as util
 import os
 import sys
@@ -30,6 +33,9 @@ def main():
         # Throw Fatal exception if any command line arguments were invalid:
         cmdLineArgs = CommandLineArgs()
         cmdLineArgs.ParseArgs()
+        # Profile each stage if requested, outputting results next to the log file:
+        if cmdLineArgs.ProfileMode:
+            StageProfiler.Enable(FileType.ConvertSignature(os.getcwd() + '/LogFile/Profiles/{YYYY}{MM}{DD} {RunTime}/', ValueDate = cmdLineArgs.ValueDate, RunTime = cmdLineArgs.RunTime))
 
         ################################################
         # Attempt to pull in all configuration files:
@@ -37,7 +43,8 @@ def main():
         allConfigFiles = ConfigurationContainer(cmdLineArgs)
         
         # Get all contents from the configuration files:
-        allConfigFiles.GetContents()
+        with StageTimer.Time(StageTimer.ConfigLoad), StageProfiler.Profile(StageTimer.ConfigLoad):
+            allConfigFiles.GetContents()
         
         ################################################
         ## Generate plots, pdf and email (depending upon command line inputs):
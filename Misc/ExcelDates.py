@@ -0,0 +1,131 @@
+##############################################################################
+## ExcelDates.py
+##############################################################################
+## Description:
+## * Shared conversion of Excel serial dates (used in Merlin discount factor files)
+## to datetimes and axis labels, backed by a memoized serial -> label table.
+
+import datetime
+import numpy as np
+
+__all__ = ['ExcelDates']
+
+class ExcelDates(object):
+    " Object converts Excel serial dates (# of days past Jan 1st, 1900) to datetimes and date labels. "
+    ##########################################################
+    ## Static Variables:
+    ##########################################################
+    Epoch = datetime.datetime(1900, 1, 1)
+    LabelFormat = '%m/%d/%Y'
+    # Number of additional days added to either side of the label table when it is extended, so that nearby serials do not trigger a rebuild:
+    TableMargin = 366
+    # Maximum # of labels added to the table by a single call (serials further away are formatted individually), and last serial with a label (12/31/9999):
+    MaxTableExtension = 100 * 366
+    MaxSerial = (datetime.datetime(9999, 12, 31) - Epoch).days
+    # Memoized (first serial, array of labels) covering all serials requested so far:
+    __LabelTable = (0, np.array([], dtype = object))
+    ##########################################################
+    ## Class Methods:
+    ##########################################################
+    @classmethod
+    def ToDatetime(self, xldate):
+        """
+        * Convert Excel serial date to a datetime object.
+        Inputs:
+        * xldate: Number in (0, inf) that represents # of days past Jan 1st, 1900.
+        """
+        return ExcelDates.Epoch + datetime.timedelta(days = xldate)
+
+    @classmethod
+    def ToDatetime64(self, xldates):
+        """
+        * Convert array of Excel serial dates to NumPy datetime64 (day precision) array in single operation.
+        Inputs:
+        * xldates: Array-like of Excel serial dates. Fractional days are truncated.
+        """
+        days = np.asarray(xldates).astype(np.int64).astype('timedelta64[D]')
+        return np.datetime64(ExcelDates.Epoch.date()) + days
+
+    @classmethod
+    def Label(self, xldate):
+        """
+        * Return "mm/dd/yyyy" label for single Excel serial date. Fractional days are truncated.
+        """
+        return self.Labels([xldate])[0]
+
+    @classmethod
+    def Labels(self, xldates):
+        """
+        * Return list of "mm/dd/yyyy" labels for Excel serial dates using the memoized label table. Fractional days are truncated.
+        Serials that are negative, non-finite or past MaxSerial have blank labels (used when painting axes, so must not raise).
+        Inputs:
+        * xldates: Array-like of Excel serial dates.
+        """
+        values = np.asarray(xldates, dtype = np.float64).ravel()
+        labels = np.empty(len(values), dtype = object)
+        labels.fill('')
+        valid = np.isfinite(values)
+        valid[valid] = (values[valid] >= 0) & (values[valid] < ExcelDates.MaxSerial + 1)
+        if not valid.any():
+            return labels.tolist()
+        serials = values[valid].astype(np.int64)
+        if self.__ExtensionSize(serials.min(), serials.max()) > ExcelDates.MaxTableExtension:
+            # Serials are far from the table (ex: axis zoomed out), so format them without growing the table:
+            labels[valid] = [self.__GenerateLabels(serial, serial)[0] for serial in serials.tolist()]
+        else:
+            first, table = self.LabelTable(serials.min(), serials.max())
+            labels[valid] = table[serials - first]
+
+        return labels.tolist()
+
+    @classmethod
+    def LabelTable(self, firstSerial, lastSerial):
+        """
+        * Return (first serial, array of labels) table covering at least the passed serial range, extending memoized table if necessary.
+        Inputs:
+        * firstSerial: First Excel serial date that must be in table.
+        * lastSerial: Last Excel serial date that must be in table.
+        """
+        first, labels = ExcelDates.__LabelTable
+        last = first + len(labels) - 1
+        if len(labels) > 0 and first <= firstSerial and lastSerial <= last:
+            return (first, labels)
+
+        # Only generate labels for serials that are not already in table:
+        newFirst = max(int(firstSerial) - ExcelDates.TableMargin, 0)
+        newLast = min(int(lastSerial) + ExcelDates.TableMargin, ExcelDates.MaxSerial)
+        if len(labels) > 0:
+            newFirst = min(newFirst, first)
+            newLast = max(newLast, last)
+            before = self.__GenerateLabels(newFirst, first - 1)
+            after = self.__GenerateLabels(last + 1, newLast)
+            labels = np.concatenate((before, labels, after))
+        else:
+            labels = self.__GenerateLabels(newFirst, newLast)
+        # Replace table in single assignment so that readers always see a consistent table:
+        ExcelDates.__LabelTable = (newFirst, labels)
+
+        return ExcelDates.__LabelTable
+
+    ##########################################################
+    ## Private Helpers:
+    ##########################################################
+    @classmethod
+    def __ExtensionSize(self, firstSerial, lastSerial):
+        """
+        * Return # of labels that LabelTable() would add to the table to cover [firstSerial, lastSerial].
+        """
+        first, labels = ExcelDates.__LabelTable
+        if len(labels) == 0:
+            return int(lastSerial) - int(firstSerial) + 1
+        return max(first - int(firstSerial), 0) + max(int(lastSerial) - (first + len(labels) - 1), 0)
+
+    @classmethod
+    def __GenerateLabels(self, firstSerial, lastSerial):
+        """
+        * Return array of labels for each serial in [firstSerial, lastSerial].
+        """
+        labels = np.empty(max(lastSerial - firstSerial + 1, 0), dtype = object)
+        for index in range(0, len(labels)):
+            labels[index] = (ExcelDates.Epoch + datetime.timedelta(days = firstSerial + index)).strftime(ExcelDates.LabelFormat)
+        return labels
@@ -0,0 +1,138 @@
+##############################################################################
+## StageProfiler.py
+##############################################################################
+## Description:
+## * Opt-in profiling of each stage of a run (--profile). Each stage is run
+## under cProfile, and the objects left allocated by the stage are counted,
+## so that hot paths and memory growth can be compared across releases.
+
+from contextlib import contextmanager
+import cProfile
+import gc
+import os
+
+__all__ = ['StageProfiler']
+
+class StageProfiler(object):
+    " Object writes a .pstats file and an allocation snapshot for each profiled stage, if enabled. "
+    ##########################################################
+    ## Static Variables:
+    ##########################################################
+    # # of entries listed in each allocation snapshot:
+    TopAllocations = 25
+    __PStatsExtension = '.pstats'
+    __AllocationsSuffix = ' Allocations.txt'
+    # Output folder (profiling is disabled if None), written files and [(path, error message)] for files that could not be written:
+    __Folder = None
+    __Outputs = []
+    __Failures = []
+    ##########################################################
+    ## Class Methods:
+    ##########################################################
+    @classmethod
+    def Enable(self, folder):
+        """
+        * Profile all subsequent stages, writing results to folder.
+        Inputs:
+        * folder: Folder to write .pstats files and allocation snapshots to. Created when first stage completes.
+        """
+        if not isinstance(folder, str):
+            raise ValueError('folder must be a string.')
+        StageProfiler.__Folder = folder.replace('\\', '/').rstrip('/') + '/'
+        StageProfiler.__Outputs = []
+        StageProfiler.__Failures = []
+
+    @classmethod
+    def Disable(self):
+        """
+        * Stop profiling subsequent stages.
+        """
+        StageProfiler.__Folder = None
+
+    @classmethod
+    @contextmanager
+    def Profile(self, stage):
+        """
+        * Context manager running block under cProfile and recording objects it allocated, if profiling is enabled.
+        Outputs '<Stage>.pstats' (load with pstats.Stats) and '<Stage> Allocations.txt' to the profile folder.
+        Note: only the current process is profiled, so work done by --workers processes is not included.
+        Inputs:
+        * stage: Name of stage (ex: StageTimer.Render).
+        """
+        if StageProfiler.__Folder is None:
+            yield
+            return
+        before = self.__CountObjects()
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+            self.__Output(stage, profiler, before, self.__CountObjects())
+
+    ##########################################################
+    ## Accessors:
+    ##########################################################
+    @classmethod
+    def Enabled(self):
+        " Indicate if stages are being profiled. "
+        return StageProfiler.__Folder is not None
+    @classmethod
+    def Failures(self):
+        " Return list of (path, error message) for profile files that could not be written. "
+        return list(StageProfiler.__Failures)
+    @classmethod
+    def Folder(self):
+        " Return folder profile files are written to, or None if not enabled. "
+        return StageProfiler.__Folder
+    @classmethod
+    def Outputs(self):
+        " Return paths to all profile files written. "
+        return list(StageProfiler.__Outputs)
+
+    ##########################################################
+    ## Private Helpers:
+    ##########################################################
+    @classmethod
+    def __CountObjects(self):
+        """
+        * Return { Type Name -> # of live objects tracked by the garbage collector }.
+        """
+        gc.collect()
+        counts = {}
+        for obj in gc.get_objects():
+            typeName = type(obj).__name__
+            counts[typeName] = counts.get(typeName, 0) + 1
+        return counts
+
+    @classmethod
+    def __Output(self, stage, profiler, before, after):
+        """
+        * Write profile statistics and the object types that grew the most during stage.
+        """
+        folder = StageProfiler.__Folder
+        growth = sorted([(after[typeName] - before.get(typeName, 0), typeName) for typeName in after.keys()], reverse = True)
+        lines = ['%-40s %12s %12s' % ('Type', 'New Objects', 'Live Objects')]
+        for count, typeName in growth[0:StageProfiler.TopAllocations]:
+            if count <= 0:
+                break
+            lines.append('%-40s %12d %12d' % (typeName, count, after[typeName]))
+        outputs = [(folder + stage + StageProfiler.__PStatsExtension, lambda path: profiler.dump_stats(path)),
+                   (folder + stage + StageProfiler.__AllocationsSuffix, lambda path: self.__WriteLines(path, lines))]
+        for path, write in outputs:
+            try:
+                if not os.path.exists(folder):
+                    os.makedirs(folder)
+                write(path)
+                StageProfiler.__Outputs.append(path)
+            except (IOError, OSError) as err:
+                StageProfiler.__Failures.append((path, str(err)))
+
+    @classmethod
+    def __WriteLines(self, path, lines):
+        """
+        * Write lines to text file.
+        """
+        with open(path, 'w') as f:
+            f.write('\n'.join(lines) + '\n')
@@ -0,0 +1,195 @@
+##############################################################################
+## StageTimer.py
+##############################################################################
+## Description:
+## * Process wide instrumentation recording wall time, CPU time and counts for
+## each stage of a run (and each plot within a stage), with summary table and
+## JSON report output.
+
+from contextlib import contextmanager
+import json
+import os
+import threading
+import time
+
+__all__ = ['StageTimer']
+
+class StageTimer(object):
+    " Object records wall time, CPU time and call counts per stage and per plot for the current process. "
+    ##########################################################
+    ## Static Variables:
+    ##########################################################
+    ConfigLoad = 'Config Load'
+    LoadPlots = 'Load Plots'
+    CurveRead = 'Curve Read'
+    ForwardRates = 'Forward Rates'
+    Screening = 'Screening'
+    Render = 'Render'
+    Export = 'Export'
+    ImageWrites = 'Image Writes'
+    PDF = 'PDF'
+    Email = 'Email'
+    # Order stages appear in the summary table (unlisted stages are appended):
+    Stages = [ConfigLoad, LoadPlots, CurveRead, ForwardRates, Screening, Render, Export, ImageWrites, PDF, Email]
+    # Number of slowest plots listed in the summary table:
+    SlowestPlots = 10
+    # Map { Stage -> [count, wall seconds, cpu seconds] } and { (Stage, Plot Title) -> [count, wall seconds, cpu seconds] }:
+    __Stages = {}
+    __Plots = {}
+    __Lock = threading.Lock()
+    ##########################################################
+    ## Class Methods:
+    ##########################################################
+    @classmethod
+    @contextmanager
+    def Time(self, stage, plotTitle = None):
+        """
+        * Context manager recording wall and CPU time spent in block under stage (and plot, if provided).
+        Note: CPU time is process wide, so it includes time spent by other threads while block runs.
+        Inputs:
+        * stage: Name of stage (ex: StageTimer.Render).
+        Optional Inputs:
+        * plotTitle: Title of plot the block was run for.
+        """
+        start = self.Start()
+        try:
+            yield
+        finally:
+            self.Stop(start, stage, plotTitle)
+
+    @classmethod
+    def Start(self):
+        """
+        * Return start token for timing code that cannot be wrapped in Time() block (see Stop()).
+        """
+        return (time.time(), StageTimer.CPUTime())
+
+    @classmethod
+    def Stop(self, start, stage, plotTitle = None):
+        """
+        * Record time elapsed since Start() under stage (and plot, if provided).
+        Inputs:
+        * start: Token returned by Start().
+        * stage: Name of stage.
+        Optional Inputs:
+        * plotTitle: Title of plot the time was spent on.
+        """
+        self.Record(stage, time.time() - start[0], StageTimer.CPUTime() - start[1], plotTitle)
+
+    @classmethod
+    def Record(self, stage, wall, cpu, plotTitle = None, count = 1):
+        """
+        * Add timing to stage (and plot, if provided).
+        Inputs:
+        * stage: Name of stage.
+        * wall: Elapsed seconds.
+        * cpu: CPU seconds.
+        Optional Inputs:
+        * plotTitle: Title of plot the timing applies to.
+        * count: # of calls represented by timing.
+        """
+        with StageTimer.__Lock:
+            self.__Add(StageTimer.__Stages, stage, count, wall, cpu)
+            if plotTitle is not None:
+                self.__Add(StageTimer.__Plots, (stage, plotTitle), count, wall, cpu)
+
+    @classmethod
+    def CPUTime(self):
+        """
+        * Return user + system CPU seconds used by this process.
+        """
+        times = os.times()
+        return times[0] + times[1]
+
+    @classmethod
+    def Snapshot(self):
+        """
+        * Return picklable copy of all records, used to merge timings from worker processes (see Merge()).
+        """
+        with StageTimer.__Lock:
+            stages = dict((key, list(value)) for key, value in StageTimer.__Stages.items())
+            plots = dict((key, list(value)) for key, value in StageTimer.__Plots.items())
+        return (stages, plots)
+
+    @classmethod
+    def Merge(self, snapshot):
+        """
+        * Add records returned by Snapshot() (ex: from a worker process) to this process's records.
+        """
+        stages, plots = snapshot
+        with StageTimer.__Lock:
+            for stage, (count, wall, cpu) in stages.items():
+                self.__Add(StageTimer.__Stages, stage, count, wall, cpu)
+            for key, (count, wall, cpu) in plots.items():
+                self.__Add(StageTimer.__Plots, tuple(key), count, wall, cpu)
+
+    @classmethod
+    def Reset(self):
+        """
+        * Remove all records.
+        """
+        with StageTimer.__Lock:
+            StageTimer.__Stages = {}
+            StageTimer.__Plots = {}
+
+    @classmethod
+    def Report(self):
+        """
+        * Return dictionary containing totals for each stage and each plot.
+        Outputs:
+        * report: { 'stages' : [{stage, count, wall, cpu}], 'plots' : [{plot, stage, count, wall, cpu}] }.
+        """
+        stages, plots = self.Snapshot()
+        order = StageTimer.Stages + sorted([stage for stage in stages.keys() if stage not in StageTimer.Stages])
+        report = {'stages' : [], 'plots' : []}
+        for stage in order:
+            if stage in stages:
+                count, wall, cpu = stages[stage]
+                report['stages'].append({'stage' : stage, 'count' : count, 'wall' : round(wall, 4), 'cpu' : round(cpu, 4)})
+        for (stage, plotTitle) in sorted(plots.keys(), key = lambda key: (key[1], key[0])):
+            count, wall, cpu = plots[(stage, plotTitle)]
+            report['plots'].append({'plot' : plotTitle, 'stage' : stage, 'count' : count, 'wall' : round(wall, 4), 'cpu' : round(cpu, 4)})
+        return report
+
+    @classmethod
+    def Summary(self):
+        """
+        * Return table of totals for each stage, followed by the slowest plots.
+        """
+        report = self.Report()
+        lines = ['%-16s %8s %10s %10s %10s' % ('Stage', 'Count', 'Wall (s)', 'CPU (s)', 'Avg (ms)')]
+        for row in report['stages']:
+            lines.append('%-16s %8d %10.2f %10.2f %10.1f' % (row['stage'], row['count'], row['wall'], row['cpu'], 1000 * row['wall'] / max(row['count'], 1)))
+        # Total time spent on each plot across all stages:
+        plotTotals = {}
+        for row in report['plots']:
+            plotTotals[row['plot']] = plotTotals.get(row['plot'], 0) + row['wall']
+        if len(plotTotals) > 0:
+            lines.append('')
+            lines.append('Slowest plots (wall seconds):')
+            for plotTitle in sorted(plotTotals.keys(), key = lambda title: -plotTotals[title])[0:StageTimer.SlowestPlots]:
+                lines.append('%10.2f  %s' % (plotTotals[plotTitle], plotTitle))
+        return '\n'.join(lines)
+
+    @classmethod
+    def WriteReport(self, path):
+        """
+        * Output JSON report (see Report()) to path.
+        Inputs:
+        * path: Output file path.
+        """
+        with open(path, 'w') as f:
+            json.dump(self.Report(), f, indent = 2, sort_keys = True)
+
+    ##########################################################
+    ## Private Helpers:
+    ##########################################################
+    @classmethod
+    def __Add(self, records, key, count, wall, cpu):
+        """
+        * Add totals to record. Lock must be held by caller.
+        """
+        record = records.setdefault(key, [0, 0.0, 0.0])
+        record[0] += count
+        record[1] += wall
+        record[2] += cpu
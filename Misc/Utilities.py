@@ -5,6 +5,7 @@
 ## * Utility functions to assist key plotting and data generation functions.
 
 import datetime 
+from Misc.ExcelDates import ExcelDates
 import re
 import os
 import sys
@@ -19,9 +20,7 @@ def xldate_to_datetime(xldate):
     Output:
     * temp + delta: Datetime object corresponding to Excel serial date.
     """
-    temp = datetime.datetime(1900, 1, 1)
-    delta = datetime.timedelta(days=xldate)
-    return temp+delta
+    return ExcelDates.ToDatetime(xldate)
 
 def StringIsDate(dateString, time = False, raiseOrReturn = False):
     """
@@ -4,7 +4,10 @@
 ## Description:
 ## * Create package containing all miscellaneous files for this application.
 
-__all__ = [ 'FunctionTimer', 'Utilities']
+__all__ = [ 'ExcelDates', 'FunctionTimer', 'StageProfiler', 'StageTimer', 'Utilities']
 
+import ExcelDates
 import FunctionTimer
+import StageProfiler
+import StageTimer
 import Utilities
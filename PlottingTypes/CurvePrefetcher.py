@@ -0,0 +1,120 @@
+##############################################################################
+## CurvePrefetcher.py
+##############################################################################
+## Description:
+## * Reads and parses Merlin Curves for upcoming plots on background threads,
+## so that network reads overlap with rendering on the main (Qt) thread.
+
+import sys
+import threading
+if sys.version_info[0] > 2:
+    import queue as Queue
+else:
+    import Queue
+
+__all__ = ['CurvePrefetcher']
+
+class CurvePrefetcher(object):
+    " Object prefetches curves for each plot on a pool of threads, handing out plots whose curves are ready through a bounded queue. "
+    ##########################################################
+    ## Static Variables:
+    ##########################################################
+    DefaultDepth = 4
+    MaxThreads = 4
+    # Seconds between checks for cancellation while blocked on a full queue, and for stopped threads while waiting on an empty queue:
+    __PollInterval = 0.1
+    ##########################################################
+    ## Constructors:
+    ##########################################################
+    def __init__(self, allPlots, depth = DefaultDepth):
+        """
+        * Overloaded constructor.
+        Inputs:
+        * allPlots: Dictionary mapping { PlotName -> ForwardRatePlot }. Each plot must provide Prefetch().
+        Optional Inputs:
+        * depth: Maximum # of plots that can be prefetched ahead of the plot being rendered. Threads block once reached.
+        """
+        if not isinstance(depth, int) or depth < 1:
+            raise ValueError('depth must be a positive integer.')
+        self.__AllPlots = allPlots
+        self.__Depth = depth
+        self.__Pending = Queue.Queue()
+        self.__Ready = Queue.Queue(maxsize = depth)
+        self.__Stopped = threading.Event()
+        self.__Threads = []
+
+    ##########################################################
+    ## Public Methods:
+    ##########################################################
+    def __iter__(self):
+        """
+        * Yield plot names in the order their curves become available. Background threads are started on first iteration
+        and stopped once all plots have been handed out or iteration is abandoned.
+        """
+        for plotName in self.__AllPlots.keys():
+            self.__Pending.put(plotName)
+        self.__Stopped.clear()
+        for thread in range(0, min(self.__Depth, CurvePrefetcher.MaxThreads, len(self.__AllPlots))):
+            self.__Threads.append(threading.Thread(target = self.__Run, name = 'CurvePrefetcher-%d' % thread))
+            self.__Threads[-1].daemon = True
+            self.__Threads[-1].start()
+        handedOut = set()
+        try:
+            while len(handedOut) < len(self.__AllPlots):
+                try:
+                    plotName = self.__Ready.get(timeout = CurvePrefetcher.__PollInterval)
+                except Queue.Empty:
+                    if len([thread for thread in self.__Threads if thread.is_alive()]) > 0:
+                        continue
+                    # All threads stopped without handing out every plot, so hand out the rest (curves are read while rendering):
+                    for plotName in [plotName for plotName in self.__AllPlots.keys() if plotName not in handedOut]:
+                        handedOut.add(plotName)
+                        yield plotName
+                    break
+                if plotName not in handedOut:
+                    handedOut.add(plotName)
+                    yield plotName
+        finally:
+            self.Close()
+
+    def Close(self):
+        """
+        * Stop all background threads, discarding plots that have not been prefetched.
+        """
+        self.__Stopped.set()
+        for thread in self.__Threads:
+            thread.join()
+        self.__Threads = []
+
+    ##########################################################
+    ## Properties:
+    ##########################################################
+    @property
+    def Depth(self):
+        " Return maximum # of plots prefetched ahead of rendering. "
+        return self.__Depth
+
+    ##########################################################
+    ## Private Helpers:
+    ##########################################################
+    def __Run(self):
+        """
+        * Prefetch curves for pending plots until none remain or prefetcher is closed.
+        """
+        while not self.__Stopped.is_set():
+            try:
+                plotName = self.__Pending.get_nowait()
+            except Queue.Empty:
+                return
+            try:
+                self.__AllPlots[plotName].Prefetch()
+            except BaseException:
+                # Issues (including MerlinPlottingExcept, which derives from BaseException) are raised again when the plot reads its curves while rendering:
+                pass
+            # Block while the queue is full (back-pressure), checking periodically for cancellation:
+            while not self.__Stopped.is_set():
+                try:
+                    self.__Ready.put(plotName, timeout = CurvePrefetcher.__PollInterval)
+                    break
+                except Queue.Full:
+                    continue
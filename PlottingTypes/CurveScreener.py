@@ -0,0 +1,244 @@
+##############################################################################
+## CurveScreener.py
+##############################################################################
+## Description:
+## * Computes render-free diagnostics for every curve on the loaded plots, using
+## T and T-1 forward rates, and ranks curves that break screening thresholds.
+
+from __future__ import division
+import csv
+from DirectoryTypes.FileType import FileType
+import Exceptions.NonFatal as NonFatals
+import numpy as np
+
+__all__ = ['CurveScreener']
+
+class CurveScreener(FileType):
+    " Object screens forward rate curves for anomalies (day-over-day shift, jumps, low or invalid rates, truncation) without rendering any plots. "
+    ##########################################################
+    ## Static Variables:
+    ##########################################################
+    # Default thresholds (in basis points):
+    DefaultMaxShift = 25.0
+    DefaultMaxJump = 50.0
+    DefaultMinRate = 0.0
+    # Columns output to the screening report, in order:
+    ReportColumns = ['Rank', 'Plot', 'Curve', 'Flags', 'Score', 'Max Shift (bps)', 'Max Jump (bps)', 'Min Rate (bps)', 'Negative Rates', 'Invalid Rates', 'Points', 'T-1 Points', 'Last Date', 'T-1 Last Date']
+    __BasisPoints = 10000
+    ##########################################################
+    ## Constructors:
+    ##########################################################
+    def __init__(self, curveStore, maxShift = DefaultMaxShift, maxJump = DefaultMaxJump, minRate = DefaultMinRate):
+        """
+        * Overloaded constructor.
+        Inputs:
+        * curveStore: Run scoped CurveStore object shared with all plots, so screened curves are not read again when rendering.
+        Optional Inputs:
+        * maxShift: Maximum absolute day-over-day forward rate shift in basis points.
+        * maxJump: Maximum absolute change between adjacent forward rates in basis points.
+        * minRate: Minimum forward rate in basis points.
+        """
+        self.Store = curveStore
+        self.MaxShift = maxShift
+        self.MaxJump = maxJump
+        self.MinRate = minRate
+        self.__Results = []
+
+    ##########################################################
+    ## Public Methods:
+    ##########################################################
+    def Screen(self, allPlots):
+        """
+        * Screen every curve on each passed plot, and rank the results with the most severe issues first.
+        Inputs:
+        * allPlots: Dictionary mapping { PlotName -> ForwardRatePlot }.
+        Outputs:
+        * Results: List of report rows (dictionaries keyed by ReportColumns).
+        """
+        results = []
+        for plotName in allPlots.keys():
+            plot = allPlots[plotName]
+            if plot.CurveConfigs is None:
+                continue
+            for curve in plot.CurveConfigs.keys():
+                tRates, tStatus = self.__LoadRates(plot, curve, False)
+                t1Rates, t1Status = self.__LoadRates(plot, curve, True)
+                result = self.Diagnose(tRates, t1Rates)
+                result['Plot'] = plot.PlotTitle
+                result['Curve'] = curve
+                flags = [status for status in (tStatus, t1Status) if status]
+                flags += self.__Breaches(result, tRates is not None and t1Rates is not None)
+                result['Flags'] = ', '.join(flags)
+                results.append(result)
+
+        # Rank by # of flags, then by how far the worst threshold was exceeded:
+        results.sort(key = lambda result: (-len([flag for flag in result['Flags'].split(', ') if flag]), -result['Score']))
+        for rank in range(0, len(results)):
+            results[rank]['Rank'] = rank + 1
+        self.__Results = results
+
+        return results
+
+    def WriteReport(self, path):
+        """
+        * Output ranked screening results to CSV file.
+        Inputs:
+        * path: Expecting string path to csv file.
+        """
+        self.CreateFolderIfDoesNotExist(self.ExtractFolderName(path))
+        with open(path, 'wb') as f:
+            writer = csv.DictWriter(f, fieldnames = CurveScreener.ReportColumns)
+            writer.writeheader()
+            for result in self.__Results:
+                writer.writerow(dict([(column, CurveScreener.__Format(result[column])) for column in CurveScreener.ReportColumns]))
+
+    @classmethod
+    def Diagnose(self, tRates, t1Rates):
+        """
+        * Calculate diagnostics for single curve.
+        Inputs:
+        * tRates: (fwdDates, fwdRates) for T curve, or None if unavailable.
+        * t1Rates: (fwdDates, fwdRates) for T-1 curve, or None if unavailable.
+        Outputs:
+        * result: Dictionary containing metric report columns (NaN if metric could not be calculated).
+        """
+        bps = CurveScreener.__BasisPoints
+        result = { 'Max Shift (bps)' : np.nan, 'Max Jump (bps)' : np.nan, 'Min Rate (bps)' : np.nan, 'Negative Rates' : 0, 'Invalid Rates' : 0,
+                  'Points' : 0, 'T-1 Points' : 0, 'Last Date' : '', 'T-1 Last Date' : '', 'Score' : 0.0 }
+        if t1Rates is not None:
+            result['T-1 Points'] = len(t1Rates[1])
+            result['T-1 Last Date'] = (int(t1Rates[0][-1]) if len(t1Rates[0]) else '')
+        if tRates is None:
+            return result
+
+        fwdDates, fwdRates = tRates
+        valid = np.isfinite(fwdRates)
+        validRates = fwdRates[valid]
+        result['Points'] = len(fwdRates)
+        result['Last Date'] = (int(fwdDates[-1]) if len(fwdDates) else '')
+        result['Invalid Rates'] = int(len(fwdRates) - len(validRates))
+        result['Negative Rates'] = int((validRates < 0).sum())
+        if len(validRates) > 0:
+            result['Min Rate (bps)'] = validRates.min() * bps
+        if len(validRates) > 1:
+            result['Max Jump (bps)'] = np.abs(np.diff(validRates)).max() * bps
+        if t1Rates is not None:
+            # Compare forward rates on dates common to both curves:
+            t1Dates, t1FwdRates = t1Rates
+            common, tIndices, t1Indices = np.intersect1d(fwdDates, t1Dates, assume_unique = True, return_indices = True)
+            shifts = fwdRates[tIndices] - t1FwdRates[t1Indices]
+            shifts = shifts[np.isfinite(shifts)]
+            if len(shifts) > 0:
+                result['Max Shift (bps)'] = np.abs(shifts).max() * bps
+
+        return result
+
+    ##########################################################
+    ## Properties:
+    ##########################################################
+    @property
+    def FlaggedCurves(self):
+        " Return list of '<Plot>: <Curve>' strings for each curve that broke at least one threshold. "
+        return ['%s: %s' % (result['Plot'], result['Curve']) for result in self.__Results if result['Flags']]
+    @property
+    def FlaggedPlots(self):
+        " Return set of plot titles that contain at least one flagged curve. "
+        return set([result['Plot'] for result in self.__Results if result['Flags']])
+    @property
+    def MaxJump(self):
+        " Return maximum adjacent forward rate change in basis points. "
+        return self.__MaxJump
+    @property
+    def MaxShift(self):
+        " Return maximum day-over-day forward rate shift in basis points. "
+        return self.__MaxShift
+    @property
+    def MinRate(self):
+        " Return minimum forward rate in basis points. "
+        return self.__MinRate
+    @property
+    def Results(self):
+        " Return ranked results from the last call to Screen(). "
+        return self.__Results
+
+    @MaxJump.setter
+    def MaxJump(self, maxJump):
+        """
+        * Set the maximum adjacent forward rate change.
+        Inputs:
+        * maxJump: Expecting a positive number of basis points.
+        """
+        if type(maxJump) not in [int, float] or maxJump <= 0:
+            raise ValueError('MaxJump must be a positive number.')
+        self.__MaxJump = float(maxJump)
+    @MaxShift.setter
+    def MaxShift(self, maxShift):
+        """
+        * Set the maximum day-over-day forward rate shift.
+        Inputs:
+        * maxShift: Expecting a positive number of basis points.
+        """
+        if type(maxShift) not in [int, float] or maxShift <= 0:
+            raise ValueError('MaxShift must be a positive number.')
+        self.__MaxShift = float(maxShift)
+    @MinRate.setter
+    def MinRate(self, minRate):
+        """
+        * Set the minimum forward rate.
+        Inputs:
+        * minRate: Expecting a number of basis points.
+        """
+        if type(minRate) not in [int, float]:
+            raise ValueError('MinRate must be a number.')
+        self.__MinRate = float(minRate)
+
+    ##########################################################
+    ## Private Helpers:
+    ##########################################################
+    def __LoadRates(self, plot, curveName, isTMinusOne):
+        """
+        * Return ((fwdDates, fwdRates), '') for curve using shared store, or (None, <flag>) if curve could not be read.
+        """
+        path = plot.CurveFilePath(curveName, isTMinusOne)
+        date = (plot.TMinusOne if isTMinusOne else plot.ValueDate)
+        curveTitle = ('T-1 ' if isTMinusOne else '') + curveName
+        try:
+            return (self.Store.GetForwardRates(curveName, date, path, plot.CurveConfigs[curveName].FwdRateConv, curveTitle), '')
+        except NonFatals.MerlinCurvesMissing:
+            return (None, 'Missing ' + ('T-1' if isTMinusOne else 'T'))
+        except NonFatals.NonFatal:
+            return (None, 'Malformed ' + ('T-1' if isTMinusOne else 'T'))
+
+    def __Breaches(self, result, hasBothCurves):
+        """
+        * Return list of flags for thresholds broken by result, and set the result's score (worst ratio of metric to threshold).
+        """
+        flags = []
+        ratios = [0.0]
+        if not np.isnan(result['Max Shift (bps)']):
+            ratios.append(result['Max Shift (bps)'] / self.MaxShift)
+            if result['Max Shift (bps)'] > self.MaxShift:
+                flags.append('Shift')
+        if not np.isnan(result['Max Jump (bps)']):
+            ratios.append(result['Max Jump (bps)'] / self.MaxJump)
+            if result['Max Jump (bps)'] > self.MaxJump:
+                flags.append('Jump')
+        if not np.isnan(result['Min Rate (bps)']) and result['Min Rate (bps)'] < self.MinRate:
+            flags.append('Low Rate')
+        if result['Invalid Rates'] > 0:
+            flags.append('Invalid Rates')
+        # T curve is truncated if it ends before the T-1 curve:
+        if hasBothCurves and result['Last Date'] != '' and result['T-1 Last Date'] != '' and result['Last Date'] < result['T-1 Last Date']:
+            flags.append('Truncated')
+        result['Score'] = max(ratios)
+
+        return flags
+
+    @classmethod
+    def __Format(self, value):
+        """
+        * Return value formatted for output to report.
+        """
+        if isinstance(value, float):
+            return ('' if np.isnan(value) else '%.2f' % value)
+        return value
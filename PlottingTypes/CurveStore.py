@@ -0,0 +1,189 @@
+##############################################################################
+## CurveStore.py
+##############################################################################
+## Description:
+## * Run scoped store of parsed Merlin Curves shared by all ForwardRatePlots, so
+## each discount factor file is read and converted once per run. Store can be used 
+## from multiple threads (ex: when prefetching curves).
+
+import Exceptions.NonFatal as NonFatals
+from Misc.StageTimer import StageTimer
+from PlottingTypes.ForwardRateEngine import ForwardRateEngine
+from PlottingTypes.MerlinCurveFile import MerlinCurveFile
+import os
+import threading
+
+__all__ = ['CurveStore']
+
+class CurveStore(object):
+    " Object stores parsed Merlin Curves keyed by (Curve Name, Date, Resolved Path) for the duration of the run. "
+    ##########################################################
+    ## Constructors:
+    ##########################################################
+    def __init__(self, cache = None):
+        """
+        * Overloaded constructor.
+        Optional Inputs:
+        * cache: CurveCache object used to skip re-parsing files that were parsed in previous runs.
+        """
+        self.Cache = cache
+        # Map { (Curve Name, Date, Resolved Path) -> MerlinCurveFile or NonFatal exception }:
+        self.__Curves = {}
+        # Map { Curve Name -> Set of forward rate periods requested by any plot }:
+        self.__Tenors = {}
+        # Map { (Curve Key, Forward Rate Period) -> (fwdDates, fwdRates) }:
+        self.__ForwardRates = {}
+        self.__Hits = 0
+        self.__Misses = 0
+        # Map { (Curve Name, Date, Resolved Path) -> threading.Event } for curves currently being read by another thread:
+        self.__Pending = {}
+        # Map { (Curve Key, Forward Rate Period) -> threading.Event } for forward rates currently being calculated by another thread:
+        self.__PendingRates = {}
+        self.__Lock = threading.Lock()
+
+    ##########################################################
+    ## Public Methods:
+    ##########################################################
+    def Get(self, curveName, date, path, curveTitle = None):
+        """
+        * Return parsed MerlinCurveFile, reading the file only on first request during this run.
+        Inputs:
+        * curveName: Name of the Merlin Curve.
+        * date: Date of the curve (Value Date or T-1).
+        * path: Converted path to the Merlin discount factor file.
+        Optional Inputs:
+        * curveTitle: Name used to report issues with the curve (ex: 'T-1 <CurveName>'). Uses curveName by default.
+        Raises MerlinCurvesMissing or MerlinCurvesMalformed NonFatal if file could not be read, each time it is requested.
+        """
+        key = CurveStore.Key(curveName, date, path)
+        with self.__Lock:
+            stored = self.__Curves.get(key, None)
+            pending = self.__Pending.get(key, None)
+            isReader = (stored is None and pending is None)
+            if isReader:
+                self.__Misses += 1
+                pending = self.__Pending[key] = threading.Event()
+            else:
+                self.__Hits += 1
+        if isReader:
+            # Read file outside of lock, so that other curves can be read concurrently:
+            curveFile = MerlinCurveFile(path, (curveTitle if curveTitle else curveName), self.Cache)
+            try:
+                with StageTimer.Time(StageTimer.CurveRead):
+                    curveFile.GetContents()
+                stored = curveFile
+            except NonFatals.NonFatal as err:
+                # Store the issue so the file is not read again:
+                stored = err
+            finally:
+                with self.__Lock:
+                    self.__Curves[key] = (stored if stored is not None else NonFatals.MerlinCurvesMalformed(callingFunc = 'CurveStore::Get()', malformedCurve = (curveTitle if curveTitle else curveName)))
+                    del self.__Pending[key]
+                pending.set()
+        elif stored is None:
+            # Wait for curve to be read by another thread:
+            pending.wait()
+            stored = self.__Curves[key]
+        if isinstance(stored, NonFatals.NonFatal):
+            raise stored
+        return stored
+
+    def RegisterTenors(self, curveName, fwdRateConvs):
+        """
+        * Register forward rate periods that will be requested for curve during this run.
+        Inputs:
+        * curveName: Name of the Merlin Curve.
+        * fwdRateConvs: List of forward rate periods in days (CurveConfig.FwdRateConv values).
+        """
+        with self.__Lock:
+            tenors = self.__Tenors.setdefault(curveName, set())
+            for fwdRateConv in fwdRateConvs:
+                # Invalid periods are only reported when they are requested:
+                if int(fwdRateConv) >= 1:
+                    tenors.add(float(fwdRateConv))
+
+    def GetForwardRates(self, curveName, date, path, fwdRateConv, curveTitle = None):
+        """
+        * Return forward rates for curve. On first request, forward rates for every registered period
+        of the curve are calculated in a single batched operation.
+        Inputs:
+        * curveName: Name of the Merlin Curve.
+        * date: Date of the curve (Value Date or T-1).
+        * path: Converted path to the Merlin discount factor file.
+        * fwdRateConv: Forward rate period in days.
+        Optional Inputs:
+        * curveTitle: Name used to report issues with the curve. Uses curveName by default.
+        Outputs:
+        * (fwdDates, fwdRates): Parallel arrays containing forward rate dates and forward rates.
+        """
+        curveFile = self.Get(curveName, date, path, curveTitle)
+        key = CurveStore.Key(curveName, date, path)
+        fwdRateConv = float(fwdRateConv)
+        while True:
+            with self.__Lock:
+                stored = self.__ForwardRates.get((key, fwdRateConv), None)
+                if stored is not None:
+                    return stored
+                pending = self.__PendingRates.get((key, fwdRateConv), None)
+                if pending is None:
+                    # Calculate all registered periods for this curve that have not been calculated (or claimed by another thread) yet:
+                    tenors = self.__Tenors.get(curveName, set()) | set([fwdRateConv])
+                    tenors = sorted([tenor for tenor in tenors if (key, tenor) not in self.__ForwardRates and (key, tenor) not in self.__PendingRates])
+                    pending = threading.Event()
+                    for tenor in tenors:
+                        self.__PendingRates[(key, tenor)] = pending
+                    break
+            # Wait for forward rates to be calculated by another thread, then check again (calculation is retried if it failed):
+            pending.wait()
+        # Calculate outside of lock, so that other curves can be read and calculated concurrently:
+        calculated = {}
+        try:
+            isBRL = ForwardRateEngine.IsBRL(curveName)
+            with StageTimer.Time(StageTimer.ForwardRates):
+                fwdDates, fwdRates, lengths = ForwardRateEngine.CalculateMatrix(curveFile.Dates, curveFile.DiscountFactors, tenors, isBRL)
+                for row in range(0, len(tenors)):
+                    rowDates, rowRates = (fwdDates[0:lengths[row]], fwdRates[row, 0:lengths[row]])
+                    if isBRL:
+                        rowDates, rowRates = ForwardRateEngine.FillZeroRates(rowDates, rowRates)
+                    calculated[(key, tenors[row])] = (rowDates, rowRates)
+        finally:
+            with self.__Lock:
+                self.__ForwardRates.update(calculated)
+                for tenor in tenors:
+                    del self.__PendingRates[(key, tenor)]
+            pending.set()
+
+        return calculated[(key, fwdRateConv)]
+
+    def Clear(self):
+        """
+        * Release all stored curves and reset hit/miss counts.
+        """
+        with self.__Lock:
+            self.__Curves = {}
+            self.__ForwardRates = {}
+            self.__Hits = 0
+            self.__Misses = 0
+
+    @classmethod
+    def Key(self, curveName, date, path):
+        """
+        * Return key identifying curve within the store.
+        """
+        return (curveName, date, os.path.normcase(os.path.realpath(path)))
+
+    ##########################################################
+    ## Properties:
+    ##########################################################
+    @property
+    def Hits(self):
+        " Return # of requests that were served without reading a file. "
+        return self.__Hits
+    @property
+    def Misses(self):
+        " Return # of requests that required reading a file. "
+        return self.__Misses
+    @property
+    def Count(self):
+        " Return # of distinct curves held in the store. "
+        return len(self.__Curves)
@@ -6,6 +6,7 @@
 
 import datetime
 import decimal
+from Misc.ExcelDates import ExcelDates
 import numbers
 import numpy as np
 import pyqtgraph as pg
@@ -18,6 +19,7 @@ class PercentAxis(pg.AxisItem):
     " Converts floating point data to display as percentages with 2 decimal places. "
     # Use static variable to set the number of ticks to display:
     numTicks = 8
+    DefaultDecimalPoints = 2
     __formatStringBase = "{0:.%df}%%"
     ##########################################################
     ## Constructors:
@@ -32,7 +34,7 @@ class PercentAxis(pg.AxisItem):
         else:
             super(PercentAxis, self).__init__(*args, **kwargs)
 
-        decimalPoints = kwargs.get("DecimalPoints", 2)
+        decimalPoints = kwargs.get("DecimalPoints", PercentAxis.DefaultDecimalPoints)
         self.DecimalPoints = decimalPoints
 
     ##########################################################
@@ -105,9 +107,9 @@ class TimeAxis(pg.AxisItem):
     ##########################################################
     def tickStrings(self, values, scale, spacing):
         """
-        * Format all datapoints using "mm/dd/yyyy" date representation.
+        * Format all datapoints using "mm/dd/yyyy" date representation, using shared label table.
         """
-        return [datetime.datetime.strftime(self.ExcelSerialToDatetime(value),'%m/%d/%Y') for value in values]
+        return ExcelDates.Labels(values)
 
     def SkiptickValues(self, minVal, maxVal, size):
         """
@@ -152,10 +154,7 @@ class TimeAxis(pg.AxisItem):
         """
         * Convert Excel serial date to a datetime object.
         """
-        temp = datetime.datetime(1900, 1, 1)
-        delta = datetime.timedelta(days=int(xldate))
-    
-        return temp + delta
+        return ExcelDates.ToDatetime(int(xldate))
 """
 class TimeAxis_3D(gl.GLAxisItem):
     " Object formats axis to display dates as strings. "
@@ -0,0 +1,111 @@
+##############################################################################
+## Decimator.py
+##############################################################################
+## Description:
+## * Downsamples forward rate series to the number of points that can be shown
+## at the output image width, while keeping the visual extremes of each series.
+
+from __future__ import division
+import numpy as np
+
+__all__ = ['Decimator']
+
+class Decimator(object):
+    " Object reduces (x, y) series to plot-ready size using min/max buckets or Largest-Triangle-Three-Buckets. "
+    ##########################################################
+    ## Static Variables:
+    ##########################################################
+    MinMax = 'minmax'
+    LTTB = 'lttb'
+    Methods = [MinMax, LTTB]
+    # Number of points kept for each horizontal pixel of output image:
+    PointsPerPixel = 2
+    # Width used if the output image width could not be determined:
+    DefaultWidth = 640
+    ##########################################################
+    ## Class Methods:
+    ##########################################################
+    @classmethod
+    def Decimate(self, x, y, width, method = MinMax):
+        """
+        * Return downsampled (x, y) series for plotting at given pixel width. Series that already fit are returned unchanged.
+        Inputs:
+        * x: Array of x values (forward rate dates), sorted ascending.
+        * y: Parallel array of y values (forward rates).
+        * width: Width of output image in pixels.
+        Optional Inputs:
+        * method: One of Decimator.Methods.
+        Outputs:
+        * (x, y): Parallel arrays containing at most PointsPerPixel * width points.
+        """
+        if method not in Decimator.Methods:
+            raise ValueError('method must be one of %s.' % ', '.join(Decimator.Methods))
+        width = (int(width) if width and width > 0 else Decimator.DefaultWidth)
+        targetPoints = Decimator.PointsPerPixel * width
+        if len(y) <= targetPoints or targetPoints < 3:
+            return (x, y)
+        if method == Decimator.LTTB:
+            indices = self.LTTBIndices(x, y, targetPoints)
+        else:
+            indices = self.MinMaxIndices(y, targetPoints // 2)
+
+        return (x[indices], y[indices])
+
+    @classmethod
+    def MinMaxIndices(self, y, buckets):
+        """
+        * Return sorted indices of the minimum and maximum point in each of the equally sized buckets,
+        always including the first and last point.
+        Inputs:
+        * y: Array of y values.
+        * buckets: Number of buckets (usually the pixel width).
+        """
+        y = np.asarray(y, dtype = np.float64)
+        count = len(y)
+        bucketSize = int(np.ceil(count / buckets))
+        buckets = int(np.ceil(count / bucketSize))
+        # Pad final bucket so that all buckets can be reduced at once, ignoring invalid values:
+        padded = np.empty(buckets * bucketSize)
+        padded[0:count] = y
+        padded[count:] = np.nan
+        valid = np.isfinite(padded).reshape(buckets, bucketSize)
+        values = padded.reshape(buckets, bucketSize)
+        offsets = np.arange(buckets) * bucketSize
+        minIndices = np.where(valid, values, np.inf).argmin(axis = 1) + offsets
+        maxIndices = np.where(valid, values, -np.inf).argmax(axis = 1) + offsets
+        indices = np.concatenate(([0, count - 1], minIndices, maxIndices))
+
+        return np.unique(indices[indices < count])
+
+    @classmethod
+    def LTTBIndices(self, x, y, targetPoints):
+        """
+        * Return sorted indices selected by the Largest-Triangle-Three-Buckets algorithm,
+        always including the first and last point.
+        Inputs:
+        * x: Array of x values, sorted ascending.
+        * y: Parallel array of y values.
+        * targetPoints: Number of points to keep (at least 3).
+        """
+        x = np.asarray(x, dtype = np.float64)
+        y = np.asarray(y, dtype = np.float64)
+        count = len(y)
+        # First and last points are kept, remaining points are split into equally sized buckets:
+        edges = (np.arange(targetPoints - 1) * ((count - 2) / (targetPoints - 2))).astype(int) + 1
+        edges[-1] = count - 1
+        indices = np.empty(targetPoints, dtype = int)
+        indices[0] = 0
+        indices[-1] = count - 1
+        previous = 0
+        for bucket in range(0, targetPoints - 2):
+            start, end = edges[bucket], edges[bucket + 1]
+            # Third point of triangle is the average of the next bucket:
+            nextEnd = (edges[bucket + 2] if bucket + 2 < len(edges) else count)
+            avgX = x[end:nextEnd].mean()
+            avgY = y[end:nextEnd].mean()
+            # Keep point forming the largest triangle with the previously selected point and next bucket's average:
+            areas = np.abs((x[previous] - avgX) * (y[start:end] - y[previous]) - (x[previous] - x[start:end]) * (avgY - y[previous]))
+            previous = start + int(np.nan_to_num(areas).argmax())
+            indices[bucket + 1] = previous
+
+        return indices
@@ -9,6 +9,7 @@ from pyqtgraph.exporters import Exporter
 from pyqtgraph.parametertree import Parameter
 from pyqtgraph.Qt import QtGui, QtCore, QtSvg, USE_PYSIDE
 from pyqtgraph import functions as fn
+from collections import OrderedDict
 import numpy as np
 import pyqtgraph as pg
 
@@ -17,6 +18,15 @@ __all__ = ['FixedImageExporter']
 class FixedImageExporter(Exporter):
     Name = "Image File (PNG, TIF, JPG, ...)"
     allowCopy = True
+    # Maximum # of distinct image sizes whose rasters are kept for reuse:
+    MaxPooledSizes = 4
+    # Pool mapping (width, height, background rgba) -> (background raster, QImage), least recently used first:
+    __rasterPool = OrderedDict()
+    # Painter reused for every export (begin()/end() on each image):
+    __painter = None
+    # Counters for pooled rasters (see AllocationCounts()):
+    __allocations = 0
+    __reuses = 0
 
     def __init__(self, item):
         Exporter.__init__(self, item)
@@ -83,14 +93,8 @@ class FixedImageExporter(Exporter):
         if w == 0 or h == 0:
             raise Exception(
                 "Cannot export image with size=0 (requested export size is %dx%d)" % (w, h))
-        bg = np.empty((int(self.params['width']), int(
-            self.params['height']), 4), dtype=np.ubyte)
-        color = self.params['background']
-        bg[:, :, 0] = color.blue()
-        bg[:, :, 1] = color.green()
-        bg[:, :, 2] = color.red()
-        bg[:, :, 3] = color.alpha()
-        self.png = fn.makeQImage(bg, alpha=True)
+        # Reuse pooled image of same size, reset to the background color:
+        self.png = self.__AcquireImage(int(w), int(h), self.params['background'])
 
         # set resolution of image:
         origTargetRect = self.getTargetRect()
@@ -98,7 +102,10 @@ class FixedImageExporter(Exporter):
         #self.png.setDotsPerMeterX(self.png.dotsPerMeterX() * resolutionScale)
         #self.png.setDotsPerMeterY(self.png.dotsPerMeterY() * resolutionScale)
 
-        painter = QtGui.QPainter(self.png)
+        if FixedImageExporter.__painter is None:
+            FixedImageExporter.__painter = QtGui.QPainter()
+        painter = FixedImageExporter.__painter
+        painter.begin(self.png)
         #dtr = painter.deviceTransform()
         try:
             self.setExportMode(True, {
@@ -109,7 +116,7 @@ class FixedImageExporter(Exporter):
                 targetRect), QtCore.QRectF(sourceRect))
         finally:
             self.setExportMode(False)
-        painter.end()
+            painter.end()
 
         if copy:
             QtGui.QApplication.clipboard().setImage(self.png)
@@ -118,5 +125,56 @@ class FixedImageExporter(Exporter):
         else:
             self.png.save(fileName)
 
+    def exportBytes(self, format='PNG'):
+        """
+        * Render image and return it encoded in memory (ex: PNG bytes), without writing to disk.
+        Note: QImage returned by export(toBytes=True) is pooled and will be overwritten by the next export of the same size.
+        """
+        image = self.export(toBytes=True)
+        buffer = QtCore.QBuffer()
+        buffer.open(QtCore.QIODevice.WriteOnly)
+        try:
+            if not image.save(buffer, format):
+                raise Exception("Failed to encode image as %s." % format)
+            return buffer.data().data()
+        finally:
+            buffer.close()
+
+    @classmethod
+    def AllocationCounts(self):
+        """
+        * Return (allocations, reuses) of pooled background rasters. Steady state export of same sized plots only increments reuses.
+        """
+        return (FixedImageExporter.__allocations, FixedImageExporter.__reuses)
+
+    @classmethod
+    def ClearPool(self):
+        """
+        * Release all pooled rasters and images.
+        """
+        FixedImageExporter.__rasterPool.clear()
+
+    @classmethod
+    def __AcquireImage(self, width, height, color):
+        """
+        * Return pooled QImage with passed size filled with the background color, allocating raster only if size has not been seen.
+        """
+        key = (width, height, color.rgba())
+        pool = FixedImageExporter.__rasterPool
+        if key in pool:
+            bg, image = pool.pop(key)
+            # Reset image drawn over by previous export:
+            image.fill(color.rgba())
+            FixedImageExporter.__reuses += 1
+        else:
+            bg = np.empty((width, height, 4), dtype=np.ubyte)
+            bg[:, :] = (color.blue(), color.green(), color.red(), color.alpha())
+            image = fn.makeQImage(bg, alpha=True)
+            FixedImageExporter.__allocations += 1
+            while len(pool) >= FixedImageExporter.MaxPooledSizes:
+                pool.popitem(last=False)
+        pool[key] = (bg, image)
+        return image
+
 
 FixedImageExporter.register()
\ No newline at end of file
@@ -0,0 +1,139 @@
+##############################################################################
+## ForwardRateEngine.py
+##############################################################################
+## Description:
+## * Calculates forward rates for an entire Merlin discount factor curve at once
+## using NumPy arrays, rather than row by row.
+
+from __future__ import division
+import numpy as np
+
+__all__ = ['ForwardRateEngine']
+
+class ForwardRateEngine(object):
+    " Object calculates forward rate series from discount factor arrays using vectorized operations. "
+    ##########################################################
+    ## Static Variables:
+    ##########################################################
+    # Day count conventions for simple (default) and BRL compounded forward rates:
+    StandardDayCount = 360
+    BRLDayCount = 252
+    ##########################################################
+    ## Class Methods:
+    ##########################################################
+    @classmethod
+    def IsBRL(self, curveName):
+        """
+        * Indicate if curve is a BRL currency curve, which uses compounded forward rates.
+        Inputs:
+        * curveName: Expecting a string.
+        """
+        return isinstance(curveName, str) and curveName.find('BRL') > -1
+
+    @classmethod
+    def DayCount(self, curveName):
+        """
+        * Return the day count used to calculate forward rates for the curve.
+        Inputs:
+        * curveName: Expecting a string.
+        """
+        return (ForwardRateEngine.BRLDayCount if self.IsBRL(curveName) else ForwardRateEngine.StandardDayCount)
+
+    @classmethod
+    def Calculate(self, dates, discountFactors, fwdRateConv, isBRL = False):
+        """
+        * Calculate all forward rates for discount factor series in a single pass.
+        Inputs:
+        * dates: Array-like of Excel serial dates corresponding to each discount factor.
+        * discountFactors: Array-like of discount factors.
+        * fwdRateConv: Number of days in forward rate period (CurveConfig.FwdRateConv).
+        * isBRL: Set to True to use 252 day compounded forward rates instead of 360 day simple forward rates. 
+        Zero forward rates are then handled using FillZeroRates().
+        Outputs:
+        * (fwdDates, fwdRates): Parallel NumPy arrays (int, float64) that can be passed directly to plot().
+        """
+        dates = np.asarray(dates)
+        discountFactors = np.asarray(discountFactors, dtype = np.float64)
+        if dates.shape != discountFactors.shape or dates.ndim != 1:
+            raise ValueError('dates and discountFactors must be one dimensional arrays of equal length.')
+        period = int(fwdRateConv)
+        if period < 1:
+            raise ValueError('fwdRateConv must be at least 1 day.')
+
+        # Curve is too short to calculate any forward rates:
+        endIndex = len(discountFactors) - period
+        if endIndex <= 0:
+            return (np.array([], dtype = dates.dtype), np.array([], dtype = np.float64))
+
+        ratios = discountFactors[0:endIndex] / discountFactors[period:]
+        if isBRL:
+            # Use compounded rate to avoid weekend discount factor issues:
+            fwdRates = np.power(ratios, ForwardRateEngine.BRLDayCount) - 1
+            return self.FillZeroRates(dates[0:endIndex], fwdRates)
+        else:
+            fwdRates = (ratios - 1) / (fwdRateConv / ForwardRateEngine.StandardDayCount)
+
+        return (dates[0:endIndex], fwdRates)
+
+    @classmethod
+    def CalculateMatrix(self, dates, discountFactors, fwdRateConvs, isBRL = False):
+        """
+        * Calculate forward rates for several forward rate periods (tenors) of the same discount factor series in one batched operation.
+        Inputs:
+        * dates: Array-like of Excel serial dates corresponding to each discount factor.
+        * discountFactors: Array-like of discount factors.
+        * fwdRateConvs: List of forward rate periods in days (CurveConfig.FwdRateConv values).
+        * isBRL: Set to True to use 252 day compounded forward rates instead of 360 day simple forward rates.
+        Outputs:
+        * (fwdDates, fwdRates, lengths): fwdDates is the date array shared by all rows, fwdRates is a 2-D float64 array with one row
+        per tenor, and lengths gives the # of valid forward rates in each row (remaining entries are NaN).
+        """
+        dates = np.asarray(dates)
+        discountFactors = np.asarray(discountFactors, dtype = np.float64)
+        if dates.shape != discountFactors.shape or dates.ndim != 1:
+            raise ValueError('dates and discountFactors must be one dimensional arrays of equal length.')
+        convs = np.asarray(fwdRateConvs, dtype = np.float64).reshape(-1)
+        periods = convs.astype(int)
+        if len(periods) == 0 or (periods < 1).any():
+            raise ValueError('fwdRateConvs must contain at least one period of at least 1 day.')
+
+        # Forward rates can be calculated for all dates that precede the final date by at least the shortest period:
+        count = len(discountFactors)
+        width = max(count - periods.min(), 0)
+        lengths = np.maximum(count - periods, 0)
+        # Index of the discount factor at end of each forward period, masking those that fall past the end of the curve:
+        endIndices = np.arange(width)[np.newaxis, :] + periods[:, np.newaxis]
+        valid = endIndices < count
+        endFactors = np.where(valid, discountFactors[np.minimum(endIndices, count - 1)], np.nan)
+
+        ratios = discountFactors[np.newaxis, 0:width] / endFactors
+        if isBRL:
+            # Use compounded rate to avoid weekend discount factor issues:
+            fwdRates = np.power(ratios, ForwardRateEngine.BRLDayCount) - 1
+        else:
+            fwdRates = (ratios - 1) / (convs[:, np.newaxis] / ForwardRateEngine.StandardDayCount)
+
+        return (dates[0:width], fwdRates, lengths)
+
+    @classmethod
+    def FillZeroRates(self, fwdDates, fwdRates):
+        """
+        * Handle the BRL zero forward rates issue caused by weekend discount factors. Leading zero forward rates are removed, 
+        and all other zero forward rates are replaced with the previous non-zero forward rate, in linear time.
+        Inputs:
+        * fwdDates: Array of forward rate dates.
+        * fwdRates: Array of forward rates (will be modified).
+        Outputs:
+        * (fwdDates, fwdRates): Parallel arrays with zero forward rates handled.
+        """
+        fwdRates = np.asarray(fwdRates)
+        nonZero = (fwdRates != 0)
+        if nonZero.all():
+            return (fwdDates, fwdRates)
+        # Remove leading zero forward rates and increment the start date:
+        startIndex = int(nonZero.argmax()) if nonZero.any() else len(fwdRates)
+        # Use lagged non-zero forward rate, found as the running maximum of non-zero indices:
+        lagIndices = np.maximum.accumulate(np.where(nonZero, np.arange(len(fwdRates)), 0))
+        fwdRates[:] = fwdRates[lagIndices]
+
+        return (fwdDates[startIndex:], fwdRates[startIndex:])
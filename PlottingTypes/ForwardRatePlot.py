@@ -6,22 +6,28 @@
 ## curve.
 
 from __future__ import division
-from collections import OrderedDict
-import csv
 import datetime 
 import ConfigurationTypes.PlottingConfigFile as PlotConfig
+from DirectoryTypes.DirectoryIndex import DirectoryIndex
 from DirectoryTypes.FileType import FileType
 import Exceptions.Fatal as Fatals
 import Exceptions.NonFatal as NonFatals
+from Exceptions.ExceptionAggregator import ExceptionAggregator
 import FixedImageExporter
+from PlottingTypes.CurveStore import CurveStore
+from PlottingTypes.Decimator import Decimator
 import Misc.Utilities as util
 import pyqtgraph as pg
 import pyqtgraph.exporters
 from pyqtgraph.Qt import QtCore, QtGui
 from PlottingTypes.CustomAxisItems import PercentAxis, TimeAxis
 from PlottingTypes.Plot import Plot
-from random import randint
+from PlottingTypes.PlotWidgetPool import PlotWidgetPool
+from Misc.StageTimer import StageTimer
+from DirectoryTypes.RenderCache import RenderCache
+import hashlib
 import os
+import zlib
 
 __all__ = ['ForwardRatePlot']
 
@@ -34,16 +40,22 @@ class ForwardRatePlot(FileType, Plot):
     ## Static Variables:
     ##########################################################
     # https://groups.google.com/forum/#!topic/pyqtgraph/X7fL1KfXalY
-    # Container for all possible color schemes for plots, which will be randomly set at object initialization: 
+    # Container for all possible color schemes for plots, selected using the plot title so that each plot is always drawn in the same colors: 
     __plotColors = [['#7fff00','#ff0000','#0000ff','#ffd700','#9400d3'], ['#9400d3','#ff8c00','#7fff00','#2f5f00','#00BFFF'], ['#008080','#ff4500','#2f5f00','#9400d3','#00BFFF']]
-    # Initiate the QtGUI application as static variable:
-    __app = QtGui.QApplication([])
-    # Use same font for each axis: QtGui.QFont.Normal
-    __axisFont = QtGui.QFont("Times New Roman", 7, 100, False)
+    # QtGUI application shared by all plots in this process, created on first use (see Application()):
+    __app = None
+    # Reuse plot widgets (with their axes) across plots rather than constructing a new widget per plot:
+    __widgetPool = PlotWidgetPool(lambda: pg.PlotWidget(axisItems={ 'bottom': TimeAxis(orientation='bottom'), 'left' : PercentAxis(orientation='left')}))
+    # Use same font for each axis (QtGui.QFont.Normal), created once the QtGUI application exists (see AxisFont()):
+    __axisFont = None
     # Specify legend font:
     __legendLabelStyle = {'color': '#000', 'size': '7pt', 'bold': True, 'italic': False}
     # Use HTML signature to set title, spacing and font for all charts:
     __titleHTML = "<span style='color: #969696; font-size: 7pt; font-weight: bold; padding-top: 300px'>{PlotName}</span>"
+    # Method used to downsample each series to the output image width before plotting (see Decimator):
+    __decimationMethod = Decimator.MinMax
+    # Increment when plot styling changes, so that images rendered by previous versions are not reused from the render cache:
+    __renderVersion = 1
     ##########################################################
     ## Constructors:
     ##########################################################
@@ -60,12 +72,17 @@ class ForwardRatePlot(FileType, Plot):
         Optional Inputs:
         * TPath: Will overwrite the Merlin Curve input path for T plotted curves.
         * TMinusOnePath: Will overwrite the Merlin Curve input path for T-1 plotted curves.
+        * CurveStore: Run scoped CurveStore object shared by all plots, so each Merlin Curve file is read once.
+        * ImageWriter: Run scoped ImageWriter object used to write PNG images to disk in the background (written synchronously if not provided).
+        * RenderCache: RenderCache object used to reuse images rendered in previous runs if none of the plot's inputs have changed.
         """
         args = (args[0] if isinstance(args[0], list) else args)
         if len(args) < 6:
             raise ValueError('ForwardRatePlot construction error: missing some positional arguments.')
         self.CurveConfigs = args[0]
         self.MerlinCurvesPath = args[1]
+        # Output path is resolved on first use (see ResolveOutputPath()):
+        self.__ResolvedOutputPath = None
         self.IntendedOutputPath = args[2]
         self.PlotTitle = args[3]
         self.ValueDate = args[4]
@@ -74,17 +91,69 @@ class ForwardRatePlot(FileType, Plot):
         # Overwrite the T and T-1 Merlin curve paths if passed:
         self.__TPath = kwargs.get('TPath', '')
         self.__TMinusOnePath = kwargs.get('TMinusOnePath', '')
+        # Store of parsed Merlin Curves shared by all plots in run (use private store if not provided):
+        self.CurveStore = kwargs.get('CurveStore', None)
+        # Writer used to save encoded image to disk asynchronously:
+        self.__ImageWriter = kwargs.get('ImageWriter', None)
+        # Cache of previously rendered images:
+        self.RenderCache = kwargs.get('RenderCache', None)
 
         # Main window for this plot:
         self.__MainWindow = ''
         # Store list of curves that could not be found in production:
         self.__MissingCurves = []
+        # Store exception detailing curves whose discount factor files could not be parsed:
+        self.__MalformedCurves = None
         # Variable indicates whether plot was successfully completed:
         self.FinalOutputPath = ''
+        # Encoded PNG image kept in memory for PDF generation:
+        self.ImageBytes = None
+        # Decimated forward rate series plotted on this graph, kept for vector PDF generation:
+        self.Series = None
     
+    def __getstate__(self):
+        """
+        * Return picklable state so that plot can be rendered in a worker process. Path subscriber objects are replaced 
+        with their current values, and the plot widget, curve store, image writer and render cache are dropped (worker process supplies its own store and cache).
+        """
+        state = self.__dict__.copy()
+        state['_ForwardRatePlot__MerlinCurvesPathSignature'] = self.MerlinCurvesPath
+        state['_ForwardRatePlot__OutputPath'] = (self.__OutputPath.value if hasattr(self.__OutputPath, 'value') else self.__OutputPath)
+        state['_ForwardRatePlot__MainWindow'] = ''
+        state['_ForwardRatePlot__CurveStore'] = None
+        state['_ForwardRatePlot__ImageWriter'] = None
+        state['_ForwardRatePlot__RenderCache'] = None
+        return state
+
+    def __setstate__(self, state):
+        """
+        * Restore plot from pickled state, using private curve store until one is assigned.
+        """
+        self.__dict__.update(state)
+        self.CurveStore = None
+
     ##########################################################
     ## Public Methods:
     ##########################################################
+    @classmethod
+    def Application(self):
+        """
+        * Return QtGUI application used to render all plots in this process, creating it on first use.
+        """
+        if ForwardRatePlot.__app is None:
+            ForwardRatePlot.__app = (QtGui.QApplication.instance() or QtGui.QApplication([]))
+        return ForwardRatePlot.__app
+
+    @classmethod
+    def AxisFont(self):
+        """
+        * Return font used for each axis, creating it on first use. Fonts require the QtGUI application, so it is created first if necessary.
+        """
+        if ForwardRatePlot.__axisFont is None:
+            self.Application()
+            ForwardRatePlot.__axisFont = QtGui.QFont("Times New Roman", 7, 100, False)
+        return ForwardRatePlot.__axisFont
+
     def GenerateImage(self):
         """
         * Pull in rates data for each loaded curve, plot all into single plot and output to
@@ -94,61 +163,204 @@ class ForwardRatePlot(FileType, Plot):
         if self.CurveConfigs is None or len(self.CurveConfigs.keys()) == 0:
             raise NonFatals.NoPlotsLoaded(callingFunc = 'ForwardRatePlot::GenerateImage()', plotTitle = self.PlotTitle)
 
+        # Reuse previously rendered image if none of this plot's inputs have changed:
+        renderKey = self.RenderKey()
+        cachedImage = (self.RenderCache.Get(renderKey) if self.RenderCache is not None else None)
+        if cachedImage is not None:
+            self.__OutputImage(cachedImage)
+            return
+
         ############################
         # Initialize the Plot:
         ############################
-        plotOutputLoc = self.IntendedOutputPath
         self.__CreateWindow()
+        try:
+            self.__RenderImage(renderKey)
+        finally:
+            # Return the plot widget to the pool, whether or not the image was output:
+            self.__ReleaseWindow()
+
+    def __RenderImage(self, renderKey):
+        """
+        * Plot all loaded curves into the main window and output the PNG image.
+        Inputs:
+        * renderKey: Key used to store rendered image in the render cache (see RenderKey()), or None to skip caching.
+        """
         mainPlot = self.__MainWindow.plotItem
         # Add the legend:
         mainPlot.addLegend()
-        # Randomly select color scheme to use for plotting:
-        lineColors = ForwardRatePlot.__plotColors[randint(0, len(ForwardRatePlot.__plotColors) - 1)]
-        currColor = 0
-        # Track all potential curves that can inhabit this graph:
-        allCurves = []
+        # Output image width determines how many points of each series can be shown:
+        imageRect = mainPlot.mapRectToDevice(mainPlot.boundingRect())
+        imageWidth = (imageRect.width() if imageRect is not None else Decimator.DefaultWidth)
 
         ############################
-        # Pull in all discount factors from Merlin generated text file, calculate forward rates and input into plot:
+        # Pull in forward rates for all curves and input into plot:
+        ############################
+        self.Series = self.__CollectSeries(imageWidth)
+        # Prevent graph output if no curves were plotted:
+        if len(self.Series) == 0:
+            raise NonFatals.FailedToGeneratePNGS(callingFunc = 'ForwardRatePlot::GenerateImage()', plotTitle = self.PlotTitle, specific = 'No curves plotted.')
+        renderStart = StageTimer.Start()
+        for curveTitle, color, isTMinusOne, fwdDates, fwdRates in self.Series:
+            # Use a dashed line for graph if curve is T-1:
+            currPen = pyqtgraph.mkPen(color = color, style = (QtCore.Qt.DashLine if isTMinusOne else QtCore.Qt.SolidLine))
+            # Create the plot using the forward rate dates as x series, daily forward rates as y series:
+            mainPlot.plot(fwdDates, fwdRates, pen=currPen, name=curveTitle)
+
+        ############################
+        # Format the plot axes:
+        ############################
+        # Set font for each axis:
+        for axis in ('left','bottom','top','right'):
+            mainPlot.getAxis(axis).tickFont = self.AxisFont()
+        for axis in ('left', 'bottom'):
+            mainPlot.getAxis(axis).setGrid(255)
+        mainPlot.getAxis('bottom').setWidth(4)
+
+        # Format the legend:
+        for item in mainPlot.legend.items:
+            for single_item in item:
+                if isinstance(single_item, pg.graphicsItems.LabelItem.LabelItem):
+                    single_item.setText(single_item.text, **ForwardRatePlot.__legendLabelStyle)
+        StageTimer.Stop(renderStart, StageTimer.Render, self.PlotTitle)
+
+        ############################
+        # Output the plot to a PNG image:
         ############################
+        try:
+            with StageTimer.Time(StageTimer.Export, self.PlotTitle):
+                exporter = FixedImageExporter.FixedImageExporter(mainPlot)
+                imageBytes = exporter.exportBytes('PNG')
+        except Exception as err:
+            raise NonFatals.FailedToGeneratePNGS(callingFunc = 'ForwardRatePlot::GenerateImage()', plotTitle = self.PlotTitle, specific = err.message)
+        # Only cache images that were rendered without issues:
+        if renderKey is not None and self.RenderCache is not None and len(self.__MissingCurves) == 0 and self.__MalformedCurves is None:
+            self.RenderCache.Put(renderKey, imageBytes)
+        self.__OutputImage(imageBytes)
+        self.__RaiseCurveIssues('ForwardRatePlot::GenerateImage()')
+
+    def GenerateSeries(self):
+        """
+        * Pull in forward rates for each loaded curve without rendering an image (used to draw plot directly into vector PDF).
+        Series are stored in the Series property.
+        """
+        # Exit if no curve configurations were loaded at construction:
+        if self.CurveConfigs is None or len(self.CurveConfigs.keys()) == 0:
+            raise NonFatals.NoPlotsLoaded(callingFunc = 'ForwardRatePlot::GenerateSeries()', plotTitle = self.PlotTitle)
+        self.Series = self.__CollectSeries(Decimator.DefaultWidth)
+        if len(self.Series) == 0:
+            raise NonFatals.FailedToGeneratePNGS(callingFunc = 'ForwardRatePlot::GenerateSeries()', plotTitle = self.PlotTitle, specific = 'No curves plotted.')
+        self.__RaiseCurveIssues('ForwardRatePlot::GenerateSeries()')
+
+    def ResolveOutputPath(self):
+        """
+        * Convert the output path signature using this object's state and pick a free duplicate name, once per plot.
+        The name is reserved for the rest of the run (see DuplicateResolver), so all later reads of IntendedOutputPath return it.
+        Outputs:
+        * IntendedOutputPath: Resolved output path.
+        """
+        # Return key subscriber attribute if storing an observer object:
+        temp = (self.__OutputPath.value if hasattr(self.__OutputPath, 'value') else self.__OutputPath)
+        # Incorporate this object's state into the signature, and handle presence of duplicates:
+        temp = FileType.ConvertSignature(temp, ValueDate = self.ValueDate, RunTime = self.RunTime, PlotName = self.PlotTitle)
+        self.__ResolvedOutputPath = FileType.HandleDuplicates(temp)
+
+        return self.__ResolvedOutputPath
+
+    def RenderKey(self):
+        """
+        * Return hash of every input that affects the rendered image: T and T-1 dates, curve configurations, size and modification 
+        time of each resolved Merlin Curve file and the renderer settings.
+        Outputs:
+        * renderKey: Hex digest string, or None if a curve file is missing (image is never cached).
+        """
+        if not self.CurveConfigs:
+            return None
+        parts = [ForwardRatePlot.__renderVersion, self.PlotTitle, str(self.ValueDate), str(self.TMinusOne), ForwardRatePlot.__decimationMethod, Decimator.PointsPerPixel, self.__LineColors()]
+        for curve in self.CurveConfigs.keys():
+            parts.append([self.CurveConfigs[curve].Get(index) for index in range(0, 5)])
+            for isTMinusOne in ([False, True] if self.CurveConfigs[curve].PlotT1 else [False]):
+                path = os.path.normcase(os.path.realpath(self.CurveFilePath(curve, isTMinusOne)))
+                # Size and modification time are answered from a single listing of each curve folder:
+                stats = DirectoryIndex.Stat(path)
+                if stats is None:
+                    return None
+                parts.append((path, stats[0], stats[1]))
+
+        return hashlib.sha1(repr(parts)).hexdigest()
+
+    def Prefetch(self):
+        """
+        * Read discount factors and calculate forward rates for all curves on this plot into the curve store without rendering.
+        Issues are stored in the curve store and reported when the image is generated. Can be called from background threads.
+        """
+        if not self.CurveConfigs:
+            return
+        for curve in self.CurveConfigs.keys():
+            for isTMinusOne in ([False, True] if self.CurveConfigs[curve].PlotT1 else [False]):
+                path = self.CurveFilePath(curve, isTMinusOne)
+                if not DirectoryIndex.Exists(path):
+                    continue
+                try:
+                    self.CurveStore.GetForwardRates(curve, (self.TMinusOne if isTMinusOne else self.ValueDate), path, self.CurveConfigs[curve].FwdRateConv, ('T-1 ' if isTMinusOne else '') + curve)
+                except NonFatals.NonFatal:
+                    # Issue will be reported when image is generated:
+                    continue
+
+    def CurveFilePath(self, curveName, isTMinusOne = False):
+        """
+        * Return path to the Merlin discount factor file for curve on this plot.
+        Inputs:
+        * curveName: Name of the Merlin Curve.
+        Optional Inputs:
+        * isTMinusOne: Set to True to return path to the T-1 discount factor file.
+        """
+        # Use override paths for Merlin input curves if specified on command line, else use configured path:
+        if not isTMinusOne and self.__TPath:
+            path = self.__TPath
+        elif isTMinusOne and self.__TMinusOnePath:
+            path = self.__TMinusOnePath
+        else:
+            # Use discount factor files specified in configuration file by default:
+            path = self.MerlinCurvesPath
+
+        return FileType.ConvertSignature(path = path, ValueDate = (self.TMinusOne if isTMinusOne else self.ValueDate), CurveName = curveName)
+
+    def __CollectSeries(self, width):
+        """
+        * Pull in discount factors from Merlin generated text files and calculate forward rates for every curve on this plot.
+        Missing and malformed curves are recorded, and raised by __RaiseCurveIssues().
+        Inputs:
+        * width: Width of output in pixels, used to decimate each series.
+        Outputs:
+        * series: List of (curveTitle, color, isTMinusOne, dates, rates) tuples in plotting order.
+        """
+        lineColors = self.__LineColors()
+        currColor = 0
+        series = []
+        self.__MalformedCurves = None
         for curve in self.CurveConfigs.keys():
             currCount = 0
             isTMinusOne = self.CurveConfigs[curve].PlotT1
             currDate = self.ValueDate
             curveTitle = curve
             while currCount < 2:
-                # Use override paths for Merlin input curves if specified on command line, else use configured path:
-                if currCount == 0 and self.__TPath:
-                    currPath = self.__TPath
-                elif currCount == 1 and self.__TMinusOnePath:
-                    currPath = self.__TMinusOnePath
-                else:
-                    # Use discount factor files specified in configuration file by default:
-                    currPath = self.MerlinCurvesPath
                 # Get the path to the Merlin curve file: 
-                currPath = FileType.ConvertSignature(path = currPath, ValueDate = currDate, CurveName = curve)
-                if curveTitle not in allCurves:
-                    allCurves.append(curveTitle)
-                # Ensure that curve exists at file path:
-                if not FileType.CheckPath(currPath):
+                currPath = self.CurveFilePath(curve, isTMinusOne = (curveTitle != curve))
+                # Ensure that curve exists at file path before pulling in discount factors:
+                curveRates = None
+                if not DirectoryIndex.Exists(currPath):
                     # Append the unique missing curve to the list:
                     if curveTitle not in self.__MissingCurves:
                         self.__MissingCurves.append(curveTitle)
                 else:
-                    ##############
-                    # Pull in discount factors and calculate forward rates: 
-                    ##############
-                    discountFactors = list(csv.reader(open(currPath, 'r'), delimiter='\t'))
-                    # Calculate all forward rates:
-                    fwdRates = self.__CalculateForwardRates(discountFactors, curve)
-                    ##############
-                    # Perform plotting:
-                    ##############
+                    curveRates = self.__CalculateForwardRates(curve, currDate, currPath, curveTitle)
+                if curveRates is not None:
+                    # Keep only the points that are visible at the output width:
+                    fwdDates, fwdRates = Decimator.Decimate(curveRates[0], curveRates[1], width, ForwardRatePlot.__decimationMethod)
                     currCount += 1
-                    # Use a dashed line for graph if curve is T-1:
-                    currPen = pyqtgraph.mkPen(color = lineColors[currColor], style = (QtCore.Qt.DashLine if currCount == 2 else QtCore.Qt.SolidLine))
-                    # Create the plot using the forward rate dates as x series, daily forward rates as y series:
-                    mainPlot.plot(fwdRates.keys(), fwdRates.values(), pen=currPen, name=curveTitle)
+                    # T-1 curve is the second curve plotted in same color:
+                    series.append((curveTitle, lineColors[currColor], currCount == 2, fwdDates, fwdRates))
                 # Repeat process if plot needs T-1, using 'T-1' prepended to curve title and T-1 date to pull discount factors:
                 if isTMinusOne:
                     curveTitle = 'T-1 ' + curve
@@ -159,55 +371,71 @@ class ForwardRatePlot(FileType, Plot):
                     currColor += 1
                     break
 
-        # Prevent graph output if no curves were plotted:
-        if len(self.__MissingCurves) == len(allCurves):
-            raise NonFatals.FailedToGeneratePNGS(callingFunc = 'ForwardRatePlot::GenerateImage()', plotTitle = self.PlotTitle, specific = 'No curves plotted.')
-
-        ############################
-        # Format the plot axes:
-        ############################
-        # Set font for each axis:
-        for axis in ('left','bottom','top','right'):
-            mainPlot.getAxis(axis).tickFont = ForwardRatePlot.__axisFont
-        for axis in ('left', 'bottom'):
-            mainPlot.getAxis(axis).setGrid(255)
-        mainPlot.getAxis('bottom').setWidth(4)
+        return series
 
-        # Format the legend:
-        for item in mainPlot.legend.items:
-            for single_item in item:
-                if isinstance(single_item, pg.graphicsItems.LabelItem.LabelItem):
-                    single_item.setText(single_item.text, **ForwardRatePlot.__legendLabelStyle)
+    def __LineColors(self):
+        """
+        * Return color scheme used for this plot, selected using a checksum of the plot title so that colors are stable across runs.
+        """
+        return ForwardRatePlot.__plotColors[(zlib.crc32(self.PlotTitle) & 0xffffffff) % len(ForwardRatePlot.__plotColors)]
 
-        ############################
-        # Output the plot to a PNG image:
-        ############################
+    def __OutputImage(self, imageBytes):
+        """
+        * Keep encoded image in memory and write it to the intended output path.
+        Inputs:
+        * imageBytes: Encoded PNG image.
+        """
+        plotOutputLoc = self.IntendedOutputPath
         # Create enclosing folder for plot if does not exist:
         self.CreateFolderIfDoesNotExist(self.ExtractFolderName(plotOutputLoc))
-
+        self.ImageBytes = imageBytes
         try:
-            exporter = FixedImageExporter.FixedImageExporter(mainPlot)
-            exporter.export(plotOutputLoc)
-        except Exception as err:
-            raise NonFatals.FailedToGeneratePNGS(callingFunc = 'ForwardRatePlot::GenerateImage()', plotTitle = self.PlotTitle, specific = err.message)
-        
+            # Hand encoded image to background writer, so that rendering continues while image is saved:
+            if self.__ImageWriter is not None:
+                self.__ImageWriter.Write(plotOutputLoc, imageBytes, self.PlotTitle)
+            else:
+                with open(plotOutputLoc, 'wb') as f:
+                    f.write(imageBytes)
+        except (IOError, OSError) as err:
+            raise NonFatals.FailedToGeneratePNGS(callingFunc = 'ForwardRatePlot::GenerateImage()', plotTitle = self.PlotTitle, specific = str(err))
         # If succeeded, set the object's final output location:
         self.FinalOutputPath = plotOutputLoc
-    
-        # Raise non-fatal exception if some merlin curves were missing from production locations:
+
+    def __RaiseCurveIssues(self, callingFunc):
+        """
+        * Raise non-fatal exceptions if some merlin curves were missing from production locations or could not be parsed.
+        """
+        issues = ExceptionAggregator()
         if len(self.__MissingCurves) > 0:
-            raise NonFatals.MerlinCurvesMissing(callingFunc = 'ForwardRatePlot::GenerateImage()', targetList = self.__MissingCurves)
+            issues.Add(NonFatals.MerlinCurvesMissing(callingFunc = callingFunc, targetList = self.__MissingCurves))
+        if self.__MalformedCurves is not None:
+            issues.Add(self.__MalformedCurves)
+        if issues.ErrorCount == 1:
+            raise issues.Contents.values()[0]
+        elif issues.HasErrors:
+            raise issues
 
     def __CreateWindow(self):
         """
-        * Instantiate the main plot.
+        * Get the main plot from the shared widget pool.
         """
-        self.__MainWindow = pg.PlotWidget(axisItems={ 'bottom': TimeAxis(orientation='bottom'), 'left' : PercentAxis(orientation='left')})
+        ForwardRatePlot.Application()
+        self.__MainWindow = ForwardRatePlot.__widgetPool.Acquire()
+        # Reset axis formatting that may have been altered by the previous plot:
+        self.__MainWindow.plotItem.getAxis('left').DecimalPoints = PercentAxis.DefaultDecimalPoints
         # Set title using this plots title: 
         self.__MainWindow.plotItem.setTitle(title = self.PlotTitle, color = '030302', size = '15pt')
         # Position the title to be lower than default value:
         self.__MainWindow.plotItem.titleLabel.item.setPos(250, 10)
 
+    def __ReleaseWindow(self):
+        """
+        * Clear the main plot and return it to the shared widget pool.
+        """
+        if self.__MainWindow:
+            ForwardRatePlot.__widgetPool.Release(self.__MainWindow)
+        self.__MainWindow = ''
+
     def __SetTitleWithHTML(self, htmlString, titleLabel):
         """
         * Use HTML string to create the plot title.
@@ -221,60 +449,27 @@ class ForwardRatePlot(FileType, Plot):
         self.__MainWindow.plotItem.titleLabel.resizeEvent(None)
         self.__MainWindow.plotItem.titleLabel.updateGeometry()
 
-    def __CalculateForwardRates(self, discountFactors, curveName):
+    def __CalculateForwardRates(self, curveName, date, path, curveTitle):
         """
-        * Calculate forward rates used in plotting.
+        * Calculate forward rates used in plotting, using discount factors and forward rates held in the shared curve store.
         Inputs:
-        * discountFactors: List containing all raw discount factors from generated Merlin file.
-        * curveName: Name of curve associated with discount factors.
+        * curveName: Name of the Merlin Curve.
+        * date: Date of the discount factors (ValueDate or TMinusOne).
+        * path: Path to Merlin generated discount factor file.
+        * curveTitle: Title of curve as it appears in the legend.
         Outputs:
-        * fwdRates: OrderedDict containing all calculated forward rates.
+        * (fwdDates, fwdRates): Parallel arrays containing forward rate dates and calculated forward rates, or None if file was malformed.
         Note: If curve is a BRL currency curve then will use a different forward rate calculation method.
         """
-        
-        isBRL = (curveName.find('BRL') > -1)
-        dayCount = (252 if isBRL else 360)
         fwdRateConv = self.__CurveConfigs[curveName].FwdRateConv
-        fwdRateCalcDenom = fwdRateConv / dayCount
-        rowNum = 0
-        fwdRate = 0
-        fwdRates = OrderedDict()
-        endIndex = len(discountFactors) - int(fwdRateConv)
-        hasZeroFwdRate = False
-    
-        #####################
-        # Calculate all forward rates using discount factors:
-        #####################
-        while rowNum < endIndex:
-            # Calculate BRL curves using different method due to weekend issue:
-            if isBRL:
-                fwdRate = pow(((float(discountFactors[rowNum][1])) / float(discountFactors[rowNum + int(fwdRateConv)][1])), dayCount) - 1 
-            else:
-                fwdRate = (float(discountFactors[rowNum][1]) / float(discountFactors[rowNum + int(fwdRateConv)][1]) - 1) / fwdRateCalcDenom
-
-            if fwdRate == 0:
-                hasZeroFwdRate = True
-
-            fwdRates[int(discountFactors[rowNum][0])] = fwdRate
-            rowNum += 1
-
-        #####################
-        # Handle the BRL zero forward rates issue if BRL discount factors were passed:
-        #####################
-        if isBRL and hasZeroFwdRate:
-            startDateSerial = fwdRates.keys()[0]
-            # Use first non-zero lagged value:
-            for currDateSerial in fwdRates.keys():
-                if fwdRates[currDateSerial] == 0:
-                    if currDateSerial != startDateSerial:
-                        # Use lagged non-zero forward rate:
-                        fwdRates[currDateSerial] = fwdRates[currDateSerial - 1]
-                    else:
-                        # Remove first element if has a 0 forward rate and increment the start date:
-                        del fwdRates[currDateSerial]
-                        startDateSerial += 1
-
-        return fwdRates
+        try:
+            return self.__CurveStore.GetForwardRates(curveName, date, path, fwdRateConv, curveTitle)
+        except NonFatals.MerlinCurvesMalformed as err:
+            # Store the malformed curve to report after plotting (copy since store reuses exception):
+            if self.__MalformedCurves is None:
+                self.__MalformedCurves = NonFatals.MerlinCurvesMalformed(callingFunc = 'ForwardRatePlot::GenerateImage()', specific = err.SpecificMessage)
+            self.__MalformedCurves.Merge(err)
+            return None
 
     def __DictToCSV(self, dict, curveName):
         """
@@ -300,6 +495,14 @@ class ForwardRatePlot(FileType, Plot):
         """
         return self.__CurveConfigs
     @property
+    def CurveStore(self):
+        """
+        * Return store of parsed Merlin Curves used by this plot.
+        Output:
+        * CurveStore: CurveStore object.
+        """
+        return self.__CurveStore
+    @property
     def FinalOutputPath(self):
         """
         * Return the output path if successfully generated the image.
@@ -308,19 +511,23 @@ class ForwardRatePlot(FileType, Plot):
         """
         return self.__FinalOutputPath
     @property
+    def ImageBytes(self):
+        """
+        * Return the encoded PNG image if successfully generated.
+        Output:
+        * ImageBytes: string of PNG bytes, or None if image has not been generated.
+        """
+        return self.__ImageBytes
+    @property
     def IntendedOutputPath(self):
         """
-        * Return the output path for the generated image.
+        * Return the output path for the generated image, resolving it on first access (see ResolveOutputPath()).
         Output:
         * IntendedOutputPath: string that has been converted using this object's state.
         """
-        # Return key subscriber attribute if storing an observer object:
-        temp = (self.__OutputPath.value if hasattr(self.__OutputPath, 'value') else self.__OutputPath)
-        # Incorporate this object's state into the signature, and handle presence of duplicates:
-        temp = FileType.ConvertSignature(temp, ValueDate = self.ValueDate, RunTime = self.RunTime, PlotName = self.PlotTitle)
-        temp = FileType.HandleDuplicates(temp)
-
-        return temp
+        if self.__ResolvedOutputPath is None:
+            return self.ResolveOutputPath()
+        return self.__ResolvedOutputPath
     @property
     def MerlinCurvesPath(self):
         """
@@ -340,6 +547,14 @@ class ForwardRatePlot(FileType, Plot):
         """
         return self.__PlotTitle
     @property
+    def RenderCache(self):
+        """
+        * Return cache of previously rendered images used by this plot.
+        Output:
+        * RenderCache: RenderCache object, or None if images are always rendered.
+        """
+        return self.__RenderCache
+    @property
     def RunTime(self):
         """
         * Return indicator for batch time for all merlin curves on this graph.
@@ -348,6 +563,14 @@ class ForwardRatePlot(FileType, Plot):
         """
         return self.__RunTime
     @property
+    def Series(self):
+        """
+        * Return the forward rate series plotted on this graph.
+        Output:
+        * Series: List of (curveTitle, color, isTMinusOne, dates, rates) tuples, or None if not generated.
+        """
+        return self.__Series
+    @property
     def TMinusOne(self):
         """
         * Return the T-1 date.
@@ -379,6 +602,22 @@ class ForwardRatePlot(FileType, Plot):
                 self.__CurveConfigs = None
         except Exception as err:
             self.__CurveConfigs = None
+    @CurveStore.setter
+    def CurveStore(self, value):
+        """
+        * Set the store of parsed Merlin Curves, and register the forward rate period of each curve on this plot.
+        Input:
+        * value: CurveStore object shared by all plots in run, or None to use a private store.
+        """
+        if value is None:
+            value = CurveStore()
+        elif not isinstance(value, CurveStore):
+            raise ValueError('CurveStore must be a CurveStore object or None.')
+        self.__CurveStore = value
+        # Register the forward rate period used by each curve, so that store can calculate all periods for a curve at once:
+        if self.CurveConfigs:
+            for curve in self.CurveConfigs.keys():
+                self.__CurveStore.RegisterTenors(curve, [self.CurveConfigs[curve].FwdRateConv])
     @FinalOutputPath.setter
     def FinalOutputPath(self, value):
         """
@@ -390,6 +629,17 @@ class ForwardRatePlot(FileType, Plot):
             self.__FinalOutputPath = value
         else:
             raise ValueError('FinalOutputPath must be a string.')
+    @ImageBytes.setter
+    def ImageBytes(self, value):
+        """
+        * Set the encoded PNG image.
+        Input:
+        * value: string of PNG bytes, or None.
+        """
+        if value is None or isinstance(value, bytes):
+            self.__ImageBytes = value
+        else:
+            raise ValueError('ImageBytes must be a string of bytes or None.')
     @IntendedOutputPath.setter
     def IntendedOutputPath(self, value):
         """
@@ -400,6 +650,8 @@ class ForwardRatePlot(FileType, Plot):
         # Path subscriber objects have "value" as the main attribute:
         if isinstance(value, str) or hasattr(value, 'value'):
             self.__OutputPath = value
+            # Path will be resolved again on next access:
+            self.__ResolvedOutputPath = None
         else:
             raise ValueError('IntendedOutputPath must be string or Path subscriber object.')
     @MerlinCurvesPath.setter
@@ -425,6 +677,17 @@ class ForwardRatePlot(FileType, Plot):
             self.__PlotTitle = value
         else:
             raise ValueError('PlotTitle must be a string.')
+    @RenderCache.setter
+    def RenderCache(self, value):
+        """
+        * Set the cache of previously rendered images.
+        Input:
+        * value: RenderCache object, or None to always render.
+        """
+        if value is None or isinstance(value, RenderCache):
+            self.__RenderCache = value
+        else:
+            raise ValueError('RenderCache must be a RenderCache object or None.')
     @RunTime.setter
     def RunTime(self, value):
         """
@@ -436,6 +699,17 @@ class ForwardRatePlot(FileType, Plot):
             self.__RunTime = value
         else:
             raise ValueError('RunTime must be a string and one of {AM, PM, CAPULA}.')
+    @Series.setter
+    def Series(self, value):
+        """
+        * Set the forward rate series plotted on this graph.
+        Input:
+        * value: List of (curveTitle, color, isTMinusOne, dates, rates) tuples, or None.
+        """
+        if value is None or isinstance(value, list):
+            self.__Series = value
+        else:
+            raise ValueError('Series must be a list or None.')
     @TMinusOne.setter
     def TMinusOne(self, value):
         """
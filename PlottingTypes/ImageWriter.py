@@ -0,0 +1,117 @@
+##############################################################################
+## ImageWriter.py
+##############################################################################
+## Description:
+## * Writes encoded plot images to disk on a background thread, so rendering and
+## PDF generation do not wait on slow network shares.
+
+from DirectoryTypes.DirectoryIndex import DirectoryIndex
+import sys
+import threading
+if sys.version_info[0] > 2:
+    import queue as Queue
+else:
+    import Queue
+
+__all__ = ['ImageWriter']
+
+class ImageWriter(object):
+    " Object queues encoded images and writes them to disk asynchronously, reporting failed writes when flushed. "
+    ##########################################################
+    ## Static Variables:
+    ##########################################################
+    # Maximum # of images waiting to be written before Write() blocks:
+    DefaultMaxPending = 16
+    ##########################################################
+    ## Constructors:
+    ##########################################################
+    def __init__(self, maxPending = DefaultMaxPending):
+        """
+        * Overloaded constructor.
+        Optional Inputs:
+        * maxPending: Maximum # of images waiting to be written before Write() blocks.
+        """
+        if not isinstance(maxPending, int) or maxPending < 1:
+            raise ValueError('maxPending must be a positive integer.')
+        self.__Queue = Queue.Queue(maxsize = maxPending)
+        self.__Failures = []
+        self.__Lock = threading.Lock()
+        self.__Thread = None
+
+    ##########################################################
+    ## Public Methods:
+    ##########################################################
+    def Write(self, path, data, tag = None):
+        """
+        * Queue encoded image to be written to path.
+        Inputs:
+        * path: Output path. Enclosing folder must exist.
+        * data: Encoded image bytes.
+        Optional Inputs:
+        * tag: Value returned with failure if write fails (ex: plot title).
+        """
+        with self.__Lock:
+            if self.__Thread is None:
+                self.__Thread = threading.Thread(target = self.__Run, name = 'ImageWriter')
+                self.__Thread.daemon = True
+                self.__Thread.start()
+        self.__Queue.put((path, data, tag))
+
+    def Flush(self):
+        """
+        * Wait for all queued images to be written.
+        Outputs:
+        * failures: List of (tag, path, error message) tuples for writes that failed since the last flush.
+        """
+        self.__Queue.join()
+        with self.__Lock:
+            failures = self.__Failures
+            self.__Failures = []
+        return failures
+
+    def Close(self):
+        """
+        * Write all queued images and stop the background thread. Writer can be reused afterwards.
+        Outputs:
+        * failures: List of (tag, path, error message) tuples for writes that failed since the last flush.
+        """
+        with self.__Lock:
+            thread = self.__Thread
+            self.__Thread = None
+        if thread is not None:
+            self.__Queue.put(None)
+            thread.join()
+        return self.Flush()
+
+    ##########################################################
+    ## Properties:
+    ##########################################################
+    @property
+    def Pending(self):
+        " Return approximate # of images waiting to be written. "
+        return self.__Queue.qsize()
+
+    ##########################################################
+    ## Private Helpers:
+    ##########################################################
+    def __Run(self):
+        """
+        * Write queued images until writer is closed.
+        """
+        while True:
+            item = self.__Queue.get()
+            if item is None:
+                # Writer was closed:
+                self.__Queue.task_done()
+                return
+            path, data, tag = item
+            try:
+                with open(path, 'wb') as f:
+                    f.write(data)
+                # Folder contents have changed:
+                DirectoryIndex.Invalidate(path)
+            except (IOError, OSError) as err:
+                with self.__Lock:
+                    self.__Failures.append((tag, path, str(err)))
+            finally:
+                self.__Queue.task_done()
@@ -0,0 +1,126 @@
+##############################################################################
+## MerlinCurveFile.py
+##############################################################################
+## Description:
+## * Reads Merlin generated discount factor files (tab separated
+## <Excel Serial Date>\t<Discount Factor> rows) directly into typed NumPy arrays.
+
+from DirectoryTypes.DirectoryIndex import DirectoryIndex
+from DirectoryTypes.FileType import FileType
+import Exceptions.NonFatal as NonFatals
+import numpy as np
+import sys
+
+__all__ = ['MerlinCurveFile']
+
+class MerlinCurveFile(FileType):
+    " Object parses a single Merlin discount factor curve into parallel date and discount factor arrays. "
+    ##########################################################
+    ## Static Variables:
+    ##########################################################
+    # Number of columns expected in each row (<Excel Serial Date>, <Discount Factor>):
+    __ColumnCount = 2
+    ##########################################################
+    ## Constructors:
+    ##########################################################
+    def __init__(self, path, curveName = '', cache = None):
+        """
+        * Overloaded constructor.
+        Inputs:
+        * path: Expecting a string path to the Merlin discount factor file.
+        * curveName: Expecting a string containing the name of the Merlin curve (used in error reporting).
+        Optional Inputs:
+        * cache: CurveCache object used to skip reading and parsing unchanged files.
+        """
+        if sys.version_info[0] > 2:
+            super().__init__(path, curveName)
+        else:
+            super(MerlinCurveFile, self).__init__(path, curveName)
+        self.Dates = np.array([], dtype = np.int32)
+        self.DiscountFactors = np.array([], dtype = np.float64)
+        self.Cache = cache
+
+    ##########################################################
+    ## Public Methods:
+    ##########################################################
+    def GetContents(self):
+        """
+        * Read and parse the discount factor file at stored path.
+        """
+        if not DirectoryIndex.Exists(self.Path):
+            raise NonFatals.MerlinCurvesMissing(callingFunc = 'MerlinCurveFile::GetContents()', missingCurve = self.Name)
+        # Use previously parsed arrays if file has not changed:
+        cached = (self.Cache.Get(self.Path) if self.Cache is not None else None)
+        if cached is not None:
+            self.Dates, self.DiscountFactors = cached
+            return
+        try:
+            # Pull in the entire file in a single read:
+            with open(self.Path, 'rb') as f:
+                contents = f.read()
+            self.Dates, self.DiscountFactors = MerlinCurveFile.Parse(contents)
+        except (IOError, ValueError) as err:
+            raise NonFatals.MerlinCurvesMalformed(callingFunc = 'MerlinCurveFile::GetContents()', malformedCurve = self.Name, specific = '%s (%s)' % (str(err), self.Path))
+        if self.Cache is not None:
+            self.Cache.Put(self.Path, self.Dates, self.DiscountFactors)
+
+    @classmethod
+    def Parse(self, contents):
+        """
+        * Parse the contents of a Merlin discount factor file.
+        Inputs:
+        * contents: String containing all rows of the file.
+        Outputs:
+        * (dates, discountFactors): int32 array of Excel serial dates, float64 array of discount factors.
+        Raises ValueError describing the first malformed row if file could not be parsed.
+        """
+        stripped = contents.strip()
+        if not stripped:
+            raise ValueError('File contains no discount factors.')
+        # Parse all values using NumPy's bulk parser, and validate the expected shape (one tab per row, ascending dates):
+        rowCount = stripped.count('\n') + 1
+        values = np.fromstring(stripped, dtype = np.float64, sep = ' ')
+        if len(values) == rowCount * MerlinCurveFile.__ColumnCount and stripped.count('\t') == rowCount:
+            values = values.reshape(rowCount, MerlinCurveFile.__ColumnCount)
+            serials = values[:, 0]
+            factors = values[:, 1]
+            if (serials == np.floor(serials)).all() and (np.diff(serials) > 0).all() and np.isfinite(factors).all():
+                return (serials.astype(np.int32), factors)
+        # Locate and report the malformed row if the bulk parse failed:
+        return self.__ParseRows(stripped)
+
+    ##########################################################
+    ## Private Helpers:
+    ##########################################################
+    @classmethod
+    def __ParseRows(self, contents):
+        """
+        * Parse contents row by row, raising ValueError at the first malformed row.
+        """
+        serials = []
+        factors = []
+        rowNum = 0
+        for row in contents.splitlines():
+            rowNum += 1
+            columns = row.split()
+            # Skip blank rows:
+            if not columns:
+                continue
+            if len(columns) != MerlinCurveFile.__ColumnCount:
+                raise ValueError('Row %d: expected %d tab separated columns, found %d ("%s").' % (rowNum, MerlinCurveFile.__ColumnCount, len(columns), row.strip()))
+            try:
+                serial = float(columns[0])
+            except ValueError:
+                serial = None
+            if serial is None or serial != np.floor(serial):
+                raise ValueError('Row %d: date "%s" is not an Excel serial date.' % (rowNum, columns[0]))
+            try:
+                factor = float(columns[1])
+            except ValueError:
+                raise ValueError('Row %d: discount factor "%s" is not numeric.' % (rowNum, columns[1]))
+            if not np.isfinite(factor):
+                raise ValueError('Row %d: discount factor "%s" is not finite.' % (rowNum, columns[1]))
+            serials.append(serial)
+            factors.append(factor)
+
+        return (np.array(serials, dtype = np.int32), np.array(factors, dtype = np.float64))
@@ -13,22 +13,35 @@ from ConfigurationTypes.CommandLineArgs import CommandLineArgs
 from ConfigurationTypes.ConfigurationContainer import ConfigurationContainer
 from ConfigurationTypes.PlottingConfigFile import PlottingConfigFile, CurveConfig
 from Exceptions.ExceptionAggregator import ExceptionAggregator
+from DirectoryTypes.CurveCache import CurveCache
+from DirectoryTypes.DirectoryIndex import DirectoryIndex
+from DirectoryTypes.DuplicateResolver import DuplicateResolver
 from DirectoryTypes.FilesAndFoldersContainer import FilesAndFoldersContainer
 from DirectoryTypes.FileContainer import FileContainer
 from DirectoryTypes.FileType import FileType
 from DirectoryTypes.FolderContainer import FolderContainer
+from DirectoryTypes.RenderCache import RenderCache
 from DirectoryTypes.Observer import Observer
+from PlottingTypes.CurvePrefetcher import CurvePrefetcher
+from PlottingTypes.CurveScreener import CurveScreener
+from PlottingTypes.CurveStore import CurveStore
 from PlottingTypes.ForwardRatePlot import ForwardRatePlot
+from PlottingTypes.ImageWriter import ImageWriter
+import PlottingTypes.RenderWorker as RenderWorker
+from PlottingTypes.VectorPDFRenderer import VectorPDFRenderer
 from random import randint
-from multiprocessing import pool
+from io import BytesIO
+import multiprocessing
 import reportlab.lib.pagesizes as sizes
 from reportlab.pdfgen import canvas
+from reportlab.lib.utils import ImageReader
 from reportlab.platypus import Image, SimpleDocTemplate
 import os
 from shutil import copy2
 import win32com.client as win32
 import threading
-import time
+from Misc.StageProfiler import StageProfiler
+from Misc.StageTimer import StageTimer
 import Misc.Utilities as util
 import sys
 
@@ -69,6 +82,12 @@ class MerlinPlotter(FileType):
         self.__finalPDFSignature = ''
         # Store actually generated PDF:
         self.__completedPDF = ''
+        # Store of parsed Merlin curves shared by all plots, backed by local cache (bypassed if --nocache was specified):
+        self.__CurveStore = CurveStore(CurveCache(enabled = not self.CommandArgs.NoCacheMode))
+        # Writes generated PNG images to disk in the background, while images are passed to PDF in memory:
+        self.__ImageWriter = ImageWriter()
+        # Local cache of rendered images, so that plots whose inputs have not changed since a previous run are not rendered again:
+        self.__RenderCache = RenderCache(enabled = not self.CommandArgs.NoCacheMode)
 
     def __exit__(self, exc_type, exc_value, traceback):
         """
@@ -83,18 +102,36 @@ class MerlinPlotter(FileType):
         """
         * Execute all key functions. Steps will be skipped if prohibited by command line inputs (see CommandLineArgs).
         """
+        # Remove all locally cached Merlin curves and rendered images if requested:
+        if self.CommandArgs.ClearCacheMode:
+            self.__CurveStore.Cache.Clear()
+            self.__RenderCache.Clear()
         if self.CommandArgs.TestImagePath:
             # Generate test image and skip all other steps:
             self.GenerateTestPNG()
         else:
-            # Load all plots from the configuration file:
-            self.LoadAllPlots()
-            # Generate all plot images
-            self.GenerateAllPlotImages()
-            # Output PDF to stored path:
-            self.GeneratePDF()
+            try:
+                # Load all plots from the configuration file:
+                with StageTimer.Time(StageTimer.LoadPlots), StageProfiler.Profile(StageTimer.LoadPlots):
+                    self.LoadAllPlots()
+                # Screen all curves and remove plots that do not need rendering if requested:
+                with StageTimer.Time(StageTimer.Screening), StageProfiler.Profile(StageTimer.Screening):
+                    self.ScreenAllPlots()
+                # Generate all plot images (curve reads, forward rates, rendering and export are timed per plot):
+                with StageProfiler.Profile(StageTimer.Render):
+                    self.GenerateAllPlotImages()
+                # Output PDF to stored path:
+                with StageTimer.Time(StageTimer.PDF), StageProfiler.Profile(StageTimer.PDF):
+                    self.GeneratePDF()
+            finally:
+                # Ensure all PNG images have been written to disk before emailing or exiting:
+                with StageTimer.Time(StageTimer.ImageWrites), StageProfiler.Profile(StageTimer.ImageWrites):
+                    self.FlushImageWrites()
             # Generate email with plots if not prohibited:
-            self.GenerateEmailWithPlots()
+            with StageTimer.Time(StageTimer.Email), StageProfiler.Profile(StageTimer.Email):
+                self.GenerateEmailWithPlots()
+        # Print time spent in each stage, and output timing report and profiles if requested:
+        self.OutputTimings()
         # Raise the stored ExceptionAggregator if any issues occurred:
         if self.AllErrors.HasErrors:
             raise self.AllErrors
@@ -127,34 +164,94 @@ class MerlinPlotter(FileType):
         plotConfigs = self.AllConfigs.PlotConfigs.ConfiguredPlots        
 
         ########################
-        # Generate all plot objects that will be generated in GenerateAllPlotImages():
+        # Generate all plot objects that will be generated in GenerateAllPlotImages(), only initializing plots that are required 
+        # for current application runtime (in configuration file order):
         ########################
-        for plotName in plotConfigs.keys():
-            firstCurve = list(plotConfigs[plotName].keys())[0]
-            # Only initialize plots that are required for current application runtime:
-            if plotConfigs[plotName][firstCurve].RunTime == RunTime:
-                # If TPath and TMinusOnePath were set on command line then will override the Merlin Curves path when plot is generated: 
-                self.__AllPlots[plotName] = ForwardRatePlot(plotConfigs[plotName], inputPath, outputPath, plotName, ValueDate, TMinusOne, TPath = self.CommandArgs.TPath, TMinusOnePath = self.CommandArgs.TMinusOnePath)
+        for plotName in self.AllConfigs.PlotConfigs.GetPlotsForRunTime(RunTime):
+            # If TPath and TMinusOnePath were set on command line then will override the Merlin Curves path when plot is generated: 
+            self.__AllPlots[plotName] = ForwardRatePlot(plotConfigs[plotName], inputPath, outputPath, plotName, ValueDate, TMinusOne, TPath = self.CommandArgs.TPath, TMinusOnePath = self.CommandArgs.TMinusOnePath, CurveStore = self.__CurveStore, ImageWriter = self.__ImageWriter, RenderCache = self.__RenderCache)
+            # Resolve and reserve output path once, so that duplicate names are stable (each output folder is listed once, see DuplicateResolver):
+            self.__AllPlots[plotName].ResolveOutputPath()
         
         self.PrintStep("Done", True)
 
+    def ScreenAllPlots(self):
+        """
+        * Screen all curves on loaded plots for anomalies without rendering, and output ranked report next to the PDF. 
+        Plots will then be skipped unless --screenrender was specified, in which case only plots containing flagged curves will be rendered.
+        Note: this method will be skipped unless --screen or --screenrender was specified on command line.
+        """
+        # Skip step if not requested on command line:
+        if not self.CommandArgs.ScreenMode or self.CommandArgs.PNGInputPath:
+            return
+
+        self.PrintStep("Screening all curves", False)
+        screener = CurveScreener(self.__CurveStore)
+        # Override the default thresholds if provided on command line:
+        for threshold in ('MaxShift', 'MaxJump', 'MinRate'):
+            if getattr(self.CommandArgs, threshold) is not None:
+                setattr(screener, threshold, getattr(self.CommandArgs, threshold))
+        screener.Screen(self.__AllPlots)
+
+        ########################
+        # Output the ranked report to the PDF output folder:
+        ########################
+        reportPath = FileType.ConvertSignature(self.AllConfigs.Filepaths.PDFOutputLocation, ValueDate = self.CommandArgs.ValueDate, RunTime = self.CommandArgs.RunTime)
+        reportPath = self.ExtractFolderName(reportPath) + FileType.ConvertSignature('{MM}{DD}{YY} {RunTime} Merlin Screening Report.csv', ValueDate = self.CommandArgs.ValueDate, RunTime = self.CommandArgs.RunTime)
+        reportPath = FileType.HandleDuplicates(reportPath)
+        try:
+            screener.WriteReport(reportPath)
+            # Folder contents have changed:
+            DirectoryIndex.Invalidate(reportPath)
+        except (IOError, OSError) as err:
+            self.AllErrors.Add(NonFatals.FailedToGenerateReport(reportPath, 'MerlinPlotter::ScreenAllPlots()', specific = str(err)))
+            reportPath = ''
+
+        flaggedCurves = screener.FlaggedCurves
+        if len(flaggedCurves) > 0:
+            self.AllErrors.Add(NonFatals.CurvesFailedScreening('MerlinPlotter::ScreenAllPlots()', specific = reportPath, targetList = flaggedCurves))
+
+        ########################
+        # Remove plots that do not need to be rendered:
+        ########################
+        flaggedPlots = (screener.FlaggedPlots if self.CommandArgs.ScreenRenderMode else set())
+        for plotName in list(self.__AllPlots.keys()):
+            if self.__AllPlots[plotName].PlotTitle not in flaggedPlots:
+                # Free the reserved output path, since plot will not be rendered:
+                DuplicateResolver.Release(self.__AllPlots[plotName].IntendedOutputPath)
+                del self.__AllPlots[plotName]
+
+        print('Screened %d curves, %d failed screening (%d plots will be rendered).' % (len(screener.Results), len(flaggedCurves), len(self.__AllPlots)))
+        self.PrintStep("Done", True)
+
     def GenerateAllPlotImages(self):
         """
-        * Generate all plot PNG images using stored ForwardRatePlots() synchronously.
+        * Generate all plot PNG images using stored ForwardRatePlots() synchronously, or in worker processes if --workers N (N > 1) was specified.
+        If --vectorpdf was specified and no email will be generated, only the forward rates are calculated (plots are drawn directly into the PDF).
         Note: this method will be skipped if --pnginput <Path> was specified on command line.
         """
         # Skip step if prohibited by command line:
         if self.CommandArgs.PNGInputPath:
             return
+        # PNGs are only required by the email if plots will be drawn into the PDF as vector graphics:
+        seriesOnly = self.CommandArgs.VectorPDFMode and not self.CommandArgs.NoPDFMode and self.CommandArgs.NoEmailMode
+        # Render in worker processes if requested on command line:
+        if not seriesOnly and self.CommandArgs.Workers > 1 and len(self.__AllPlots) > 1:
+            self.GenerateAllPlotImages_Async_Processes()
+            return
 
-        self.PrintStep("Generating all plot images", False)
+        self.PrintStep("Calculating all plot forward rates" if seriesOnly else "Generating all plot images", False)
         
         ########################
-        # Generate all plot images:
+        # Generate all plot images, reading curves for upcoming plots on background threads unless --prefetch 0 was specified:
         ########################
-        for plotName in self.__AllPlots.keys():
+        plotNames = (CurvePrefetcher(self.__AllPlots, self.CommandArgs.PrefetchDepth) if self.CommandArgs.PrefetchDepth > 0 else self.__AllPlots.keys())
+        for plotName in plotNames:
             try:
-                self.__AllPlots[plotName].GenerateImage()
+                if seriesOnly:
+                    self.__AllPlots[plotName].GenerateSeries()
+                else:
+                    self.__AllPlots[plotName].GenerateImage()
             except Fatals.Fatal as fatal:
                 # Pass fatal exception immediately to main method:
                 self.PrintStep("Failed to generate PNGs.", True)
@@ -162,9 +259,43 @@ class MerlinPlotter(FileType):
             except NonFatals.NonFatal as nonfatal:
                 # Add non-fatal exception to aggregator:
                 self.AllErrors.Add(nonfatal)
-      
+        
+        print('Read %d Merlin curves (%d reused across plots).' % (self.__CurveStore.Misses, self.__CurveStore.Hits))
+        if not seriesOnly:
+            print('Reused %d unchanged plot images from previous runs.' % self.__RenderCache.Hits)
         self.PrintStep("Done", True)
 
+    def FlushImageWrites(self):
+        """
+        * Wait for all PNG images queued by plots to be written to disk and stop the background writer. Plots whose images could not be written 
+        will not be attached to the email.
+        """
+        failures = self.__ImageWriter.Close()
+        titleToPlot = dict((self.__AllPlots[plotName].PlotTitle, self.__AllPlots[plotName]) for plotName in self.__AllPlots.keys())
+        for plotTitle, path, errorMessage in failures:
+            if plotTitle in titleToPlot:
+                titleToPlot[plotTitle].FinalOutputPath = ''
+            self.AllErrors.Add(NonFatals.FailedToGeneratePNGS(callingFunc = 'MerlinPlotter::FlushImageWrites()', plotTitle = plotTitle, specific = errorMessage))
+
+    def OutputTimings(self):
+        """
+        * Print time spent in each stage and the slowest plots, and output JSON report if --timings <Path> was specified.
+        Profile files that could not be written (--profile) are added to the log.
+        """
+        print(StageTimer.Summary())
+        if StageProfiler.Enabled():
+            print('Stage profiles were output to\n%s' % StageProfiler.Folder())
+            for profilePath, errorMessage in StageProfiler.Failures():
+                self.AllErrors.Add(NonFatals.FailedToGenerateReport(profilePath, 'MerlinPlotter::OutputTimings()', specific = errorMessage))
+        if not self.CommandArgs.TimingsPath:
+            return
+        timingsPath = FileType.ConvertSignature(self.CommandArgs.TimingsPath, ValueDate = self.CommandArgs.ValueDate, RunTime = self.CommandArgs.RunTime)
+        try:
+            self.CreateFolderIfDoesNotExist(self.ExtractFolderName(timingsPath))
+            StageTimer.WriteReport(timingsPath)
+        except (IOError, OSError) as err:
+            self.AllErrors.Add(NonFatals.FailedToGenerateReport(timingsPath, 'MerlinPlotter::OutputTimings()', specific = str(err)))
+
     def GeneratePDF(self):
         """
         * Output all generated PNG plots to single PDF.
@@ -179,16 +310,27 @@ class MerlinPlotter(FileType):
         #####################
         # Use overwrite PNG folder if provided and exists:
         #####################
-        if self.CommandArgs.PNGInputPath and FileType.CheckPath(self.CommandArgs.PNGInputPath):
-            finalPNGs = ['%s%s' % (self.CommandArgs.PNGInputPath, fileName) for fileName in os.listdir(self.CommandArgs.PNGInputPath) if 'MerlinCurveGraph' in fileName and '.png' in fileName]
+        if self.CommandArgs.PNGInputPath and DirectoryIndex.Exists(self.CommandArgs.PNGInputPath):
+            finalPNGS = ['%s%s' % (self.CommandArgs.PNGInputPath, fileName) for fileName in DirectoryIndex.Names(self.CommandArgs.PNGInputPath) if 'MerlinCurveGraph' in fileName and '.png' in fileName]
         else:
             # Arrange the paths in the order that the corresponding plots appear in the plotting configuration file:                  
-            plotsInOrder = self.AllConfigs.PlotConfigs.PlotsInOrder
-            for name in plotsInOrder:
-                for plot in self.__AllPlots.keys():
-                    if name == self.__AllPlots[plot].PlotTitle and self.__AllPlots[plot].FinalOutputPath:
-                        finalPNGS.append(FileType.ConvertPathToISIS(self.__AllPlots[plot].FinalOutputPath))
-                        break    
+            for plot in self.PlotsInOrder():
+                if self.CommandArgs.VectorPDFMode and plot.Series is None and plot.FinalOutputPath:
+                    # Calculate forward rates for plots whose images were reused from previous runs or rendered by worker processes:
+                    try:
+                        plot.GenerateSeries()
+                    except NonFatals.NonFatal:
+                        # Issues were already logged when the image was generated. Series are drawn if any curve was plotted, otherwise the image is used:
+                        pass
+                if self.CommandArgs.VectorPDFMode and plot.Series:
+                    # Plot will be drawn directly into PDF:
+                    finalPNGS.append(plot)
+                elif plot.FinalOutputPath:
+                    # Use image generated in memory if available, rather than reading image back from disk:
+                    if plot.ImageBytes:
+                        finalPNGS.append(ImageReader(BytesIO(plot.ImageBytes)))
+                    else:
+                        finalPNGS.append(FileType.ConvertPathToISIS(plot.FinalOutputPath))
         
         # Skip if no PNGS were generated or could not be found in provided location:
         if len(finalPNGS) == 0:
@@ -240,7 +382,10 @@ class MerlinPlotter(FileType):
                 elif plotCount == 3:
                     # Place final chart on bottom right:
                     x += plotWidth + xBorder
-                pdf.drawImage(pngPath, x, y, plotWidth, plotHeight)
+                if isinstance(pngPath, ForwardRatePlot):
+                    VectorPDFRenderer.DrawPlot(pdf, pngPath.PlotTitle, pngPath.Series, x, y, plotWidth, plotHeight)
+                else:
+                    pdf.drawImage(pngPath, x, y, plotWidth, plotHeight)
                 plotCount += 1
                 plotCount %= 4
                 # Add new page if added 4 plots:
@@ -248,6 +393,8 @@ class MerlinPlotter(FileType):
                     pdf.showPage()
             pdf.save()
             self.__completedPDF = pdfOutputPath
+            # Folder contents have changed:
+            DirectoryIndex.Invalidate(pdfOutputPath)
 
             self.PrintStep("Done", True)
 
@@ -272,9 +419,9 @@ class MerlinPlotter(FileType):
         ########################
         # Use PNGS located in passed overwrite folder if provided at command line:
         ########################
-        if self.CommandArgs.PNGInputPath and FileType.CheckPath(self.CommandArgs.PNGInputPath):
-            # Use pngs located in overwrite folder:
-            pngFolder = os.listdir(self.CommandArgs.PNGInputPath)
+        if self.CommandArgs.PNGInputPath and DirectoryIndex.Exists(self.CommandArgs.PNGInputPath):
+            # Use pngs located in overwrite folder (listed once for the PDF and email):
+            pngFolder = DirectoryIndex.Names(self.CommandArgs.PNGInputPath)
             # Filter out non-png files:
             pngs = [fileName for fileName in pngFolder if '.png' in fileName]
             # Use full paths 
@@ -282,13 +429,7 @@ class MerlinPlotter(FileType):
         else:
             # Use pngs generated this session.
             # Arrange the paths in the order they appear in the plotting configuration file:
-            plotsInOrder = self.AllConfigs.PlotConfigs.PlotsInOrder
-            fullPaths = []
-            for name in plotsInOrder:
-                for plot in self.__AllPlots.keys():
-                    if name == self.__AllPlots[plot].PlotTitle and self.__AllPlots[plot].FinalOutputPath:
-                        fullPaths.append(FileType.ConvertPathToISIS(self.__AllPlots[plot].FinalOutputPath))
-                        break      
+            fullPaths = [FileType.ConvertPathToISIS(plot.FinalOutputPath) for plot in self.PlotsInOrder() if plot.FinalOutputPath]
         
         # Exit if no plots were created or available:
         if len(fullPaths) == 0:
@@ -308,7 +449,7 @@ class MerlinPlotter(FileType):
         
         # Generate html string to link the output PDF if generated during this session:
         pdfLink = ''
-        if not self.CommandArgs.NoPDFMode and self.CheckPath(self.__completedPDF):
+        if not self.CommandArgs.NoPDFMode and self.__completedPDF and DirectoryIndex.Exists(self.__completedPDF):
             pdfLink = "<a href='%s'>Link to PDF</a>" % (self.__completedPDF) 
             
         htmlString = '<html><body>%s<p>%s</p>%s</body></html>' % (pdfLink, textBody, htmlImages)
@@ -407,6 +548,14 @@ class MerlinPlotter(FileType):
     ##########################################################
     ## Auxilliary Functions:
     ##########################################################
+    def PlotsInOrder(self):
+        """
+        * Return all loaded plots in the order they appear in the plotting configuration file (plots that are not configured appear last).
+        """
+        plotConfigs = self.AllConfigs.PlotConfigs
+        position = lambda plot: plotConfigs.GetPlotPosition(plot.PlotTitle)
+        return sorted(self.__AllPlots.values(), key = lambda plot: (position(plot) is None, position(plot)))
+
     def GenerateTestPNG(self):
         """
         * Generate single graph using 4 curves with fixed configurations.
@@ -423,7 +572,7 @@ class MerlinPlotter(FileType):
         configRows['GMOAUD-3-1500NY'].FwdRateConv = 90
         configRows['GMOAUD-0-1500NY'].FwdRateConv = 1
     
-        testGraph = ForwardRatePlot(configRows, inputLoc, self.CommandArgs.TestImagePath, 'AUD - GMO', self.CommandArgs.ValueDate, self.CommandArgs.TMinusOne)
+        testGraph = ForwardRatePlot(configRows, inputLoc, self.CommandArgs.TestImagePath, 'AUD - GMO', self.CommandArgs.ValueDate, self.CommandArgs.TMinusOne, CurveStore = self.__CurveStore)
         ########################
         # Attempt to output test image to path set at command line:
         ########################        
@@ -461,7 +610,6 @@ class MerlinPlotter(FileType):
         """
         if not isinstance(step, str) or not isinstance(end, bool):
             raise ValueError('step must be string, end must be boolean.')
-        time.sleep(1)
         step = (step + '\n**********************************' if end else '**********************************\n' + step)
         print(step)
         
@@ -484,32 +632,48 @@ class MerlinPlotter(FileType):
         for plotName in threads.keys():
             threads[plotName].join()
 
-    def GenerateAllPlotImages_Async_Processes(self): 
+    def GenerateAllPlotImages_Async_Processes(self):
         """
-        * Generate all plot PNG images using stored ForwardRatePlots() asynchronously.
-        Note that if PNG folder was specified on command line then this will be skipped.
+        * Generate all plot PNG images using stored ForwardRatePlots() in a pool of worker processes (--workers N).
+        Each worker starts a single offscreen Qt application, renders its share of the plots and returns each plot's 
+        output path, encoded image and issues, which are added to this object's ExceptionAggregator.
+        Note: this method will be skipped if --pnginput <Path> was specified on command line.
         """
         # Skip this step if folder containing PNGS was provided:
         if self.CommandArgs.PNGInputPath:
             return        
 
-        processes = {}
-        # Put each plot object into own process:
-        for plotName in self.__AllPlots.keys():
-            plot = self.__AllPlots[plotName]
-            processes[plotName] = pool.Process(target=plot.GenerateImage)
-        
-        # Start all processes:
-        for process in processes.values():
-            process.start()
-        
-        # Join all after starting:
-        for process in process.values():
-            process.join()
-
-        # Check each thread for errors:
-        for plot in processes.keys():
-            if self.__AllPlots[plot].ErrorMessage != '':
-                errorMessage += self.__AllPlots[plot].ErrorMessage
-        
-        return '' 
\ No newline at end of file
+        workers = max(min(self.CommandArgs.Workers, len(self.__AllPlots)), 1)
+        self.PrintStep("Generating all plot images using %d worker processes" % workers, False)
+
+        ########################
+        # Render plots in worker processes, handing out small batches so that workers stay evenly loaded:
+        ########################
+        tasks = [(plotName, self.__AllPlots[plotName]) for plotName in self.__AllPlots.keys()]
+        chunkSize = max(len(tasks) // (workers * 4), 1)
+        workerPool = multiprocessing.Pool(workers, RenderWorker.Initialize, (self.CommandArgs.NoCacheMode,))
+        try:
+            results = workerPool.map(RenderWorker.Render, tasks, chunkSize)
+        finally:
+            workerPool.close()
+            workerPool.join()
+
+        ########################
+        # Collect output paths and issues from each plot:
+        ########################
+        fatal = None
+        for plotName, finalOutputPath, imageBytes, error, timings in results:
+            StageTimer.Merge(timings)
+            self.__AllPlots[plotName].FinalOutputPath = finalOutputPath
+            self.__AllPlots[plotName].ImageBytes = imageBytes
+            if isinstance(error, Fatals.Fatal):
+                fatal = (fatal if fatal is not None else error)
+            elif error is not None:
+                self.AllErrors.Add(error)
+
+        if fatal is not None:
+            # Pass fatal exception to main method:
+            self.PrintStep("Failed to generate PNGs.", True)
+            raise fatal
+
+        self.PrintStep("Done", True)
@@ -5,7 +5,7 @@
 ## * Abstract base class for plotting objects.
 
 from abc import ABCMeta, abstractmethod
-import datetime
+from Misc.ExcelDates import ExcelDates
 
 __all__ = ['Plot']
 
@@ -16,7 +16,4 @@ class Plot(object):
     @classmethod
     def ExcelSerialToDatetime(self, xldate):
         """ Convert Excel serial date to a datetime object. """
-        temp = datetime.datetime(1900, 1, 1)
-        delta = datetime.timedelta(days=int(xldate))
-    
-        return temp+delta
+        return ExcelDates.ToDatetime(int(xldate))
@@ -0,0 +1,94 @@
+##############################################################################
+## PlotWidgetPool.py
+##############################################################################
+## Description:
+## * Pool of reusable pyqtgraph plot widgets, so that axes, fonts and legend styling
+## are constructed once per run instead of once per plot.
+
+__all__ = ['PlotWidgetPool']
+
+class PlotWidgetPool(object):
+    " Object hands out cleared plot widgets and takes them back once each plot has been exported. "
+    ##########################################################
+    ## Static Variables:
+    ##########################################################
+    DefaultMaxIdle = 4
+    ##########################################################
+    ## Constructors:
+    ##########################################################
+    def __init__(self, factory, maxIdle = DefaultMaxIdle):
+        """
+        * Overloaded constructor.
+        Inputs:
+        * factory: Callable returning a new pg.PlotWidget with configured axes.
+        Optional Inputs:
+        * maxIdle: Maximum # of released widgets kept for reuse. Additional widgets are destroyed when released.
+        """
+        if not callable(factory):
+            raise ValueError('factory must be callable.')
+        if not isinstance(maxIdle, int) or maxIdle < 1:
+            raise ValueError('maxIdle must be a positive integer.')
+        self.__Factory = factory
+        self.__MaxIdle = maxIdle
+        self.__Idle = []
+        self.__Created = 0
+        self.__Reused = 0
+
+    ##########################################################
+    ## Public Methods:
+    ##########################################################
+    def Acquire(self):
+        """
+        * Return an empty plot widget, reusing a released widget if available.
+        """
+        if len(self.__Idle) > 0:
+            self.__Reused += 1
+            return self.__Idle.pop()
+        self.__Created += 1
+        return self.__Factory()
+
+    def Release(self, widget):
+        """
+        * Clear all curves and the legend from the widget and return it to the pool.
+        Inputs:
+        * widget: pg.PlotWidget previously returned by Acquire().
+        """
+        if widget is None or widget in self.__Idle:
+            return
+        PlotWidgetPool.Reset(widget)
+        if len(self.__Idle) < self.__MaxIdle:
+            self.__Idle.append(widget)
+        else:
+            widget.close()
+            widget.deleteLater()
+
+    @classmethod
+    def Reset(self, widget):
+        """
+        * Remove all plotted items and legend from widget, keeping axes and styling.
+        """
+        plotItem = widget.plotItem
+        plotItem.clear()
+        # Detach the legend so next plot starts with an empty legend:
+        legend = getattr(plotItem, 'legend', None)
+        if legend is not None:
+            if legend.scene() is not None:
+                legend.scene().removeItem(legend)
+            plotItem.legend = None
+        plotItem.enableAutoRange()
+
+    ##########################################################
+    ## Properties:
+    ##########################################################
+    @property
+    def Created(self):
+        " Return # of widgets constructed by the pool. "
+        return self.__Created
+    @property
+    def Idle(self):
+        " Return # of widgets available for reuse. "
+        return len(self.__Idle)
+    @property
+    def Reused(self):
+        " Return # of requests served by a previously released widget. "
+        return self.__Reused
@@ -0,0 +1,58 @@
+##############################################################################
+## RenderWorker.py
+##############################################################################
+## Description:
+## * Functions run inside worker processes when plots are rendered in parallel
+## (see MerlinPlotter.GenerateAllPlotImages_Async_Processes()). Functions are
+## module level so that they can be pickled by multiprocessing.
+
+from DirectoryTypes.CurveCache import CurveCache
+from DirectoryTypes.RenderCache import RenderCache
+import Exceptions.Fatal as Fatals
+import Exceptions.NonFatal as NonFatals
+from PlottingTypes.CurveStore import CurveStore
+from PlottingTypes.ForwardRatePlot import ForwardRatePlot
+from Misc.StageTimer import StageTimer
+import os
+
+__all__ = ['Initialize', 'Render']
+
+# Store of parsed Merlin Curves shared by all plots rendered in this worker process:
+_WorkerStore = None
+# Cache of previously rendered images used by this worker process:
+_WorkerRenderCache = None
+
+def Initialize(noCache = False):
+    """
+    * Prepare worker process for rendering: start a single offscreen Qt application, curve store and render cache that are
+    reused for every plot rendered by this worker.
+    Inputs:
+    * noCache: Set to True to bypass the local caches of parsed Merlin Curves and rendered images (--nocache).
+    """
+    global _WorkerStore, _WorkerRenderCache
+    # Render without a display (only used by Qt versions that support platform plugins):
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    ForwardRatePlot.Application()
+    _WorkerStore = CurveStore(CurveCache(enabled = not noCache))
+    _WorkerRenderCache = RenderCache(enabled = not noCache)
+
+def Render(task):
+    """
+    * Generate single plot image in worker process.
+    Inputs:
+    * task: Tuple containing (plotName, ForwardRatePlot).
+    Outputs:
+    * (plotName, finalOutputPath, imageBytes, error, timings): imageBytes is the encoded PNG image (None if not generated), error is the Fatal or NonFatal exception raised while generating the plot, or None,
+    and timings are the StageTimer records for this plot (see StageTimer.Snapshot()).
+    """
+    plotName, plot = task
+    if _WorkerStore is not None:
+        plot.CurveStore = _WorkerStore
+    plot.RenderCache = _WorkerRenderCache
+    # Only return timings recorded while rendering this plot:
+    StageTimer.Reset()
+    try:
+        plot.GenerateImage()
+        return (plotName, plot.FinalOutputPath, plot.ImageBytes, None, StageTimer.Snapshot())
+    except (Fatals.Fatal, NonFatals.NonFatal) as err:
+        return (plotName, plot.FinalOutputPath, plot.ImageBytes, err, StageTimer.Snapshot())
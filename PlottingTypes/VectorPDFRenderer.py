@@ -0,0 +1,180 @@
+##############################################################################
+## VectorPDFRenderer.py
+##############################################################################
+## Description:
+## * Draws forward rate plots directly onto a reportlab canvas as vector paths
+## (axes, gridlines, legend and curves), so the PDF does not embed raster images.
+
+from __future__ import division
+from Misc.ExcelDates import ExcelDates
+import math
+import numpy as np
+from reportlab.lib.colors import HexColor
+
+__all__ = ['VectorPDFRenderer']
+
+class VectorPDFRenderer(object):
+    " Object draws the forward rate series of a single plot into a box on a reportlab canvas, matching the PNG plot styling. "
+    ##########################################################
+    ## Static Variables:
+    ##########################################################
+    # Fonts and sizes (points) for title, tick labels and legend:
+    TitleFont = ('Helvetica', 8)
+    TickFont = ('Times-Roman', 5)
+    LegendFont = ('Helvetica-Bold', 5)
+    TitleColor = '#030302'
+    AxisColor = '#969696'
+    GridColor = '#dcdcdc'
+    LineWidth = 0.6
+    # Dash pattern (on, off) used for T-1 curves:
+    DashPattern = (3, 2)
+    # Space (points) reserved around plot area for title and tick labels:
+    LeftMargin = 30
+    BottomMargin = 14
+    TopMargin = 14
+    RightMargin = 8
+    # Approximate # of ticks on each axis:
+    NumXTicks = 6
+    NumYTicks = 8
+    ##########################################################
+    ## Class Methods:
+    ##########################################################
+    @classmethod
+    def DrawPlot(self, pdf, plotTitle, series, x, y, width, height):
+        """
+        * Draw plot into box on PDF canvas.
+        Inputs:
+        * pdf: reportlab canvas.
+        * plotTitle: Title drawn above the plot.
+        * series: List of (curveTitle, color, isTMinusOne, dates, rates) tuples (see ForwardRatePlot.Series).
+        * x, y: Bottom left corner of box.
+        * width, height: Size of box.
+        """
+        left = x + VectorPDFRenderer.LeftMargin
+        bottom = y + VectorPDFRenderer.BottomMargin
+        plotWidth = width - VectorPDFRenderer.LeftMargin - VectorPDFRenderer.RightMargin
+        plotHeight = height - VectorPDFRenderer.BottomMargin - VectorPDFRenderer.TopMargin
+        xMin, xMax, yMin, yMax = self.__DataRange(series)
+        xTicks = [tick for tick in self.NiceTicks(xMin, xMax, VectorPDFRenderer.NumXTicks) if xMin <= tick <= xMax]
+        yTicks = [tick for tick in self.NiceTicks(yMin, yMax, VectorPDFRenderer.NumYTicks) if yMin <= tick <= yMax]
+        toX = lambda values: left + (np.asarray(values, dtype = np.float64) - xMin) * (plotWidth / (xMax - xMin))
+        toY = lambda values: bottom + (np.asarray(values, dtype = np.float64) - yMin) * (plotHeight / (yMax - yMin))
+
+        pdf.saveState()
+        ############################
+        # Title:
+        ############################
+        pdf.setFillColor(HexColor(VectorPDFRenderer.TitleColor))
+        pdf.setFont(*VectorPDFRenderer.TitleFont)
+        pdf.drawCentredString(left + plotWidth / 2, y + height - VectorPDFRenderer.TopMargin + 4, plotTitle)
+
+        ############################
+        # Gridlines, axes and tick labels:
+        ############################
+        pdf.setLineWidth(0.3)
+        pdf.setStrokeColor(HexColor(VectorPDFRenderer.GridColor))
+        for tickX in toX(xTicks):
+            pdf.line(tickX, bottom, tickX, bottom + plotHeight)
+        for tickY in toY(yTicks):
+            pdf.line(left, tickY, left + plotWidth, tickY)
+        pdf.setStrokeColor(HexColor(VectorPDFRenderer.AxisColor))
+        pdf.line(left, bottom, left + plotWidth, bottom)
+        pdf.line(left, bottom, left, bottom + plotHeight)
+        pdf.setFillColor(HexColor(VectorPDFRenderer.AxisColor))
+        pdf.setFont(*VectorPDFRenderer.TickFont)
+        for tickX, label in zip(toX(xTicks), ExcelDates.Labels(xTicks)):
+            pdf.line(tickX, bottom, tickX, bottom - 2)
+            pdf.drawCentredString(tickX, bottom - 8, label)
+        for tickY, label in zip(toY(yTicks), self.PercentLabels(yTicks)):
+            pdf.line(left, tickY, left - 2, tickY)
+            pdf.drawRightString(left - 3, tickY - 1.5, label)
+
+        ############################
+        # Curves, clipped to the plot area:
+        ############################
+        pdf.saveState()
+        clip = pdf.beginPath()
+        clip.rect(left, bottom, plotWidth, plotHeight)
+        pdf.clipPath(clip, stroke = 0, fill = 0)
+        pdf.setLineWidth(VectorPDFRenderer.LineWidth)
+        for curveTitle, color, isTMinusOne, dates, rates in series:
+            pdf.setStrokeColor(HexColor(color))
+            pdf.setDash(*(VectorPDFRenderer.DashPattern if isTMinusOne else (1, 0)))
+            self.__DrawPolyline(pdf, toX(dates), toY(rates))
+        pdf.restoreState()
+
+        ############################
+        # Legend in top left corner of plot area:
+        ############################
+        pdf.setFont(*VectorPDFRenderer.LegendFont)
+        pdf.setFillColor(HexColor('#000000'))
+        pdf.setLineWidth(VectorPDFRenderer.LineWidth)
+        legendY = bottom + plotHeight - 8
+        for curveTitle, color, isTMinusOne, dates, rates in series:
+            pdf.setStrokeColor(HexColor(color))
+            pdf.setDash(*(VectorPDFRenderer.DashPattern if isTMinusOne else (1, 0)))
+            pdf.line(left + 6, legendY + 1.5, left + 18, legendY + 1.5)
+            pdf.drawString(left + 21, legendY, curveTitle)
+            legendY -= 7
+        pdf.restoreState()
+
+    @classmethod
+    def NiceTicks(self, minVal, maxVal, count):
+        """
+        * Return evenly spaced tick values covering [minVal, maxVal], using step of 1, 2 or 5 times a power of ten.
+        """
+        span = maxVal - minVal
+        if span <= 0 or count < 1:
+            return [minVal]
+        rawStep = span / count
+        magnitude = 10 ** math.floor(math.log10(rawStep))
+        step = next(mult * magnitude for mult in (1, 2, 5, 10) if mult * magnitude >= rawStep)
+        first = math.ceil(minVal / step) * step
+        return [first + index * step for index in range(0, int((maxVal - first) / step + 1e-9) + 1)]
+
+    @classmethod
+    def PercentLabels(self, values):
+        """
+        * Format rates as percentages with 2 decimal places (1 if any 2 digit percentages appear), as done by PercentAxis.
+        """
+        decimals = (1 if len([value for value in values if value * 10 >= 1]) > 0 else 2)
+        return [('{0:.%df}%%' % decimals).format(value * 100) for value in values]
+
+    ##########################################################
+    ## Private Helpers:
+    ##########################################################
+    @classmethod
+    def __DataRange(self, series):
+        """
+        * Return (xMin, xMax, yMin, yMax) covering all finite points in series, padded vertically.
+        """
+        xs = [np.asarray(dates, dtype = np.float64) for curveTitle, color, isTMinusOne, dates, rates in series]
+        ys = [np.asarray(rates, dtype = np.float64) for curveTitle, color, isTMinusOne, dates, rates in series]
+        xs = np.concatenate(xs) if xs else np.array([0.0, 1.0])
+        ys = np.concatenate(ys) if ys else np.array([0.0, 1.0])
+        xs = xs[np.isfinite(xs)]
+        ys = ys[np.isfinite(ys)]
+        xMin, xMax = ((xs.min(), xs.max()) if len(xs) > 0 else (0.0, 1.0))
+        yMin, yMax = ((ys.min(), ys.max()) if len(ys) > 0 else (0.0, 1.0))
+        if xMax <= xMin:
+            xMax = xMin + 1
+        pad = ((yMax - yMin) * 0.05 if yMax > yMin else max(abs(yMax) * 0.05, 0.0001))
+        return (xMin, xMax, yMin - pad, yMax + pad)
+
+    @classmethod
+    def __DrawPolyline(self, pdf, xs, ys):
+        """
+        * Stroke line through points, breaking line at non-finite values.
+        """
+        path = pdf.beginPath()
+        penDown = False
+        for pointX, pointY in zip(xs.tolist(), ys.tolist()):
+            if not (math.isinf(pointY) or math.isnan(pointY)):
+                if penDown:
+                    path.lineTo(pointX, pointY)
+                else:
+                    path.moveTo(pointX, pointY)
+                    penDown = True
+            else:
+                penDown = False
+        pdf.drawPath(path, stroke = 1, fill = 0)
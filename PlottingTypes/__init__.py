@@ -4,10 +4,18 @@
 ## Description:
 ## * Import all classes pertaining to plotting in local folder.
 
-__all__ = ['CustomAxisItems', 'FixedImageExporter', 'ForwardRatePlot', 'MerlinPlotter', 'Plot']
+__all__ = ['CurvePrefetcher', 'CurveScreener', 'CurveStore', 'CustomAxisItems', 'Decimator', 'FixedImageExporter', 'ForwardRateEngine', 'ForwardRatePlot', 'ImageWriter', 'MerlinCurveFile', 'MerlinPlotter', 'Plot', 'PlotWidgetPool', 'RenderWorker', 'VectorPDFRenderer']
 
-import PlottingTypes.CustomAxisItems
-import PlottingTypes.FixedImageExporter
-import PlottingTypes.ForwardRatePlot
-import PlottingTypes.MerlinPlotter
-import PlottingTypes.Plot
\ No newline at end of file
+import PlottingTypes.CurvePrefetcher
+import PlottingTypes.CurveScreener
+import PlottingTypes.CurveStore
+import PlottingTypes.Decimator
+import PlottingTypes.ForwardRateEngine
+import PlottingTypes.ImageWriter
+import PlottingTypes.MerlinCurveFile
+import PlottingTypes.Plot
+import PlottingTypes.PlotWidgetPool
+
+# Note: CustomAxisItems, FixedImageExporter, ForwardRatePlot, MerlinPlotter, RenderWorker and VectorPDFRenderer require pyqtgraph, reportlab,
+# openpyxl or win32com, so are imported where used rather than here. Curves can then be parsed and forward rates calculated without them
+# (ex: Benchmarks\RunBenchmarks.py).
\ No newline at end of file